@@ -0,0 +1,285 @@
+# Benchmark suite for ContactList operations
+#
+# Run from this folder, e.g.
+#   python Benchmark.py --sizes 1000 10000 100000 1000000
+#   python Benchmark.py --sizes 1000 10000 --update-baseline
+# Results are written as JSON and compared against benchmark_baseline.json.
+# Each operation is compared as a ratio to a fixed reference workload timed
+# in the same run, so the baseline holds on other machines and under load.
+# The exit status is 1 if any operation got slower than the tolerance allows.
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from Contact import Contact
+from ContactList import ContactList
+from SkipContactList import SkipContactList
+from SQLiteContactList import SQLiteContactList
+
+BACKENDS = {
+    "linked": ContactList,
+    "skiplist": SkipContactList,
+    "sqlite": SQLiteContactList,
+}
+
+# Largest list each backend is timed at. The linked list inserts in O(n),
+# so building a million contacts one at a time would not finish
+MAX_SIZES = {"linked": 10000}
+
+
+def syntheticContacts(n: int, seed: int = 0) -> list:
+    """Creates n contacts with random names, spread over every country code.
+
+    Args:
+        n (int): Number of contacts.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        list: New contacts, in random order.
+    """
+    rng = random.Random(seed)
+    codes = list(Contact.COUNTRY_CODES)
+    contacts = []
+    for i in range(n):
+        contacts.append(Contact("{:04d}-{:07d}".format(1950 + rng.randrange(75), i),
+                                "First{:06d}".format(rng.randrange(1000000)),
+                                "Last{:05d}".format(rng.randrange(max(10, n // 4))),
+                                "Student", rng.choice("MF"), rng.choice(codes),
+                                rng.randrange(100), rng.randrange(100000, 999999)))
+    return contacts
+
+
+def percentile(latencies: list, p: float) -> float:
+    """Gets the p-th percentile of a sorted list of latencies.
+
+    Args:
+        latencies (list): Sorted latencies.
+        p (float): Percentile between 0 and 100.
+
+    Returns:
+        float: Latency at that percentile.
+    """
+    if not latencies:
+        return 0.0
+    return latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))]
+
+
+def timeEach(function, args, items: int = 1) -> dict:
+    """Calls function once per argument and times each call.
+
+    Args:
+        function (function): Operation to time.
+        args (iterable): Argument of each call. Arguments are taken outside the timed part.
+        items (int, optional): Operations done by each call, for ops_per_sec. Defaults to 1.
+
+    Returns:
+        dict: ops_per_sec, median_ops_per_sec, p50_us and p99_us of the calls.
+        median_ops_per_sec is taken from the median call, so a few calls
+        slowed by the scheduler or the garbage collector do not move it.
+    """
+    latencies = []
+    clock = time.perf_counter_ns
+    for arg in args:
+        start = clock()
+        function(arg)
+        latencies.append(clock() - start)
+    latencies.sort()
+    total = sum(latencies)
+    median = percentile(latencies, 50)
+    return {
+        "ops_per_sec": len(latencies) * items / (total / 1e9) if total else 0.0,
+        "median_ops_per_sec": items / (median / 1e9) if median else 0.0,
+        "p50_us": median / 1000,
+        "p99_us": percentile(latencies, 99) / 1000,
+    }
+
+
+def referenceSpeed(rounds: int = 21) -> float:
+    """Times a fixed workload of dict inserts, lookups and a sort, like
+    the ones the contact lists do, without any code from this project.
+
+    Args:
+        rounds (int, optional): Number of timed rounds. Defaults to 21.
+
+    Returns:
+        float: Median operations per second over the rounds.
+    """
+    keys = [("Last{:05d}".format(i * 7919 % 10007), i) for i in range(2000)]
+    speeds = []
+    clock = time.perf_counter_ns
+    for _ in range(rounds):
+        start = clock()
+        index = dict.fromkeys(keys)
+        for key in keys:
+            index[key]
+        sorted(keys)
+        speeds.append(len(keys) / ((clock() - start) / 1e9))
+    speeds.sort()
+    return speeds[len(speeds) // 2]
+
+
+def benchmarkSize(backend, n: int, samples: int, repeats: int, seed: int = 0) -> dict:
+    """Times every operation of one backend at one list size.
+
+    Args:
+        backend (class): Contact list class to benchmark.
+        n (int): Number of contacts.
+        samples (int): Number of timed calls for lookups and deletes.
+        repeats (int): Number of timed calls for bulk loads and full listings.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        dict: Results of each operation, the peak memory of a bulk load
+        and the reference speed of the run.
+    """
+    rng = random.Random(seed)
+    contacts = syntheticContacts(n, seed)
+    results = {}
+    speeds = [referenceSpeed()]
+
+    pb = backend()
+    results["insert"] = timeEach(pb.insert, contacts)
+
+    results["insertMany"] = timeEach(backend.fromContacts,
+                                     (syntheticContacts(n, seed) for _ in range(repeats)), n)
+
+    stdns = [c.getStudentNumber() for c in rng.sample(contacts, min(samples, n))]
+    results["getContact"] = timeEach(pb.getContact, stdns)
+    results["getContactAtIndex"] = timeEach(pb.getContactAtIndex,
+                                            [rng.randrange(n) for _ in range(min(samples, n))])
+    # render builds the listing every call, like __str__ after an edit
+    results["__str__"] = timeEach(pb.render, [None] * repeats)
+    results["__str__(f)"] = timeEach(pb.render, [[63, 84]] * repeats)
+    pb.__str__([63, 84])
+    results["__str__(f) unchanged"] = timeEach(pb.__str__, [[63, 84]] * samples)
+    results["deleteContact"] = timeEach(pb.deleteContact, stdns)
+
+    tracemalloc.start()
+    bulk = backend.fromContacts(syntheticContacts(n, seed))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del bulk
+
+    # The reference is timed before and after, in case the machine got busier or quieter
+    speeds.append(referenceSpeed())
+    reference = sum(speeds) / len(speeds)
+    for stats in results.values():
+        stats["relative"] = stats["median_ops_per_sec"] / reference
+    return {"operations": results, "peak_memory_bytes": peak, "reference_ops_per_sec": reference}
+
+
+def benchmarkRuns(backend, n: int, samples: int, repeats: int, runs: int) -> dict:
+    """Runs benchmarkSize several times and keeps the median run of each
+    operation, by speed relative to the reference.
+
+    Args:
+        backend (class): Contact list class to benchmark.
+        n (int): Number of contacts.
+        samples (int): Number of timed calls for lookups and deletes.
+        repeats (int): Number of timed calls for bulk loads and full listings.
+        runs (int): Number of runs.
+
+    Returns:
+        dict: Results in the format of benchmarkSize.
+    """
+    measured = [benchmarkSize(backend, n, samples, repeats) for _ in range(runs)]
+    results = {}
+    for op in measured[0]["operations"]:
+        stats = sorted((run["operations"][op] for run in measured), key=lambda stats: stats["relative"])
+        results[op] = stats[len(stats) // 2]
+    speeds = sorted(run["reference_ops_per_sec"] for run in measured)
+    return {"operations": results, "peak_memory_bytes": max(run["peak_memory_bytes"] for run in measured),
+            "reference_ops_per_sec": speeds[len(speeds) // 2]}
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Finds operations that got slower than the baseline allows, relative
+    to the reference speed of their own run.
+
+    Args:
+        results (dict): Results of this run, keyed by size then operation.
+        baseline (dict): Stored results in the same format.
+        tolerance (float): Allowed fractional drop in relative speed, e.g. 0.4.
+
+    Returns:
+        list: One message per regression. Empty if there are none.
+    """
+    regressions = []
+    for size, measured in results.items():
+        expected = baseline.get(size)
+        if expected is None:
+            continue
+        for op, stats in measured["operations"].items():
+            if op not in expected["operations"]:
+                continue
+            floor = expected["operations"][op]["relative"] * (1 - tolerance)
+            if stats["relative"] < floor:
+                regressions.append("{} at {} contacts: {:.4f} of the reference speed, baseline {:.4f}".format(
+                    op, size, stats["relative"], expected["operations"][op]["relative"]))
+    return regressions
+
+
+def printReport(results: dict) -> None:
+    """Prints results as a table.
+
+    Args:
+        results (dict): Results keyed by size then operation.
+    """
+    print("{:>9} {:<18} {:>14} {:>12} {:>12} {:>10}".format("size", "operation", "ops/sec", "p50 us", "p99 us",
+                                                           "relative"))
+    for size, measured in results.items():
+        for op, stats in measured["operations"].items():
+            print("{:>9} {:<18} {:>14.0f} {:>12.2f} {:>12.2f} {:>10.4f}".format(
+                size, op, stats["ops_per_sec"], stats["p50_us"], stats["p99_us"], stats["relative"]))
+        print("{:>9} {:<18} {:>14.1f} MB".format(size, "peak memory", measured["peak_memory_bytes"] / 1e6))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark ContactList operations.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="skiplist")
+    parser.add_argument("--samples", type=int, default=1000, help="Timed calls per lookup or delete")
+    parser.add_argument("--repeats", type=int, default=10, help="Timed calls per bulk load or full listing")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per size; the median run of each operation is kept")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", default="benchmark_baseline.json")
+    parser.add_argument("--tolerance", type=float, default=0.4,
+                        help="Allowed fractional drop in speed relative to the reference before failing")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the baseline")
+    args = parser.parse_args()
+
+    results = {}
+    for n in args.sizes:
+        if n > MAX_SIZES.get(args.backend, n):
+            print("Skipping {} contacts: the {} backend is timed up to {}.".format(
+                n, args.backend, MAX_SIZES[args.backend]))
+            continue
+        results[str(n)] = benchmarkRuns(BACKENDS[args.backend], n, args.samples, args.repeats, args.runs)
+    printReport(results)
+
+    with open(args.output, "w") as out:
+        json.dump({"backend": args.backend, "results": results}, out, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as out:
+            json.dump({"backend": args.backend, "results": results}, out, indent=2)
+        print("Baseline written to {}".format(args.baseline))
+        sys.exit(0)
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print("No baseline at {}; run with --update-baseline to store one.".format(args.baseline))
+        sys.exit(0)
+
+    if baseline.get("backend") != args.backend:
+        print("Baseline is for the {} backend; not compared.".format(baseline.get("backend")))
+        sys.exit(0)
+
+    regressions = compare(results, baseline["results"], args.tolerance)
+    for message in regressions:
+        print("REGRESSION: " + message)
+    sys.exit(1 if regressions else 0)
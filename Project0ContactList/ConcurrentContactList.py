@@ -0,0 +1,421 @@
+# Thread-safe wrapper around a contact list
+import contextlib
+import threading
+from Contact import Contact
+from ContactList import ContactList
+from ContactListing import ContactListing
+from SkipContactList import SkipContactList
+
+
+class ReadWriteLock:
+    """A lock that many readers can hold at once, or one writer alone.
+    Waiting writers go first, so a stream of readers cannot starve them.
+    Not reentrant: a thread holding it must not acquire it again.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition(threading.Lock())
+        self.readers = 0
+        self.writer = False
+        self.waiting_writers = 0
+
+    @contextlib.contextmanager
+    def reading(self):
+        """Holds the lock shared for the with block."""
+        with self.condition:
+            while self.writer or self.waiting_writers:
+                self.condition.wait()
+            self.readers += 1
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.readers -= 1
+                if self.readers == 0:
+                    self.condition.notify_all()
+
+    @contextlib.contextmanager
+    def writing(self):
+        """Holds the lock exclusively for the with block."""
+        with self.condition:
+            self.waiting_writers += 1
+            while self.writer or self.readers:
+                self.condition.wait()
+            self.waiting_writers -= 1
+            self.writer = True
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.writer = False
+                self.condition.notify_all()
+
+
+class ConcurrentContactList(ContactListing):
+    """Contact list that can be shared between threads. Lookups run
+    together under a shared lock, while inserts, deletes and edits made
+    through a contained contact's setters take it exclusively.
+
+    Iterating methods copy the contacts they yield while holding the
+    lock, so a caller that stops early or iterates slowly never blocks
+    writers, and never sees a list being relinked. The contacts
+    themselves are shared, so a rename shows on the contact just before
+    the list moves it.
+    """
+
+    def __init__(self, pb: ContactList = None):
+        """
+        Args:
+            pb (ContactList, optional): Empty contact list to wrap.
+                Defaults to a new SkipContactList.
+        """
+        self.pb = SkipContactList() if pb is None else pb
+        self.lock = ReadWriteLock()
+
+    @classmethod
+    def fromContacts(cls, contacts, *args, **kwargs) -> 'ConcurrentContactList':
+        """Creates a contact list holding the given contacts.
+
+        Args:
+            contacts (iterable): Contacts to be stored.
+            *args, **kwargs: Passed to the contact list constructor.
+
+        Returns:
+            ConcurrentContactList: New contact list.
+        """
+        pb = cls(*args, **kwargs)
+        pb.insertMany(contacts)
+        return pb
+
+    def getSize(self) -> int:
+        """
+            Get the size of this contact list.
+        """
+        return self.pb.getSize()
+
+    def __len__(self) -> int:
+        """Gets the size of this contact list."""
+        return self.pb.getSize()
+
+    def isEmpty(self) -> bool:
+        """
+            Checks if contact list has no contacts.
+        """
+        return self.pb.isEmpty()
+
+    def first(self) -> Contact:
+        """
+            Get the first contact in this contact list.
+            Returns none if list is empty.
+        """
+        with self.lock.reading():
+            return self.pb.first()
+
+    def getLast(self) -> Contact:
+        """
+            Get the last contact in this contact list.
+            Returns none if list is empty.
+        """
+        with self.lock.reading():
+            return self.pb.getLast()
+
+    def getContactAtIndex(self, index: int) -> Contact:
+        """Gets the contact at given index in the contact list.
+        Returns None if index is not found in the list.
+
+        Args:
+            index (int): Index to get in the contact list.
+
+        Returns:
+            Contact: Contact at index.
+        """
+        with self.lock.reading():
+            return self.pb.getContactAtIndex(index)
+
+    def getIndex(self, stdn: str) -> int:
+        """Gets the index of the contact with the given student number.
+        Returns -1 if not found.
+
+        Args:
+            stdn (str): Student number of the contact.
+
+        Returns:
+            int: Index of the contact in this list.
+        """
+        with self.lock.reading():
+            return self.pb.getIndex(stdn)
+
+    def getContact(self, identifier: str) -> Contact:
+        """Gets the contact based on given student number. Will return None
+        if contact is not found.
+
+        Args:
+            identifier (str): Student number to base search from.
+
+        Returns:
+            Contact: Contact information.
+        """
+        with self.lock.reading():
+            return self.pb.getContact(identifier)
+
+    def getContacts(self, stdns) -> list:
+        """Gets the contacts with the given student numbers, under one
+        read lock.
+
+        Args:
+            stdns (iterable): Student numbers to look up.
+
+        Returns:
+            list: Contact for each student number, in input order, or
+                None where it is not in this list.
+        """
+        stdns = list(stdns)
+        with self.lock.reading():
+            return self.pb.getContacts(stdns)
+
+    def hasStudentNumber(self, stdn: str) -> bool:
+        """Checks if a contact with the given student number is in this list.
+
+        Args:
+            stdn (str): Student number to look for.
+
+        Returns:
+            bool: True if the student number is in this list.
+        """
+        with self.lock.reading():
+            return self.pb.hasStudentNumber(stdn)
+
+    def getContactBySurname(self, surname: str) -> Contact:
+        """Gets the contact based on surname. Will return None if contact is not found.
+        """
+        with self.lock.reading():
+            return self.pb.getContactBySurname(surname)
+
+    def getContactsBySurname(self, surname: str) -> list:
+        """Gets every contact with the given surname, ignoring case,
+        in list order.
+
+        Args:
+            surname (str): Surname to search for.
+
+        Returns:
+            list: Contacts with that surname. Empty if none are found.
+        """
+        with self.lock.reading():
+            return self.pb.getContactsBySurname(surname)
+
+    def searchSurname(self, pattern: str) -> list:
+        """Searches contacts by surname, ignoring case, as in
+        ContactList.searchSurname.
+
+        Args:
+            pattern (str): Surname or surname prefix followed by "*".
+
+        Returns:
+            list: Matching contacts, ordered by surname and then list order.
+        """
+        with self.lock.reading():
+            return self.pb.searchSurname(pattern)
+
+    def getContactsByPhone(self, cc: int, area: int, number: int) -> list:
+        """Gets every contact with the given full phone number.
+
+        Args:
+            cc (int): Numeric country code.
+            area (int): Area code.
+            number (int): Contact number.
+
+        Returns:
+            list: Contacts with that phone number, in list order.
+        """
+        with self.lock.reading():
+            return self.pb.getContactsByPhone(cc, area, number)
+
+    def searchPhone(self, cc: int, area: int = None) -> list:
+        """Gets every contact in a country, or in an area of a country,
+        ordered by phone number.
+
+        Args:
+            cc (int): Numeric country code.
+            area (int, optional): Area code. Defaults to None, for every area.
+
+        Returns:
+            list: Matching contacts, ordered by area code, number and then list order.
+        """
+        with self.lock.reading():
+            return self.pb.searchPhone(cc, area)
+
+    def searchFuzzy(self, name: str, limit: int = 10) -> list:
+        """Searches contacts by a possibly misspelled first or last name,
+        as in ContactList.searchFuzzy.
+
+        Args:
+            name (str): Name to search for.
+            limit (int, optional): Most contacts returned. Defaults to 10.
+
+        Returns:
+            list: Matching contacts, closest names first.
+        """
+        if self.pb.names is None:
+            with self.lock.writing():
+                self.pb.buildNameIndex()
+        with self.lock.reading():
+            return self.pb.searchFuzzy(name, limit)
+
+    def __iter__(self):
+        """Iterates over a copy of the contacts of this list, in order."""
+        with self.lock.reading():
+            return iter(list(self.pb))
+
+    def iterFromIndex(self, index: int):
+        """Iterates over a copy of the contacts in order, starting at index.
+
+        Args:
+            index (int): Index of the first contact.
+        """
+        with self.lock.reading():
+            return iter(list(self.pb.iterFromIndex(index)))
+
+    def iterByCountry(self, f: list):
+        """Iterates, in name order, over a copy of the contacts with any
+        of the given country codes.
+
+        Args:
+            f (list): Country codes to list.
+        """
+        with self.lock.reading():
+            return iter(list(self.pb.iterByCountry(f)))
+
+    def iterOrder(self, order: str = "lname", f: list = None, after_key = None):
+        """Iterates over a copy of the contacts in one of
+        ContactList.ORDERS. Raises ValueError if the order is unknown.
+
+        Args:
+            order (str, optional): "lname", "fname", "stdn" or "phone".
+                Defaults to "lname".
+            f (list, optional): Country codes to keep. Defaults to None.
+            after_key (optional): Key, as given by ContactList.orderKey, to
+                start after. Defaults to None.
+        """
+        with self.lock.reading():
+            return iter(list(self.pb.iterOrder(order, f, after_key)))
+
+    def iterSurname(self, pattern: str, after_key = None):
+        """Iterates over a copy of the contacts found by searchSurname,
+        starting after a sort key.
+
+        Args:
+            pattern (str): Surname or surname prefix followed by "*".
+            after_key (tuple, optional): Sort key to start after. Defaults to None.
+        """
+        with self.lock.reading():
+            return iter(list(self.pb.iterSurname(pattern, after_key)))
+
+    def pageSurname(self, pattern: str, after_key = None, limit: int = 20) -> tuple:
+        """Gets one page of the contacts found by searchSurname, as in
+        ContactList.pageSurname, under the read lock.
+
+        Args:
+            pattern (str): Surname or surname prefix followed by "*".
+            after_key (optional): Cursor returned with the previous page.
+                Defaults to None, for the first page.
+            limit (int, optional): Most contacts in the page. Defaults to 20.
+
+        Returns:
+            tuple: The contacts of the page, and the cursor of the next page or None.
+        """
+        with self.lock.reading():
+            return self.pb.pageSurname(pattern, after_key, limit)
+
+    def page(self, after_key = None, limit: int = 20, f: list = None, order: str = "lname") -> tuple:
+        """Gets one page of contacts, as in ContactList.page, under the read lock.
+
+        Args:
+            after_key (optional): Cursor returned with the previous page.
+                Defaults to None, for the first page.
+            limit (int, optional): Most contacts in the page. Defaults to 20.
+            f (list, optional): Country codes to keep. Defaults to None.
+            order (str, optional): One of ContactList.ORDERS. Defaults to "lname".
+
+        Returns:
+            tuple: The contacts of the page, and the cursor of the next page or None.
+        """
+        with self.lock.reading():
+            return self.pb.page(after_key, limit, f, order)
+
+    def insert(self, c: Contact):
+        """Inserts new contact to the phonebook.
+        Raises ValueError if the student number is already in the phonebook.
+
+        Args:
+            c (Contact): Contact to be inserted.
+        """
+        self.insertMany([c])
+
+    def insertMany(self, contacts) -> None:
+        """Inserts a batch of contacts to the phonebook under one write lock.
+        Raises ValueError, and inserts nothing, if a student number is
+        repeated or is already in the phonebook.
+
+        Args:
+            contacts (iterable): Contacts to be inserted.
+        """
+        contacts = list(contacts)
+        with self.lock.writing():
+            self.pb.insertMany(contacts)
+            self.pb.flushIndexes()
+            # Edits through the setters must take the write lock too
+            for c in contacts:
+                c.removeObserver(self.pb)
+                c.addObserver(self)
+
+    def deleteContact(self, stdn: str) -> Contact:
+        """Finds a contact based on their student number.
+        Returns the deleted contact. Otherwise, returns -1 if not found.
+
+        Args:
+            stdn (str): Student number of contact to be deleted.
+
+        Returns:
+            Contact: Deleted contact, if found.
+        """
+        with self.lock.writing():
+            c = self.pb.deleteContact(stdn)
+            self.pb.flushIndexes()
+        if c != -1:
+            c.removeObserver(self)
+        return c
+
+    def deleteContacts(self, stdns) -> list:
+        """Deletes the contacts with the given student numbers, under one
+        write lock.
+
+        Args:
+            stdns (iterable): Student numbers of contacts to be deleted.
+
+        Returns:
+            list: Deleted contact for each student number, in input order,
+                or None where it was not found.
+        """
+        stdns = list(stdns)
+        with self.lock.writing():
+            deleted = self.pb.deleteContacts(stdns)
+            self.pb.flushIndexes()
+        for c in deleted:
+            if c is not None:
+                c.removeObserver(self)
+        return deleted
+
+    def onContactChanged(self, c: Contact, field: str, old_value) -> None:
+        """Applies an edit made through a contact's setters to the
+        wrapped list under the write lock.
+        Raises ValueError if a new student number is already taken.
+
+        Args:
+            c (Contact): Contact that was edited.
+            field (str): Name of the changed attribute.
+            old_value: Value of the attribute before the change.
+        """
+        with self.lock.writing():
+            self.pb.onContactChanged(c, field, old_value)
+            self.pb.flushIndexes()
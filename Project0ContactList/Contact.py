@@ -21,6 +21,11 @@ class Contact:
         95: "Republic of the Union of Myanmar", # Myanmar
         670: "Democratic Republic of Timor Leste" # Timor Leste
     }
+
+    # Fixed attributes instead of a per-contact __dict__, to save memory
+    __slots__ = ("student_num", "fname", "lname", "occupation", "gender",
+                 "cc", "area", "number", "observers", "sort_key", "rendered",
+                 "__weakref__")
     
     def __init__(self, stdn: str, fname: str, sname: str, occupation: str,
                     gender: str, cc: int, area: int, number: int):
@@ -43,6 +48,11 @@ class Contact:
         self.cc = cc 
         self.area = area
         self.number = number 
+        self.observers = ()
+        # Computed by getSortKey, and cleared by the setters it depends on
+        self.sort_key = None
+        # Computed by __str__, and cleared by every setter
+        self.rendered = None
 
     def getStudentNumber(self) -> str:
         """Get the contact's student number.
@@ -52,6 +62,19 @@ class Contact:
         """
         return self.student_num
 
+    def getSortKey(self) -> tuple:
+        """Gets the key contacts are ordered by: case-folded last name,
+        then case-folded first name, then student number. It is computed
+        once and kept until one of those fields is set again.
+
+        Returns:
+            tuple: (last name, first name, student number).
+        """
+        key = self.sort_key
+        if key is None:
+            key = self.sort_key = (self.lname.casefold(), self.fname.casefold(), self.student_num)
+        return key
+
     def getFName(self) -> str:
         """Get the contact's first name.
 
@@ -143,10 +166,29 @@ class Contact:
         
     def setStudentNumber(self, new_stdn: str) -> None:
         """Sets a new student number of this contact.
+        Raises ValueError, and keeps the old student number, if a
+        phonebook holding this contact already has the new one. The
+        phonebooks that had accepted the new one are told to change back.
+
         Args:
             new_stdn (str): New student number.
         """
+        old_stdn = self.student_num
         self.student_num = new_stdn
+        self.sort_key = None
+        self.rendered = None
+        notified = []
+        try:
+            for observer in self.observers:
+                observer.onContactChanged(self, "student_num", old_stdn)
+                notified.append(observer)
+        except ValueError:
+            self.student_num = old_stdn
+            self.sort_key = None
+            self.rendered = None
+            for observer in notified:
+                observer.onContactChanged(self, "student_num", new_stdn)
+            raise
     
     def setFName(self, new_fname : str) -> None:
         """Sets a new new first name of this contact.
@@ -154,7 +196,11 @@ class Contact:
         Args:
             new_fname (str): New first name.
         """
+        old_fname = self.fname
         self.fname = new_fname
+        self.sort_key = None
+        self.rendered = None
+        self.notifyObservers("fname", old_fname)
     
     def setLName(self, new_sname: str) -> None:
         """Sets a new last name of this contact.
@@ -162,19 +208,27 @@ class Contact:
         Args:
             new_sname (str): New last name.
         """
+        old_sname = self.lname
         self.lname = new_sname
+        self.sort_key = None
+        self.rendered = None
+        self.notifyObservers("lname", old_sname)
         
     def setGender(self, new_gender: str) -> None:
-        """Sets a new gender of this contact. Must be either M or F.
-        Will return -1 if new gender value is invalid.
+        """Sets a new gender of this contact. Must be either M or F,
+        in either case. Will return -1 if new gender value is invalid.
+
         Args:
-            new_gender (str): _description_
+            new_gender (str): New gender, M or F.
         """
-        if new_gender.capitalize() != "M" or new_gender.capitalize != "F":
+        if new_gender.upper() not in ("M", "F"):
             print("Sorry, that is an invalid value for gender.")
             return -1
         else: 
-            self.gender = new_gender
+            old_gender = self.gender
+            self.gender = new_gender.upper()
+            self.rendered = None
+            self.notifyObservers("gender", old_gender)
 
     def setOccupation(self, new_occupation: str) -> None:
         """Sets a new occupation of this contact.
@@ -182,7 +236,10 @@ class Contact:
         Args:
             new_occupation (str): New occupation.
         """
+        old_occupation = self.occupation
         self.occupation = new_occupation
+        self.rendered = None
+        self.notifyObservers("occupation", old_occupation)
 
     def setCountryCode(self, new_country_code: int) -> None:
         """Sets a new country code for this contact. 
@@ -196,7 +253,10 @@ class Contact:
             print("Sorry, this country code does not exist. Try again.")
             return -1
         else: 
+            old_country_code = self.cc
             self.cc = new_country_code
+            self.rendered = None
+            self.notifyObservers("cc", old_country_code)
             
     def setAreaCode(self, new_area: int) -> None:
         """Sets a new area code for this contact.
@@ -204,7 +264,10 @@ class Contact:
         Args:
             new_area (int): New area code.
         """
+        old_area = self.area
         self.area = new_area
+        self.rendered = None
+        self.notifyObservers("area", old_area)
         
     def setContactNumber(self, new_number: int) -> None:
         """Sets new contact number for this contact.
@@ -212,8 +275,46 @@ class Contact:
         Args:
             new_number (int): New contact number.
         """
+        old_number = self.number
         self.number = new_number
+        self.rendered = None
+        self.notifyObservers("number", old_number)
         
+    def addObserver(self, observer) -> None:
+        """Registers an observer, such as a ContactList, that is told
+        whenever one of this contact's fields is changed.
+
+        Args:
+            observer: Object with an onContactChanged(contact, field, old_value) method.
+        """
+        # A tuple, so contacts without observers share the empty tuple
+        self.observers = self.observers + (observer,)
+
+    def removeObserver(self, observer) -> None:
+        """Unregisters an observer added with addObserver.
+
+        Args:
+            observer: Observer to be removed.
+        """
+        self.observers = tuple(o for o in self.observers if o is not observer)
+
+    def notifyObservers(self, field: str, old_value) -> None:
+        """Tells every observer that a field of this contact has changed.
+
+        Args:
+            field (str): Name of the changed attribute, e.g. "student_num".
+            old_value: Value of the attribute before the change.
+        """
+        for observer in self.observers:
+            observer.onContactChanged(self, field, old_value)
+
+    def __reduce__(self):
+        """Pickles a contact by its fields only, so the lists observing it
+        are not copied along with it, e.g. when sent to another process.
+        """
+        return (Contact, (self.student_num, self.fname, self.lname, self.occupation,
+                          self.gender, self.cc, self.area, self.number))
+
     @staticmethod
     def compareNames(c1: 'Contact', c2: 'Contact', comparison_type: int = 0) -> int:
         """Compares the names of two different contacts. 
@@ -237,7 +338,11 @@ class Contact:
             return 0
         
     def __str__(self) -> str:
-        """Returns a string representation of this contact."""
-        return "{}, {}, with student number {}, is a/an {}. {} phone number is {}.".format(
-            self.getLName(), self.getFName(), self.getStudentNumber(), self.getOccupation(),
-            self.getPronoun(), self.getFullContactNumber())
\ No newline at end of file
+        """Returns a string representation of this contact, rendered once
+        and kept until one of the setters is called."""
+        text = self.rendered
+        if text is None:
+            text = self.rendered = "{}, {}, with student number {}, is a/an {}. {} phone number is {}.".format(
+                self.getLName(), self.getFName(), self.getStudentNumber(), self.getOccupation(),
+                self.getPronoun(), self.getFullContactNumber())
+        return text
\ No newline at end of file
@@ -0,0 +1,221 @@
+# Streaming CSV and JSONL import and export of contacts
+import argparse
+import csv
+import json
+import os
+import time
+from Contact import Contact
+
+# Column names used in CSV headers and JSONL keys, in Contact argument order
+FIELDS = ("student_num", "fname", "lname", "occupation", "gender", "cc", "area", "number")
+
+
+class ImportReport:
+    """Counts of an import, and the rate rows were read at."""
+
+    def __init__(self):
+        self.rows = 0
+        self.inserted = 0
+        self.rejected = 0
+        self.seconds = 0.0
+
+    def rowsPerSecond(self) -> float:
+        """Gets the number of input rows handled per second.
+
+        Returns:
+            float: Rows per second, or 0 if nothing was timed.
+        """
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self) -> str:
+        """Returns a one line summary of this import."""
+        return "{} rows, {} inserted, {} rejected in {:.2f}s ({:.0f} rows/s)".format(
+            self.rows, self.inserted, self.rejected, self.seconds, self.rowsPerSecond())
+
+
+def parseRow(row: dict) -> Contact:
+    """Creates a contact from a CSV or JSONL row.
+    Raises ValueError if a field is missing, empty or invalid, or if the
+    country code is not in Contact.COUNTRY_CODES.
+
+    Args:
+        row (dict): Row keyed by the names in FIELDS.
+
+    Returns:
+        Contact: Contact created from the row.
+    """
+    try:
+        stdn, fname, lname, occupation, gender = (None if row[field] is None else str(row[field])
+                                                  for field in FIELDS[:5])
+        cc, area, number = (int(row[field]) for field in FIELDS[5:])
+    except (KeyError, TypeError) as e:
+        raise ValueError("Invalid row {}: {}".format(row, e))
+    for field, value in zip(FIELDS, (stdn, fname, lname, occupation, gender)):
+        if value is None or not value.strip():
+            raise ValueError("Invalid row {}: empty {}".format(row, field))
+    if cc not in Contact.COUNTRY_CODES:
+        raise ValueError("Invalid row {}: unknown country code {}".format(row, cc))
+    return Contact(stdn, fname, lname, occupation, gender, cc, area, number)
+
+
+def importRows(pb, rows, chunk_size: int = 10000) -> ImportReport:
+    """Inserts rows into a contact list in chunks of chunk_size contacts,
+    each added with one insertMany call. Invalid rows, and rows whose
+    student number is already taken, are counted as rejected and skipped.
+
+    Args:
+        pb (ContactList): Contact list to insert into.
+        rows (iterable): Rows keyed by the names in FIELDS.
+        chunk_size (int, optional): Contacts per insertMany call. Defaults to 10000.
+
+    Returns:
+        ImportReport: Counts and rate of the import.
+    """
+    report = ImportReport()
+    start = time.perf_counter()
+    chunk = []
+    seen = set()
+
+    for row in rows:
+        report.rows += 1
+        try:
+            c = parseRow(row)
+        except ValueError:
+            report.rejected += 1
+            continue
+        if pb.hasStudentNumber(c.getStudentNumber()) or c.getStudentNumber() in seen:
+            report.rejected += 1
+            continue
+        chunk.append(c)
+        seen.add(c.getStudentNumber())
+
+        if len(chunk) >= chunk_size:
+            pb.insertMany(chunk)
+            report.inserted += len(chunk)
+            chunk = []
+            seen.clear()
+
+    if chunk:
+        pb.insertMany(chunk)
+        report.inserted += len(chunk)
+
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def importCsv(pb, path: str, chunk_size: int = 10000) -> ImportReport:
+    """Imports a CSV file whose header row names the columns in FIELDS.
+
+    Args:
+        pb (ContactList): Contact list to insert into.
+        path (str): Path of the CSV file.
+        chunk_size (int, optional): Contacts per insertMany call. Defaults to 10000.
+
+    Returns:
+        ImportReport: Counts and rate of the import.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        return importRows(pb, csv.DictReader(f), chunk_size)
+
+
+def importJsonl(pb, path: str, chunk_size: int = 10000) -> ImportReport:
+    """Imports a JSONL file holding one contact object per line.
+
+    Args:
+        pb (ContactList): Contact list to insert into.
+        path (str): Path of the JSONL file.
+        chunk_size (int, optional): Contacts per insertMany call. Defaults to 10000.
+
+    Returns:
+        ImportReport: Counts and rate of the import.
+    """
+    def rows(f):
+        for line in f:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    yield {}
+
+    with open(path, encoding="utf-8") as f:
+        return importRows(pb, rows(f), chunk_size)
+
+
+def toRow(c: Contact) -> dict:
+    """Gets the row written for a contact.
+
+    Args:
+        c (Contact): Contact to be written.
+
+    Returns:
+        dict: Row keyed by the names in FIELDS.
+    """
+    return {"student_num": c.getStudentNumber(), "fname": c.getFName(), "lname": c.getLName(),
+            "occupation": c.getOccupation(), "gender": c.getGender(),
+            "cc": c.getNumericCountryCode(), "area": c.getAreaCode(), "number": c.getContactNumber()}
+
+
+def exportCsv(pb, path: str, f = None) -> int:
+    """Writes the contacts of a contact list to a CSV file, in list order.
+
+    Args:
+        pb (ContactList): Contact list to export.
+        path (str): Path of the CSV file.
+        f (list, optional): Country codes to export. Defaults to None, for all.
+
+    Returns:
+        int: Number of contacts written.
+    """
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as out:
+        writer = csv.DictWriter(out, fieldnames=FIELDS)
+        writer.writeheader()
+        for c in pb.filterContacts(f):
+            writer.writerow(toRow(c))
+            count += 1
+    return count
+
+
+def exportJsonl(pb, path: str, f = None) -> int:
+    """Writes the contacts of a contact list to a JSONL file, in list order.
+
+    Args:
+        pb (ContactList): Contact list to export.
+        path (str): Path of the JSONL file.
+        f (list, optional): Country codes to export. Defaults to None, for all.
+
+    Returns:
+        int: Number of contacts written.
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8") as out:
+        for c in pb.filterContacts(f):
+            out.write(json.dumps(toRow(c)) + "\n")
+            count += 1
+    return count
+
+
+if __name__ == "__main__":
+    from SkipContactList import SkipContactList
+    from PhonebookFile import MappedContactList, writePhonebook
+
+    parser = argparse.ArgumentParser(description="Import or export ASEAN Phonebook contacts.")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("file", help="CSV or JSONL file, chosen by extension")
+    parser.add_argument("--phonebook", default="phonebook.pbk", help="Phonebook file to update or read")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Contacts inserted per chunk")
+    args = parser.parse_args()
+
+    pb = SkipContactList()
+    if os.path.exists(args.phonebook):
+        with MappedContactList(args.phonebook) as saved:
+            pb.insertMany(saved)
+
+    jsonl = args.file.endswith(".jsonl") or args.file.endswith(".json")
+    if args.action == "import":
+        report = (importJsonl if jsonl else importCsv)(pb, args.file, args.chunk_size)
+        writePhonebook(args.phonebook, pb)
+        print(report)
+    else:
+        count = (exportJsonl if jsonl else exportCsv)(pb, args.file)
+        print("{} contacts written to {}".format(count, args.file))
@@ -1,16 +1,43 @@
-# Singly Linked List implementation of contacts
+# Doubly Linked List implementation of contacts
+import heapq
 from Contact import Contact
+from ContactListing import ContactListing
+from SortedIndex import SortedIndex
+from TrigramIndex import TrigramIndex
 
 
-class ContactList:
-    """Contact List class that creates a singly linked list phonebook.
+class ContactList(ContactListing):
+    """Contact List class that creates a doubly linked list phonebook.
+    Nodes are also indexed by student number, so lookups and deletes
+    by student number do not need to walk the list, bucketed by
+    country code in name order, so country filters only visit matches,
+    and sorted by case-folded surname for surname and prefix searches.
+
+    Besides the list itself, which is in last name order, the nodes are
+    kept sorted by first name, student number and phone number, so any
+    of ORDERS can be streamed with iterOrder without sorting.
     """
+
+    # Most country filters whose __str__ output is kept by default. Each
+    # output costs about 105 bytes per contact it lists, as much again as
+    # the contacts' own renderings, so only the last two are kept
+    DUMP_CACHE_SIZE = 2
     
     class ContactNode:
 
-        def __init__(self, item: Contact, ptr):
+        __slots__ = ("item", "ptr", "prev", "key", "phone")
+
+        def __init__(self, item: Contact, ptr, prev = None, key: tuple = None, phone: tuple = None):
             self.item = item
             self.ptr = ptr
+            self.prev = prev
+            # Unique key the node is filed under in the list and its indexes
+            self.key = key
+            # (cc, area, number) the node is filed under in the country and
+            # phone indexes. The indexes are only ever updated from these two,
+            # never from the contact, whose fields a setter may already have
+            # changed before the list is told
+            self.phone = phone
 
         def getVal(self) -> Contact:
             """Get the contact value of this node.
@@ -35,6 +62,22 @@ class ContactList:
                 node (ContactList.ContactNode): New node pointer.
             """
             self.ptr = node
+
+        def getPrev(self) -> 'ContactList.ContactNode':
+            """Gets the node before this node.
+
+            Returns:
+                ContactList.ContactNode: The node connected before this node.
+            """
+            return self.prev
+
+        def setPrev(self, node: 'ContactList.ContactNode'):
+            """Sets a new previous pointer for this node
+
+            Args:
+                node (ContactList.ContactNode): New previous node pointer.
+            """
+            self.prev = node
         
         def setVal(self, c : Contact):
             """Sets the contact value of this node.
@@ -44,9 +87,53 @@ class ContactList:
             """
             self.item = c
 
-    def __init__(self):
+    def __init__(self, dump_cache_size: int = None):
+        """
+        Args:
+            dump_cache_size (int, optional): Most country filters whose
+                __str__ output is kept, 0 to keep none. Defaults to
+                DUMP_CACHE_SIZE.
+        """
         self.sentinel = ContactList.ContactNode(None, None)
         self.size = 0
+        self.index = {}
+        self.buckets = {cc: SortedIndex() for cc in Contact.COUNTRY_CODES}
+        self.surnames = SortedIndex()
+        # Case-folded first and last names for fuzzy search, built by the
+        # first searchFuzzy since it costs about as much memory as the list
+        self.names = None
+        # (cc, area, number) to the nodes with that phone number
+        self.phones = {}
+        # Nodes ordered by (cc, area, number, node key), for prefix and range scans
+        self.phone_order = SortedIndex()
+        # Nodes ordered by (case-folded first name, node key) and by student number
+        self.fname_order = SortedIndex()
+        self.stdn_order = SortedIndex()
+        # (index, node) of the last getContactAtIndex, reset on every relink
+        self.cursor = None
+        # Changes to the whole list and to each country code, which tell
+        # when an output kept by __str__ is out of date
+        self.version = 0
+        self.cc_versions = {}
+        # Country filter, or None, to (versions, output) of __str__
+        self.dumps = {}
+        self.dump_cache_size = ContactList.DUMP_CACHE_SIZE if dump_cache_size is None else dump_cache_size
+
+    @classmethod
+    def fromContacts(cls, contacts, *args, **kwargs) -> 'ContactList':
+        """Creates a contact list holding the given contacts, built
+        with insertMany instead of one insert per contact.
+
+        Args:
+            contacts (iterable): Contacts to be stored.
+            *args, **kwargs: Passed to the contact list constructor.
+
+        Returns:
+            ContactList: New contact list.
+        """
+        pb = cls(*args, **kwargs)
+        pb.insertMany(contacts)
+        return pb
 
     def getSize(self):
         """
@@ -93,15 +180,77 @@ class ContactList:
         if index < 0 or index >= self.size:
             return None
 
-        current = self.sentinel.next()
-        for _ in range(index):
+        node = self._nodeAtIndex(index)
+        self.cursor = (index, node)
+        return node.getVal()
+
+    def _nodeAtIndex(self, index: int) -> ContactNode:
+        """Finds the node at a valid index. Walks from the head, or from
+        the node of the last getContactAtIndex when that is closer, so
+        reading consecutive indices costs O(1) each.
+
+        Args:
+            index (int): Index of the node.
+
+        Returns:
+            ContactNode: Node at index.
+        """
+        position, current = 0, self.sentinel.next()
+        if self.cursor is not None and abs(index - self.cursor[0]) < index:
+            position, current = self.cursor
+
+        while position < index:
             current = current.next()
+            position += 1
+        while position > index:
+            current = current.getPrev()
+            position -= 1
+        return current
+
+    def getIndex(self, stdn: str) -> int:
+        """Gets the index of the contact with the given student number.
+        Returns -1 if not found.
+
+        Args:
+            stdn (str): Student number of the contact.
+
+        Returns:
+            int: Index of the contact in this list.
+        """
+        node = self.index.get(stdn)
+        if node is None:
+            return -1
+
+        index = -1
+        while node is not self.sentinel:
+            node = node.getPrev()
+            index += 1
+        return index
+
+    def iterFromIndex(self, index: int):
+        """Iterates over the contacts in order, starting at index.
+        Finding the start costs as much as getContactAtIndex, and each
+        further contact costs O(1).
+
+        Args:
+            index (int): Index of the first contact.
+
+        Yields:
+            Contact: Next contact in order.
+        """
+        if index < 0 or index >= self.size:
+            return
 
-        return current.getVal()
+        current = self._nodeAtIndex(index)
+        while current is not None:
+            yield current.getVal()
+            current = current.next()
     
     def getContact(self, identifier: str) -> Contact:
         """Gets the contact based on given student number. Will return None
-        if contact is not found.
+        if contact is not found. An identifier made only of digits that
+        is not a student number is tried as a country code, giving the
+        first contact from that country.
 
         Args:
             student_num (str): Student number to base search from.
@@ -110,26 +259,292 @@ class ContactList:
             Contact: Contact information.
         """  
         # Complete this method      
-        current = self.sentinel.next()
-        while current is not None:
-            if current.getVal().getStudentNumber() == identifier or current.getVal().getNumericCountryCode() == int(identifier):
-                return current.getVal()
-            current = current.next()
+        node = self.index.get(identifier)
+        if node is not None:
+            return node.getVal()
+
+        if str(identifier).isdigit():
+            bucket = self.buckets.get(int(identifier))
+            if bucket is not None and len(bucket) > 0:
+                return bucket.first().getVal()
 
         return None
+
+    def getContacts(self, stdns) -> list:
+        """Gets the contacts with the given student numbers through the
+        student number index. Identifiers are only matched as student
+        numbers, never as country codes.
+
+        Args:
+            stdns (iterable): Student numbers to look up.
+
+        Returns:
+            list: Contact for each student number, in input order, or
+                None where it is not in this list.
+        """
+        index = self.index
+        return [None if node is None else node.getVal() for node in map(index.get, stdns)]
     
+    def hasStudentNumber(self, stdn: str) -> bool:
+        """Checks if a contact with the given student number is in this list.
+
+        Args:
+            stdn (str): Student number to look for.
+
+        Returns:
+            bool: True if the student number is in this list.
+        """
+        return stdn in self.index
+
     def getContactBySurname(self, surname: str) -> Contact:
         """Gets the contact based on surname. Will return None if contact is not found.
         """
         # Complete this method
+        for c in self.getContactsBySurname(surname):
+            if c.getLName() == surname:
+                return c
+
+        return None
+
+    def getContactsBySurname(self, surname: str) -> list:
+        """Gets every contact with the given surname, ignoring case,
+        in list order.
+
+        Args:
+            surname (str): Surname to search for.
+
+        Returns:
+            list: Contacts with that surname. Empty if none are found.
+        """
+        folded = surname.casefold()
+        found = []
+        for key, node in self.surnames.iterFrom((folded,)):
+            if key[0] != folded:
+                break
+            found.append(node.getVal())
+        return found
+
+    def searchSurname(self, pattern: str) -> list:
+        """Searches contacts by surname, ignoring case. A pattern ending
+        in "*" matches every surname starting with the rest of the
+        pattern, e.g. "Riz*". Otherwise the surname must match exactly.
+
+        Args:
+            pattern (str): Surname or surname prefix followed by "*".
+
+        Returns:
+            list: Matching contacts, ordered by surname and then list order.
+        """
+        return list(self.iterSurname(pattern))
+
+    def iterSurname(self, pattern: str, after_key = None):
+        """Iterates over the contacts found by searchSurname, read from the
+        surname index, starting after a sort key.
+
+        Args:
+            pattern (str): Surname or surname prefix followed by "*".
+            after_key (tuple, optional): Sort key to start after, see
+                Contact.getSortKey. Defaults to None, which starts from
+                the first match.
+
+        Yields:
+            Contact: Next matching contact.
+        """
+        prefix = pattern.endswith("*")
+        folded = (pattern[:-1] if prefix else pattern).casefold()
+        if after_key is None:
+            entries = self.surnames.iterFrom((folded,))
+        else:
+            entries = self.surnames.iterAfter((after_key[0], after_key))
+        for key, node in entries:
+            if not (key[0].startswith(folded) if prefix else key[0] == folded):
+                break
+            yield node.getVal()
+
+    def getContactsByPhone(self, cc: int, area: int, number: int) -> list:
+        """Gets every contact with the given full phone number, from the
+        phone number index.
+
+        Args:
+            cc (int): Numeric country code.
+            area (int): Area code.
+            number (int): Contact number.
+
+        Returns:
+            list: Contacts with that phone number, in list order.
+        """
+        nodes = self.phones.get((cc, area, number), ())
+        return [node.getVal() for node in sorted(nodes, key=lambda node: node.key)]
+
+    def searchPhone(self, cc: int, area: int = None) -> list:
+        """Gets every contact in a country, or in an area of a country,
+        ordered by phone number.
+
+        Args:
+            cc (int): Numeric country code.
+            area (int, optional): Area code. Defaults to None, for every area.
+
+        Returns:
+            list: Matching contacts, ordered by area code, number and then list order.
+        """
+        if area is None:
+            return list(self.iterPhoneRange((cc,), (cc + 1,)))
+        return list(self.iterPhoneRange((cc, area), (cc, area + 1)))
+
+    def iterPhoneRange(self, low: tuple, high: tuple):
+        """Iterates, ordered by phone number, over the contacts whose
+        (cc, area, number) is at least low and below high. Either bound
+        may be shortened to a prefix, e.g. (63,) or (63, 2).
+
+        Args:
+            low (tuple): Smallest phone key to include.
+            high (tuple): Phone key to stop at.
+
+        Yields:
+            Contact: Next contact in the range.
+        """
+        for key, node in self.phone_order.iterFrom(low):
+            if key >= high:
+                break
+            yield node.getVal()
+
+    def searchFuzzy(self, name: str, limit: int = 10) -> list:
+        """Searches contacts whose first or last name is similar to the
+        given name, ignoring case, e.g. "Rizall" finds "Rizal". Only names
+        sharing a trigram with it are compared.
+
+        Args:
+            name (str): Name to search for, possibly misspelled.
+            limit (int, optional): Most contacts returned. Defaults to 10.
+
+        Returns:
+            list: Matching contacts, closest names first, then in list order.
+        """
+        self.buildNameIndex()
+        found = []
+        seen = set()
+        for _, term in self.names.search(name.casefold()):
+            for node in heapq.nsmallest(limit + len(found), self.names.get(term), key=lambda node: node.key):
+                if len(found) == limit:
+                    return found
+                if node not in seen:
+                    seen.add(node)
+                    found.append(node.getVal())
+        return found
+    
+    def buildNameIndex(self) -> None:
+        """Builds the name index searched by searchFuzzy, which is then
+        kept up to date. Does nothing if it is already built.
+        """
+        if self.names is not None:
+            return
+        self.names = TrigramIndex()
         current = self.sentinel.next()
         while current is not None:
-            if current.getVal().getLName() == surname:
-                return current.getVal()
+            for term in ContactList._nameTerms(current):
+                self.names.add(term, current)
             current = current.next()
 
-        return None
-    
+    @staticmethod
+    def _nameTerms(node: ContactNode) -> set:
+        """Gets the terms a node is filed under in the name index.
+
+        Args:
+            node (ContactNode): Node to get the terms of.
+
+        Returns:
+            set: Case-folded last and first names of its key.
+        """
+        return {node.key[0], node.key[1]}
+
+    def __iter__(self):
+        """Iterates over the contacts of this contact list in order."""
+        current = self.sentinel.next()
+        while current is not None:
+            yield current.getVal()
+            current = current.next()
+
+    def __len__(self) -> int:
+        """Gets the size of this contact list."""
+        return self.getSize()
+
+    def iterByCountry(self, f: list):
+        """Iterates, in name order, over the contacts with any of the given
+        country codes. Only the country buckets are visited, merging them
+        when more than one country is given.
+
+        Args:
+            f (list): Country codes to list.
+
+        Yields:
+            Contact: Next contact with one of the country codes.
+        """
+        buckets = [self.buckets[cc] for cc in dict.fromkeys(f) if cc in self.buckets]
+        if len(buckets) == 1:
+            for node in buckets[0]:
+                yield node.getVal()
+        else:
+            for _, node in heapq.merge(*(bucket.items() for bucket in buckets),
+                                       key=lambda entry: entry[0]):
+                yield node.getVal()
+
+    def iterOrder(self, order: str = "lname", f: list = None, after_key = None):
+        """Iterates over the contacts in one of ORDERS, read from the index
+        kept for it. Raises ValueError if the order is unknown.
+
+        Args:
+            order (str, optional): "lname" for last name, "fname" for first
+                name, "stdn" for student number or "phone" for phone
+                number. Defaults to "lname".
+            f (list, optional): Country codes to keep, as in __str__.
+                Defaults to None, which keeps every country.
+            after_key (optional): Key, as given by orderKey, to start after.
+                Defaults to None, which starts from the first contact.
+
+        Yields:
+            Contact: Next contact in the order.
+        """
+        if order not in ContactList.ORDERS:
+            raise ValueError("Unknown order {!r}, expected one of {}.".format(order, ", ".join(ContactList.ORDERS)))
+
+        if order == "lname" and after_key is None:
+            yield from self.filterContacts(f)
+        elif order == "lname" and f is None:
+            # The surname index holds every node in list order
+            for _, node in self.surnames.iterAfter((after_key[0], after_key)):
+                yield node.getVal()
+        elif order == "lname":
+            buckets = [self.buckets[cc] for cc in dict.fromkeys(f) if cc in self.buckets]
+            for _, node in heapq.merge(*(bucket.iterAfter(after_key) for bucket in buckets),
+                                       key=lambda entry: entry[0]):
+                yield node.getVal()
+        elif order == "phone" and f is not None:
+            # Phone numbers start with the country code, so each one is a range
+            for cc in sorted(set(f)):
+                low = (cc,) if after_key is None else max(after_key, (cc,))
+                for key, node in self.phone_order.iterAfter(low):
+                    if key >= (cc + 1,):
+                        break
+                    yield node.getVal()
+        else:
+            index = {"fname": self.fname_order, "stdn": self.stdn_order, "phone": self.phone_order}[order]
+            codes = None if f is None else set(f)
+            for _, node in index.iterAfter(after_key):
+                c = node.getVal()
+                if codes is None or c.getNumericCountryCode() in codes:
+                    yield c
+
+    def flushIndexes(self) -> None:
+        """Merges the entries waiting in the secondary indexes, so reads
+        that follow do not modify this list.
+        """
+        for bucket in self.buckets.values():
+            bucket.flush()
+        self.surnames.flush()
+        self.phone_order.flush()
+        self.fname_order.flush()
+        self.stdn_order.flush()
+
     def isEmpty(self) -> bool:
         """
             Checks if contact list has no contacts.
@@ -150,34 +565,97 @@ class ContactList:
 
     def insert(self, c : Contact):
         """Inserts new contact to the phonebook.
+        Raises ValueError if the student number is already in the phonebook.
 
         Args:
             c (Contact): Contact to be inserted.
         """
         # Complete this method
-        new_node = ContactList.ContactNode(c, None)
+        if c.getStudentNumber() in self.index:
+            raise ValueError("Student number {} is already in the phonebook.".format(
+                c.getStudentNumber()))
 
-        if self.isEmpty():
-            self.sentinel.setNext(new_node)
-        else:
-            current = self.sentinel.next()
-            prev = self.sentinel
+        new_node = self._newNode(c)
+        self._linkNode(new_node)
+        self._indexNode(new_node)
+        self.incrSize()
 
-            while current is not None and c.compareNames(current.getVal(), c) < 0:
-                prev = current
-                current = current.next()
+    def insertMany(self, contacts) -> None:
+        """Inserts a batch of contacts to the phonebook. The batch is
+        sorted once by name and then merged into the list in a single
+        pass, so this costs O(m log m + n) instead of m inserts.
+        Raises ValueError, before inserting anything, if a student number
+        is repeated or is already in the phonebook.
 
-            prev.setNext(new_node)
-            new_node.setNext(current)
+        Args:
+            contacts (iterable): Contacts to be inserted.
+        """
+        batch = []
+        seen = set()
+        for c in contacts:
+            stdn = c.getStudentNumber()
+            if stdn in self.index or stdn in seen:
+                raise ValueError("Student number {} is already in the phonebook.".format(stdn))
+            seen.add(stdn)
+            batch.append(self._newNode(c))
+
+        self._linkBatch(batch)
+        for new_node in batch:
+            self._indexNode(new_node)
+        self.size += len(batch)
+
+    def _linkBatch(self, nodes: list) -> None:
+        """Links a batch of new nodes by sorting them and merging them
+        into the list in one pass. Subclasses with extra structure over
+        the list override this to rebuild it.
 
-        self.incrSize()
+        Args:
+            nodes (list): New nodes, in the order they were given.
+        """
+        batch = sorted(nodes, key=lambda node: node.key)
+
+        prev = self.sentinel
+        for new_node in batch:
+            while prev.next() is not None and prev.next().key < new_node.key:
+                prev = prev.next()
+            self._linkAfter(prev, new_node)
+            prev = new_node
+
+    def _newNode(self, c: Contact) -> ContactNode:
+        """Creates the node that will hold a new contact.
+
+        Args:
+            c (Contact): Contact to be held by the node.
+
+        Returns:
+            ContactNode: New unlinked node.
+        """
+        return ContactList.ContactNode(c, None, key=c.getSortKey(), phone=ContactList.phoneKey(c))
 
-    def __findNodeInsertion(self, c: Contact) -> ContactNode:
-        """Finds the node to insert from based on contact's
-        last name, and first name if both have the same first names.
+    def _linkNode(self, node: ContactNode) -> None:
+        """Links a new node at its sorted position in the list.
+        Subclasses with a different ordered structure override this.
 
         Args:
-            c (Contact): Contact to compare and to be inserted.
+            node (ContactNode): Node to be linked.
+        """
+        self._linkAfter(self._findNodeInsertion(node.key), node)
+
+    def _unlinkNode(self, node: ContactNode) -> None:
+        """Unlinks a node from the list.
+        Subclasses with a different ordered structure override this.
+
+        Args:
+            node (ContactNode): Node to be unlinked.
+        """
+        self._unlink(node)
+
+    def _findNodeInsertion(self, key: tuple) -> ContactNode:
+        """Finds the node to insert from based on the sort key of the
+        new contact, see Contact.getSortKey.
+
+        Args:
+            key (tuple): Sort key of the contact to be inserted.
 
         Returns:
             ContactNode: Node insertion point for new contact.
@@ -186,7 +664,7 @@ class ContactList:
         current = self.sentinel.next()
         prev = self.sentinel
 
-        while current is not None and c.compareNames(current.getVal(), c) < 0:
+        while current is not None and current.key < key:
             prev = current
             current = current.next()
 
@@ -203,23 +681,258 @@ class ContactList:
             Contact: Deleted contact, if found.
         """
         # Complete this method
-        current = self.sentinel.next()
-        prev = self.sentinel
+        node = self.index.pop(stdn, None)
+        if node is None:
+            return -1
 
-        while current is not None and current.getVal().getStudentNumber() != stdn:
-            prev = current
-            current = current.next()
+        self._unlinkNode(node)
+        self._unindexNode(node)
+        self.decrSize()
+        return node.getVal()
+
+    def deleteContacts(self, stdns) -> list:
+        """Deletes the contacts with the given student numbers. A large
+        batch is unlinked and removed from the indexes in one pass
+        instead of one contact at a time.
+
+        Args:
+            stdns (iterable): Student numbers of contacts to be deleted.
+
+        Returns:
+            list: Deleted contact for each student number, in input order,
+                or None where it was not found. A student number repeated
+                in the batch is only found the first time.
+        """
+        deleted = []
+        nodes = []
+        for stdn in stdns:
+            node = self.index.pop(stdn, None)
+            deleted.append(None if node is None else node.getVal())
+            if node is not None:
+                nodes.append(node)
+
+        self._unlinkBatch(nodes)
+        self._unindexBatch(nodes)
+        self.size -= len(nodes)
+        return deleted
+
+    def _unlinkBatch(self, nodes: list) -> None:
+        """Unlinks a batch of nodes. Subclasses with extra structure over
+        the list override this to rebuild it.
+
+        Args:
+            nodes (list): Nodes to be unlinked.
+        """
+        for node in nodes:
+            self._unlinkNode(node)
+
+    def _unindexBatch(self, nodes: list) -> None:
+        """Removes a batch of unlinked nodes from the secondary indexes,
+        filtering each index once when the batch is large.
+
+        Args:
+            nodes (list): Nodes to be removed from the indexes.
+        """
+        if len(nodes) < SortedIndex.MERGE_THRESHOLD:
+            for node in nodes:
+                self._unindexNode(node)
+            return
+
+        removed = set(map(id, nodes))
+        for bucket in self.buckets.values():
+            bucket.removeMany(removed)
+        self.surnames.removeMany(removed)
+        self.phone_order.removeMany(removed)
+        self.fname_order.removeMany(removed)
+        self.stdn_order.removeMany(removed)
+        for node in nodes:
+            self._unfilePhone(node, node.phone)
+            if self.names is not None:
+                for term in ContactList._nameTerms(node):
+                    self.names.remove(term, node)
+            self._touch(node.phone[0])
+            node.getVal().removeObserver(self)
+
+    def _indexNode(self, node: ContactNode) -> None:
+        """Adds a newly linked node to the indexes of this list.
+
+        Args:
+            node (ContactNode): Node to be indexed.
+        """
+        lname, fname, stdn = node.key
+        self.index[stdn] = node
+        self.buckets.setdefault(node.phone[0], SortedIndex()).add(node.key, node)
+        self.surnames.add((lname, node.key), node)
+        self.fname_order.add((fname, node.key), node)
+        self.stdn_order.add(stdn, node)
+        if self.names is not None:
+            for term in ContactList._nameTerms(node):
+                self.names.add(term, node)
+        self._indexPhone(node, node.phone)
+        self._touch(node.phone[0])
+        node.getVal().addObserver(self)
+
+    def _unindexNode(self, node: ContactNode) -> None:
+        """Removes an unlinked node from the indexes of this list.
+        The student number index is left to the caller.
+
+        Args:
+            node (ContactNode): Node to be removed from the indexes.
+        """
+        lname, fname, stdn = node.key
+        self.buckets[node.phone[0]].remove(node.key, node)
+        self.surnames.remove((lname, node.key), node)
+        self.fname_order.remove((fname, node.key), node)
+        self.stdn_order.remove(stdn, node)
+        if self.names is not None:
+            for term in ContactList._nameTerms(node):
+                self.names.remove(term, node)
+        self._unindexPhone(node, node.phone)
+        self._touch(node.phone[0])
+        node.getVal().removeObserver(self)
+
+    def _touch(self, cc: int) -> None:
+        """Records a change to the contacts of a country code, so outputs
+        of __str__ that include it are rendered again.
+
+        Args:
+            cc (int): Numeric country code of the changed contact.
+        """
+        self.version += 1
+        self.cc_versions[cc] = self.cc_versions.get(cc, 0) + 1
+
+    def _indexPhone(self, node: ContactNode, phone: tuple) -> None:
+        """Adds a node to the phone number indexes.
+
+        Args:
+            node (ContactNode): Node to be indexed.
+            phone (tuple): (cc, area, number) to file it under.
+        """
+        self.phones.setdefault(phone, []).append(node)
+        self.phone_order.add(phone + (node.key,), node)
+
+    def _unindexPhone(self, node: ContactNode, phone: tuple) -> None:
+        """Removes a node from the phone number indexes.
+
+        Args:
+            node (ContactNode): Node to be removed.
+            phone (tuple): (cc, area, number) it was filed under.
+        """
+        self._unfilePhone(node, phone)
+        self.phone_order.remove(phone + (node.key,), node)
+
+    def _unfilePhone(self, node: ContactNode, phone: tuple) -> None:
+        """Removes a node from the exact phone number index only."""
+        nodes = self.phones[phone]
+        nodes.remove(node)
+        if not nodes:
+            del self.phones[phone]
+
+    def _linkAfter(self, prev: ContactNode, node: ContactNode) -> None:
+        """Links a node into the list right after the given node.
+
+        Args:
+            prev (ContactNode): Node to link after. May be the sentinel.
+            node (ContactNode): Node to be linked.
+        """
+        self.cursor = None
+        node.setPrev(prev)
+        node.setNext(prev.next())
+        if prev.next() is not None:
+            prev.next().setPrev(node)
+        prev.setNext(node)
+
+    def _unlink(self, node: ContactNode) -> None:
+        """Unlinks a node from the list using its previous pointer.
+
+        Args:
+            node (ContactNode): Node to be unlinked.
+        """
+        self.cursor = None
+        node.getPrev().setNext(node.next())
+        if node.next() is not None:
+            node.next().setPrev(node.getPrev())
+        node.setNext(None)
+        node.setPrev(None)
+
+    def onContactChanged(self, c: Contact, field: str, old_value) -> None:
+        """Keeps the list order and the student number, country code,
+        name and phone number indexes up to date when a contact in this
+        list is edited.
+        A contact whose sort key changes is moved to its new position on
+        its own. Does nothing if the contact was deleted from this list
+        after the edit was made. Called by Contact.notifyObservers.
+        Raises ValueError if a new student number is already taken.
 
-        if current is not None:
-            prev.setNext(current.next())
-            deleted_contact = current.getVal()
-            self.decrSize()
-            return deleted_contact
+        Args:
+            c (Contact): Contact that was edited.
+            field (str): Name of the changed attribute.
+            old_value: Value of the attribute before the change.
+        """
+        node = self.index.get(old_value if field == "student_num" else c.getStudentNumber())
+        if node is None or node.getVal() is not c:
+            return
+
+        self._touch(node.phone[0])
+        if field == "student_num":
+            new_stdn = c.getStudentNumber()
+            if new_stdn in self.index and self.index[new_stdn] is not node:
+                raise ValueError("Student number {} is already in the phonebook.".format(new_stdn))
+            del self.index[old_value]
+            self.index[new_stdn] = node
+            # The student number breaks ties between equal names
+            self._relocateNode(node)
+        elif field in ("cc", "area", "number"):
+            phone = ContactList.phoneKey(c)
+            if phone[0] != node.phone[0]:
+                self.buckets[node.phone[0]].remove(node.key, node)
+                self.buckets.setdefault(phone[0], SortedIndex()).add(node.key, node)
+                self._touch(phone[0])
+            self._unindexPhone(node, node.phone)
+            node.phone = phone
+            self._indexPhone(node, phone)
+        elif field in ("lname", "fname") and c.getSortKey() != node.key:
+            if self.names is not None:
+                for term in ContactList._nameTerms(node):
+                    self.names.remove(term, node)
+            self._relocateNode(node)
+            if self.names is not None:
+                for term in ContactList._nameTerms(node):
+                    self.names.add(term, node)
+
+    def _relocateNode(self, node: ContactNode) -> None:
+        """Moves a node whose contact's sort key changed to its new sorted
+        position, and files it in the indexes under its new key.
 
-        return -1
+        Args:
+            node (ContactNode): Node of the edited contact, still holding
+                its old key.
+        """
+        bucket = self.buckets[node.phone[0]]
+        # The old key is (last name, first name, student number) before the edit
+        lname, fname, stdn = node.key
+        bucket.remove(node.key, node)
+        self.surnames.remove((lname, node.key), node)
+        self.fname_order.remove((fname, node.key), node)
+        self.stdn_order.remove(stdn, node)
+        self.phone_order.remove(node.phone + (node.key,), node)
+
+        self._unlinkNode(node)
+        node.key = node.getVal().getSortKey()
+        self._linkNode(node)
+
+        lname, fname, stdn = node.key
+        bucket.add(node.key, node)
+        self.surnames.add((lname, node.key), node)
+        self.fname_order.add((fname, node.key), node)
+        self.stdn_order.add(stdn, node)
+        self.phone_order.add(node.phone + (node.key,), node)
         
     def __str__(self, f = None) -> str:
         """Prints every contact in this contact list.
+        The output for each filter is kept, and only rendered again once
+        a contact of a country it covers is inserted, deleted or edited.
+        Contacts keep their own rendering, so only those are rendered anew.
 
         Args:
             f (list, optional): A list that filters which contact should
@@ -228,26 +941,23 @@ class ContactList:
         Returns:
             str: Every contact in this contact list.
         """
-        # Complete this method
-        s = "<----Phonebook---->"
-        current = self.sentinel.next()
-
-        if f is not None:
-            # Print contacts based on selected country code(s)
-            while current is not None:
-                if current.getVal().getNumericCountryCode() in f:
-                    s += "\n" + str(current.getVal())
-                current = current.next()
+        if f is None:
+            key = None
+            versions = self.version
         else:
-        # Print all contacts
-            while current is not None:
-                s += "\n" + str(current.getVal())
-                current = current.next()
-
-            if self.isEmpty():
-            # Complete this method.
-                s += "\nThis phonebook is currently empty..."
-
-        s += "\n<----End---->"
-        return s
-    
+            key = frozenset(f)
+            versions = tuple(self.cc_versions.get(cc, 0) for cc in sorted(key))
+
+        dump = self.dumps.get(key)
+        if dump is not None and dump[0] == versions:
+            return dump[1]
+
+        text = self.render(f)
+        self.dumps.pop(key, None)
+        if self.dump_cache_size < 1:
+            return text
+        if len(self.dumps) >= self.dump_cache_size:
+            # Drop the filter rendered longest ago
+            del self.dumps[next(iter(self.dumps))]
+        self.dumps[key] = (versions, text)
+        return text
@@ -0,0 +1,197 @@
+# Filtering, paging and output shared by every contact list backend
+import itertools
+from Contact import Contact
+
+
+class ContactListing:
+    """Mixin for contact lists that only need iteration to be filtered,
+    paged and printed. A class using it provides __iter__, isEmpty,
+    iterByCountry, iterOrder and iterSurname.
+    """
+
+    # Orders a contact list can be streamed in, see iterOrder
+    ORDERS = ("lname", "fname", "stdn", "phone")
+
+    @staticmethod
+    def phoneKey(c: Contact) -> tuple:
+        """Gets the key a contact's phone number is indexed by.
+
+        Args:
+            c (Contact): Contact to get the key of.
+
+        Returns:
+            tuple: (country code, area code, number).
+        """
+        return (c.getNumericCountryCode(), c.getAreaCode(), c.getContactNumber())
+
+    @staticmethod
+    def orderKey(c: Contact, order: str):
+        """Gets the key a contact is sorted by in one of ORDERS.
+
+        Args:
+            c (Contact): Contact to get the key of.
+            order (str): "lname", "fname", "stdn" or "phone".
+
+        Returns:
+            Key of the contact, e.g. its sort key for "lname".
+        """
+        if order == "lname":
+            return c.getSortKey()
+        elif order == "fname":
+            return (c.getFName().casefold(), c.getSortKey())
+        elif order == "stdn":
+            return c.getStudentNumber()
+        elif order == "phone":
+            return ContactListing.phoneKey(c) + (c.getSortKey(),)
+        raise ValueError("Unknown order {!r}, expected one of {}.".format(order, ", ".join(ContactListing.ORDERS)))
+
+    def filterContacts(self, f = None, predicate = None):
+        """Iterates, in order, over the contacts that pass the given filters.
+
+        Args:
+            f (list, optional): Country codes to keep, as in __str__.
+                Defaults to None, which keeps every country.
+            predicate (function, optional): Function that takes a contact
+                and returns True to keep it. Defaults to None.
+
+        Yields:
+            Contact: Next contact that passes the filters.
+        """
+        for c in (self if f is None else self.iterByCountry(f)):
+            if predicate is None or predicate(c):
+                yield c
+
+    def page(self, after_key = None, limit: int = 20, f: list = None, order: str = "lname") -> tuple:
+        """Gets one page of contacts in one of ORDERS. The next page starts
+        after the returned cursor, so pages stay in step while contacts
+        are inserted or deleted between them. Raises ValueError if limit
+        is less than 1.
+
+        A page is found in O(log n + limit), with no copy of the list.
+        First name and student number order have no index per country,
+        so with a country filter they read every contact of the other
+        countries on the way, up to O(n) for a page.
+
+        Args:
+            after_key (optional): Cursor returned with the previous page.
+                Defaults to None, for the first page.
+            limit (int, optional): Most contacts in the page. Defaults to 20.
+            f (list, optional): Country codes to keep, as in __str__.
+                Defaults to None, which keeps every country.
+            order (str, optional): One of ORDERS. Defaults to "lname".
+
+        Returns:
+            tuple: The contacts of the page, and the cursor of the next
+                page, or None if this is the last page.
+        """
+        return ContactListing._pageOf(self.iterOrder(order, f, after_key), limit, order)
+
+    def pageSurname(self, pattern: str, after_key = None, limit: int = 20) -> tuple:
+        """Gets one page of the contacts found by searchSurname, read from
+        the surname index after the cursor, as page does. Raises
+        ValueError if limit is less than 1.
+
+        Args:
+            pattern (str): Surname or surname prefix followed by "*".
+            after_key (optional): Cursor returned with the previous page.
+                Defaults to None, for the first page.
+            limit (int, optional): Most contacts in the page. Defaults to 20.
+
+        Returns:
+            tuple: The contacts of the page, and the cursor of the next
+                page, or None if this is the last page.
+        """
+        return ContactListing._pageOf(self.iterSurname(pattern, after_key), limit, "lname")
+
+    @staticmethod
+    def _pageOf(contacts, limit: int, order: str) -> tuple:
+        """Takes one page from an iterator of contacts in one of ORDERS.
+
+        Args:
+            contacts (iterator): Contacts from the start of the page on.
+            limit (int): Most contacts in the page.
+            order (str): Order the contacts are in, for the cursor.
+
+        Returns:
+            tuple: The contacts of the page, and the cursor of the next
+                page, or None if this is the last page.
+        """
+        if limit < 1:
+            raise ValueError("Page limit must be at least 1, got {}.".format(limit))
+        contacts = list(itertools.islice(contacts, limit + 1))
+        if len(contacts) > limit:
+            return contacts[:limit], ContactListing.orderKey(contacts[limit - 1], order)
+        return contacts, None
+
+    def iterLines(self, f = None):
+        """Streams the lines printed by __str__, one contact per line,
+        without building the whole phonebook string in memory.
+
+        Args:
+            f (list, optional): A list that filters which contact should
+                be outputted. Defaults to None.
+
+        Yields:
+            str: Next line of the phonebook, without a newline.
+        """
+        yield "<----Phonebook---->"
+
+        if f is not None:
+            # Print contacts based on selected country code(s)
+            for c in self.iterByCountry(f):
+                yield str(c)
+        else:
+            # Print all contacts
+            for c in self:
+                yield str(c)
+
+            if self.isEmpty():
+                yield "This phonebook is currently empty..."
+
+        yield "<----End---->"
+
+    def writeTo(self, fileobj, f = None, buffer_lines: int = 1024) -> None:
+        """Writes the phonebook to a text file object, one line per
+        contact, in batches of buffer_lines lines.
+
+        Args:
+            fileobj: Text file object to write to, e.g. sys.stdout.
+            f (list, optional): A list that filters which contact should
+                be outputted. Defaults to None.
+            buffer_lines (int, optional): Lines joined per write. Defaults to 1024.
+        """
+        buffer = []
+        for line in self.iterLines(f):
+            buffer.append(line)
+            if len(buffer) >= buffer_lines:
+                buffer.append("")
+                fileobj.write("\n".join(buffer))
+                buffer = []
+        if buffer:
+            buffer.append("")
+            fileobj.write("\n".join(buffer))
+
+    def render(self, f = None) -> str:
+        """Renders every contact in this contact list, without the output
+        kept by __str__.
+
+        Args:
+            f (list, optional): A list that filters which contact should
+                be outputted. Defaults to None.
+
+        Returns:
+            str: Every contact in this contact list.
+        """
+        return "\n".join(self.iterLines(f))
+
+    def __str__(self, f = None) -> str:
+        """Prints every contact in this contact list.
+
+        Args:
+            f (list, optional): A list that filters which contact should
+                be outputted. Defaults to None.
+
+        Returns:
+            str: Every contact in this contact list.
+        """
+        return self.render(f)
@@ -0,0 +1,47 @@
+from Contact import Contact
+import random
+
+SURNAMES = ["Rizal", "Clara", "Xie", "Jacinto", "Dela Cruz", "Joestar"]
+
+def contactFields(stdn: str, stop: int, seed: int, names: int, start: int = 0, gender: str = "M",
+                  codes: list = (63,), area: int = 2, phones: bool = False) -> list:
+    """Creates the fields of test contacts with random first names and
+    surnames picked from SURNAMES, in student number order.
+
+    Args:
+        stdn (str): Format of the student numbers, e.g. "2000-{:04d}".
+        stop (int): Number the last student number comes before.
+        seed (int): Random seed.
+        names (int): Number of different first names to pick from.
+        start (int, optional): First student number. Defaults to 0.
+        gender (str, optional): Gender of every contact. Defaults to "M".
+        codes (list, optional): Country codes to pick from. Defaults to (63,).
+        area (int, optional): Area code of every contact. Defaults to 2.
+        phones (bool, optional): Pick area codes and numbers at random, so
+            phone numbers repeat. Defaults to False, for the student
+            number's own number as contact number.
+
+    Returns:
+        list: Contact fields, in the order Contact takes them.
+    """
+    rng = random.Random(seed)
+    fields = []
+    for i in range(start, stop):
+        fname = "Name{}".format(rng.randrange(names))
+        lname = rng.choice(SURNAMES)
+        cc = rng.choice(codes)
+        phone = (rng.randrange(1, 4), rng.randrange(50)) if phones else (area, i)
+        fields.append((stdn.format(i), fname, lname, "Student", gender, cc) + phone)
+    return fields
+
+def lists(fields: list, classes: list) -> list:
+    """Builds one list of each class from the same contact fields.
+
+    Args:
+        fields (list): Contact fields, e.g. from contactFields.
+        classes (list): Contact list classes to build.
+
+    Returns:
+        list: New contact lists, in the order of classes.
+    """
+    return [cls.fromContacts(Contact(*f) for f in fields) for cls in classes]
@@ -0,0 +1,220 @@
+# Opt-in instrumentation of ContactList operations
+#
+# Nothing is measured until enable() is called. enable() swaps the public
+# ContactList methods, ContactNode.next, SkipNode.nextAt and
+# Contact.getSortKey for counting wrappers, and disable() puts the
+# originals back, so a disabled build runs the unwrapped code.
+import inspect
+import json
+import threading
+import time
+from Contact import Contact
+from ContactList import ContactList
+from ContactListing import ContactListing
+from SkipContactList import SkipContactList
+
+enabled = False
+stats = {}
+originals = []
+# Guards stats, which every thread records into
+lock = threading.Lock()
+
+
+class Counters(threading.local):
+    """Counters of the outermost operation in progress on one thread."""
+
+    def __init__(self):
+        self.depth = 0
+        self.hops = 0
+        self.sort_keys = 0
+
+
+current = Counters()
+
+
+class OperationStats:
+    """Counts, node hops, sort keys built and a latency histogram
+    for one operation. Histogram bucket k counts calls that took
+    between 2^(k-1) and 2^k nanoseconds.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.hops = 0
+        self.sort_keys = 0
+        self.max_hops = 0
+        self.histogram = {}
+
+    def record(self, elapsed_ns: int, hops: int, sort_keys: int) -> None:
+        """Adds one call to these stats.
+
+        Args:
+            elapsed_ns (int): Time the call took.
+            hops (int): Nodes the call walked.
+            sort_keys (int): Contact sort keys the call built, as opposed
+                to read from the cache.
+        """
+        self.calls += 1
+        self.total_ns += elapsed_ns
+        self.hops += hops
+        self.sort_keys += sort_keys
+        self.max_hops = max(self.max_hops, hops)
+        bucket = elapsed_ns.bit_length()
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    def toDict(self) -> dict:
+        """Gets these stats as plain values, with latency buckets in microseconds.
+
+        Returns:
+            dict: Stats of the operation.
+        """
+        return {
+            "calls": self.calls,
+            "total_ms": self.total_ns / 1e6,
+            "mean_us": self.total_ns / self.calls / 1e3 if self.calls else 0.0,
+            "hops": self.hops,
+            "hops_per_call": self.hops / self.calls if self.calls else 0.0,
+            "max_hops": self.max_hops,
+            "sort_keys": self.sort_keys,
+            "latency_us": {"<={:g}".format((1 << bucket) / 1e3): count
+                           for bucket, count in sorted(self.histogram.items())},
+        }
+
+
+def operations(cls) -> list:
+    """Gets the operations of a contact list class that are timed: the
+    public methods it defines, and __str__. Generators are left out, as
+    their work is done after the call returns.
+
+    Args:
+        cls (class): Contact list class.
+
+    Returns:
+        list: Names of the methods.
+    """
+    return [name for name, value in cls.__dict__.items()
+            if (not name.startswith("_") or name == "__str__") and inspect.isfunction(value)
+            and not inspect.isgeneratorfunction(value)]
+
+
+def enable(classes = (ContactListing, ContactList, SkipContactList)) -> None:
+    """Starts counting. Does nothing if already enabled.
+
+    Args:
+        classes (tuple, optional): Contact list classes whose operations
+            are timed. Defaults to ContactListing, ContactList and SkipContactList.
+    """
+    global enabled
+    if enabled:
+        return
+    enabled = True
+
+    for cls in classes:
+        for name in operations(cls):
+            _patch(cls, name, _timed(name, cls.__dict__[name]))
+    _patch(ContactList.ContactNode, "next", _hop(ContactList.ContactNode.next))
+    _patch(SkipContactList.SkipNode, "nextAt", _hop(SkipContactList.SkipNode.nextAt))
+    _patch(Contact, "getSortKey", _sortKey(Contact.getSortKey))
+
+
+def disable() -> None:
+    """Stops counting and restores the original methods. Stats are kept."""
+    global enabled
+    while originals:
+        cls, name, original = originals.pop()
+        setattr(cls, name, original)
+    enabled = False
+
+
+def reset() -> None:
+    """Clears every collected stat."""
+    with lock:
+        stats.clear()
+
+
+def snapshot() -> dict:
+    """Gets the stats collected so far.
+
+    Returns:
+        dict: Stats keyed by operation name.
+    """
+    with lock:
+        return {name: op.toDict() for name, op in sorted(stats.items())}
+
+
+def dump(path: str) -> None:
+    """Writes a snapshot of the stats to a JSON file.
+
+    Args:
+        path (str): File to write.
+    """
+    with open(path, "w") as out:
+        json.dump({"time": time.time(), "operations": snapshot()}, out, indent=2)
+
+
+def startPeriodicDump(path: str, interval: float) -> threading.Event:
+    """Dumps the stats to a file every interval seconds from a daemon thread.
+
+    Args:
+        path (str): File to write.
+        interval (float): Seconds between dumps.
+
+    Returns:
+        threading.Event: Set it to stop dumping.
+    """
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            dump(path)
+
+    threading.Thread(target=run, daemon=True).start()
+    return stop
+
+
+def _patch(cls, name: str, replacement) -> None:
+    """Replaces a class attribute, remembering the original for disable()."""
+    originals.append((cls, name, cls.__dict__[name]))
+    setattr(cls, name, replacement)
+
+
+def _timed(name: str, method):
+    """Wraps a method so the outermost call is timed and its counters recorded."""
+    def wrapper(*args, **kwargs):
+        counters = current
+        if counters.depth > 0:
+            return method(*args, **kwargs)
+
+        counters.depth = 1
+        counters.hops = 0
+        counters.sort_keys = 0
+        start = time.perf_counter_ns()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            counters.depth = 0
+            with lock:
+                stats.setdefault(name, OperationStats()).record(elapsed, counters.hops, counters.sort_keys)
+
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+def _hop(method):
+    """Wraps a node traversal method so each call counts as one hop."""
+    def wrapper(*args):
+        current.hops += 1
+        return method(*args)
+    return wrapper
+
+
+def _sortKey(method):
+    """Wraps Contact.getSortKey so each key built, not cached, is counted."""
+    def wrapper(c):
+        if c.sort_key is None:
+            current.sort_keys += 1
+        return method(c)
+    return wrapper
@@ -1,6 +1,17 @@
 # Main Python File to run from
-from ContactList import ContactList
+import os
+from SkipContactList import SkipContactList
 from Contact import Contact
+from PhonebookFile import MappedContactList, checkContact, writePhonebook
+
+# Phonebook file loaded at start and saved on exit
+PHONEBOOK_FILE = "phonebook.pbk"
+# Set PHONEBOOK_STATS_INTERVAL to a number of seconds to record operation
+# stats and dump them to PHONEBOOK_STATS_FILE that often
+STATS_INTERVAL = os.environ.get("PHONEBOOK_STATS_INTERVAL")
+STATS_FILE = os.environ.get("PHONEBOOK_STATS_FILE", "phonebook_stats.json")
+# Contacts printed per page by the list views
+PAGE_SIZE = 20
 
 MENUS = {
     "main": {
@@ -14,7 +25,8 @@ MENUS = {
         1: "Search by country",
         2: "Search by surname",
         3: "View all",
-        4: "Go back to main menu"
+        4: "Search by phone number",
+        5: "Go back to main menu"
     },
     "edit": {
         1: "Student Number",
@@ -26,6 +38,12 @@ MENUS = {
         7: "Phone Number",
         8: "None - Go back to main menu"
     },
+    "order": {
+        1: "Last name", # lname
+        2: "First name", # fname
+        3: "Student number", # stdn
+        4: "Phone number" # phone
+    },
     "cc": {
         1: "Burma", # 856
         2: "Cambodia", # 855
@@ -123,10 +141,100 @@ def convertChoices(choices: list) -> list:
             case 11:
                 choices[i] = 65
     return choices
+
+def selectOrder() -> str:
+    """Prompts for the order to list contacts in.
+    Any choice not in the order menu keeps last name order.
+
+    Returns:
+        str: Order accepted by ContactList.iterOrder.
+    """
+    showMenu("order")
+    choice = prompt("Select order: ")
+    return {"1": "lname", "2": "fname", "3": "stdn", "4": "phone"}.get(choice.strip(), "lname")
+
+def listPages(pb, order: str, f: list = None):
+    """Fetches the pages of a contact list, each only when asked for.
+
+    Args:
+        pb (ContactList): Contact list to page through.
+        order (str): Order accepted by ContactList.page.
+        f (list, optional): Country codes to keep. Defaults to None.
+
+    Yields:
+        tuple: Contacts of the page, and whether another page follows.
+    """
+    after_key = None
+    while True:
+        contacts, after_key = pb.page(after_key, PAGE_SIZE, f, order)
+        yield contacts, after_key is not None
+        if after_key is None:
+            return
+
+def surnamePages(pb, pattern: str):
+    """Fetches the pages of a surname search, each only when asked for.
+
+    Args:
+        pb (ContactList): Contact list to search.
+        pattern (str): Pattern accepted by ContactList.searchSurname.
+
+    Yields:
+        tuple: Contacts of the page, and whether another page follows.
+    """
+    after_key = None
+    while True:
+        contacts, after_key = pb.pageSurname(pattern, after_key, PAGE_SIZE)
+        yield contacts, after_key is not None
+        if after_key is None:
+            return
+
+def editable(pb):
+    """Gets a contact list that can be changed. The saved phonebook is
+    read straight from its file until the first change, or the first
+    view the file has no index for, and is then copied into a
+    SkipContactList in one batch insert.
+
+    Args:
+        pb: MappedContactList of the saved phonebook, or an editable list.
+
+    Returns:
+        ContactList: Editable list with the same contacts.
+    """
+    if not isinstance(pb, MappedContactList):
+        return pb
+    loaded = SkipContactList()
+    loaded.insertMany(pb)
+    pb.close()
+    return loaded
+
+def printPages(pages) -> int:
+    """Prints contacts one page at a time, asking before fetching each next page.
+
+    Args:
+        pages (iterable): Pages as yielded by listPages or surnamePages.
+
+    Returns:
+        int: Number of contacts printed.
+    """
+    printed = 0
+    for contacts, more in pages:
+        for contact in contacts:
+            print(contact)
+        printed += len(contacts)
+        if not more or prompt("Press Enter for the next page, or Q to stop: ").lower() == "q":
+            break
+    return printed
                 
 
 if __name__ == "__main__":
-    pb = ContactList()
+    if STATS_INTERVAL:
+        import Instrumentation
+        Instrumentation.enable()
+        Instrumentation.startPeriodicDump(STATS_FILE, float(STATS_INTERVAL))
+
+    # Opening only reads the file header. Contacts are created as views
+    # reach them, and the phonebook is only copied by editable()
+    pb = MappedContactList(PHONEBOOK_FILE) if os.path.exists(PHONEBOOK_FILE) else SkipContactList()
     while True:
         showMenu("main")
         opt = int(input("Select Operation: "))
@@ -136,8 +244,13 @@ if __name__ == "__main__":
             # Store to ASEAN Phonebook
             while True:
                 contact = receiveContactInfo()
-                pb.insert(contact)
-                print("Contact added to the phonebook.")
+                try:
+                    checkContact(contact)
+                    pb = editable(pb)
+                    pb.insert(contact)
+                    print("Contact added to the phonebook.")
+                except ValueError as e:
+                    print(e)
                 add_another = input("Do you want to another entry? [Y/N]: ").lower()
                 if add_another != "y":
                     break  # Exit the loop if the user doesn't want to add another entry
@@ -148,12 +261,18 @@ if __name__ == "__main__":
             contact = pb.getContact(student_num)
 
             if contact is not None:
+                # Edits are made on the contact held by the editable list
+                pb = editable(pb)
+                contact = pb.getContact(student_num)
                 showMenu("edit")
                 edit_opt = int(input("Select what to edit: "))
                     
                 if edit_opt == 1:
                     new_stdn = prompt("Enter new student number: ")
-                    contact.setStudentNumber(new_stdn)
+                    try:
+                        contact.setStudentNumber(new_stdn)
+                    except ValueError as e:
+                        print(e)
 
                 elif edit_opt == 2:
                     new_surname = prompt("Enter new surname: ")
@@ -173,11 +292,23 @@ if __name__ == "__main__":
 
                 elif edit_opt == 6:
                     new_area = int(input("Enter new area code: "))
+                    old_area = contact.getAreaCode()
                     contact.setAreaCode(new_area)
+                    try:
+                        checkContact(contact)
+                    except ValueError as e:
+                        contact.setAreaCode(old_area)
+                        print(e)
 
                 elif edit_opt == 7:
                     new_number = int(input("Enter new phone number: "))
+                    old_number = contact.getContactNumber()
                     contact.setContactNumber(new_number)
+                    try:
+                        checkContact(contact)
+                    except ValueError as e:
+                        contact.setContactNumber(old_number)
+                        print(e)
 
                 elif edit_opt == 8:
                     # None - Go back to the main menu
@@ -192,7 +323,10 @@ if __name__ == "__main__":
         elif opt == 3:
             # Delete entry from ASEAN Phonebook
             student_num = prompt("Enter student number to delete: ")
-            deleted_contact = pb.deleteContact(student_num)
+            deleted_contact = -1
+            if pb.getContact(student_num) is not None:
+                pb = editable(pb)
+                deleted_contact = pb.deleteContact(student_num)
 
             if deleted_contact != -1:
                 print("Contact deleted:")
@@ -210,81 +344,59 @@ if __name__ == "__main__":
                 showMenu("cc", inline=3)
                 choices = convertChoices(list(map(int, input("\nSelect country code(s): ").split())))
 
-                # Get contacts based on selected country code(s)
-                contacts_found = [pb.getContactAtIndex(index) for index in range(pb.getSize())
-                                  if pb.getContactAtIndex(index).getNumericCountryCode() in choices]
-
-                # Bubble sort contacts alphabetically by last name
-                n = len(contacts_found)
-                for i in range(n):
-                    for j in range(0, n-i-1):
-                        current_contact = contacts_found[j]
-                        next_contact = contacts_found[j+1]
-
-                        if current_contact.getLName() > next_contact.getLName() or \
-                            (current_contact.getLName() == next_contact.getLName() and current_contact.getFName() > next_contact.getFName()):
-                            # Swap if the last name is greater or if the last names are equal, compare first names
-                            contacts_found[j], contacts_found[j+1] = contacts_found[j+1], contacts_found[j]
-
-                # Print sorted contacts
-                for contact in contacts_found:
-                    print(contact)
-
-                if not contacts_found:
+                # Every order is kept sorted, so each page is read as it is
+                order = selectOrder()
+                if order not in pb.ORDERS:
+                    pb = editable(pb)
+                if printPages(listPages(pb, order, f=None if 12 in choices else choices)) == 0:
                     print(f"No contacts found for the selected country code(s).")
 
 
             elif view_opt == 2:
                 # Search by surname
-                surname_to_search = prompt("Enter surname to search: ")
-
-                # Get contacts with the matching surname
-                matching_contacts = []
-                for i in range(pb.getSize()):
-                    contact = pb.getContactAtIndex(i)
-                    if contact.getLName().lower() == surname_to_search.lower():
-                        matching_contacts.append(contact)
-
-                if matching_contacts:
-                    # Bubble sort matching contacts alphabetically by last name and first name
-                    n = len(matching_contacts)
-                    for i in range(n):
-                        for j in range(0, n-i-1):
-                            current_contact = matching_contacts[j]
-                            next_contact = matching_contacts[j+1]
-
-                            if current_contact.getLName() > next_contact.getLName() or \
-                               (current_contact.getLName() == next_contact.getLName() and current_contact.getFName() > next_contact.getFName()):
-                                # Swap if the last name is greater or if the last names are equal, compare first names
-                                matching_contacts[j], matching_contacts[j+1] = matching_contacts[j+1], matching_contacts[j]
-
-                    # Print sorted contacts with the matching surname
-                    for contact in matching_contacts:
-                        print(contact)
-                else:
+                surname_to_search = prompt("Enter surname to search (end with * to match a prefix): ")
+
+                # Print contacts with the matching surname a page at a time, already sorted by first name
+                if printPages(surnamePages(pb, surname_to_search)) == 0:
                     print(f"No contacts found with the surname '{surname_to_search}'.")
+                    pb = editable(pb)
+                    suggestions = pb.searchFuzzy(surname_to_search.rstrip("*"))
+                    if suggestions:
+                        print("Did you mean:")
+                        for contact in suggestions:
+                            print(contact)
 
             elif view_opt == 3:
-                # View all contacts and sort alphabetically by last name and first name
-                all_contacts = [pb.getContactAtIndex(index) for index in range(pb.getSize())]
-
-                # Bubble sort contacts alphabetically by last name and first name
-                n = len(all_contacts)
-                for i in range(n):
-                    for j in range(0, n-i-1):
-                        current_contact = all_contacts[j]
-                        next_contact = all_contacts[j+1]
-
-                        if current_contact.getLName() > next_contact.getLName() or \
-                            (current_contact.getLName() == next_contact.getLName() and current_contact.getFName() > next_contact.getFName()):
-                            # Swap if the last name is greater or if the last names are equal, compare first names
-                            all_contacts[j], all_contacts[j+1] = all_contacts[j+1], all_contacts[j]
-
-                # Print sorted contacts
-                for contact in all_contacts:
-                    print(contact)
+                # View all contacts in an order that is kept sorted, a page at a time
+                order = selectOrder()
+                if order not in pb.ORDERS:
+                    pb = editable(pb)
+                if printPages(listPages(pb, order)) == 0:
+                    print("This phonebook is currently empty...")
 
             elif view_opt == 4:
+                # Search by full number, or list a country or an area by number
+                phone = prompt("Enter phone number as cc-area-number, cc-area or cc: ")
+                try:
+                    parts = [int(part) for part in phone.split("-")]
+                except ValueError:
+                    parts = []
+
+                if len(parts) == 3:
+                    matching_contacts = pb.getContactsByPhone(*parts)
+                elif len(parts) in (1, 2):
+                    matching_contacts = pb.searchPhone(*parts)
+                else:
+                    print("Invalid phone number. Please try again.")
+                    continue
+
+                for contact in matching_contacts:
+                    print(contact)
+
+                if not matching_contacts:
+                    print(f"No contacts found with the phone number '{phone}'.")
+
+            elif view_opt == 5:
                 # Go back to main menu
                 pass
 
@@ -292,7 +404,18 @@ if __name__ == "__main__":
                 print("Invalid option. Please try again.")
 
         elif opt == 5:
-            # Exit
+            # Exit, unless the phonebook cannot be saved. A phonebook still
+            # read from its file has not changed, so it is not written again
+            try:
+                if isinstance(pb, MappedContactList):
+                    pb.close()
+                else:
+                    writePhonebook(PHONEBOOK_FILE, pb)
+            except ValueError as e:
+                print("Could not save the phonebook: {} Fix the entry and try again.".format(e))
+                continue
+            if STATS_INTERVAL:
+                Instrumentation.dump(STATS_FILE)
             print("Exiting ASEAN Phonebook. Goodbye!")
             break
 
@@ -0,0 +1,66 @@
+# Reports the memory used per contact, measured with tracemalloc
+import sys
+import tracemalloc
+from Contact import Contact
+from ContactList import ContactList
+from SkipContactList import SkipContactList
+
+
+def makeContacts(n: int) -> list:
+    """Creates n synthetic contacts spread over every country code.
+
+    Args:
+        n (int): Number of contacts.
+
+    Returns:
+        list: New contacts.
+    """
+    codes = list(Contact.COUNTRY_CODES)
+    return [Contact("{:04d}-{:05d}".format(1950 + i % 70, i), "First{}".format(i),
+                    "Last{}".format(i % 5000), "Student", "MF"[i % 2],
+                    codes[i % len(codes)], i % 100, 100000 + i) for i in range(n)]
+
+
+def buildSearched(n: int) -> ContactList:
+    """Builds a contact list of n contacts with its fuzzy name index built.
+
+    Args:
+        n (int): Number of contacts.
+
+    Returns:
+        ContactList: New contact list.
+    """
+    pb = ContactList.fromContacts(makeContacts(n))
+    pb.buildNameIndex()
+    return pb
+
+
+def measure(build, n: int) -> float:
+    """Measures the bytes allocated per contact by build(n).
+
+    Args:
+        build (function): Function that builds and returns n contacts or a list of them.
+        n (int): Number of contacts.
+
+    Returns:
+        float: Bytes per contact still allocated after build returns.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(n)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return (after - before) / n
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print("Contacts: {}".format(n))
+    print("Contact only:          {:8.1f} bytes/contact".format(measure(makeContacts, n)))
+    print("ContactList:           {:8.1f} bytes/contact".format(
+        measure(lambda n: ContactList.fromContacts(makeContacts(n)), n)))
+    print("SkipContactList:       {:8.1f} bytes/contact".format(
+        measure(lambda n: SkipContactList.fromContacts(makeContacts(n)), n)))
+    print("ContactList, searched: {:8.1f} bytes/contact".format(
+        measure(buildSearched, n)))
@@ -0,0 +1,417 @@
+# Binary phonebook file format, read through mmap
+#
+# Layout of a phonebook file, all integers little-endian:
+#
+#   header    magic, version, contact count, and the offsets of the
+#             sections below
+#   records   one fixed-width record per contact, in phonebook order.
+#             Record i starts at records + i * RECORD.size, so the
+#             record section is also the sorted offset table.
+#   stdns     record numbers sorted by student number, for lookups
+#   heap      UTF-8 strings referenced by (offset, length) from records
+import bisect
+import mmap
+import os
+import struct
+from Contact import Contact
+from ContactListing import ContactListing
+
+MAGIC = b"ASEANPB\0"
+VERSION = 2
+HEADER = struct.Struct("<8sIIQQQ")
+# number, area, cc as signed 64-bit integers, then (offset, length) of
+# student number, first name, last name, occupation and gender in the heap
+RECORD = struct.Struct("<qqq10I")
+STDN = struct.Struct("<I")
+# Country code field of a record, at offset 16
+CC = struct.Struct("<q")
+CC_OFFSET = 16
+# Most contacts a MappedContactList keeps created at once
+LOADED_CACHE_SIZE = 4096
+# Range of the integer fields of a record
+INT_MIN = -(1 << 63)
+INT_MAX = (1 << 63) - 1
+
+
+def checkContact(c: Contact) -> None:
+    """Checks that a contact can be written to a phonebook file.
+    Raises ValueError if one of its numbers does not fit in a record.
+
+    Args:
+        c (Contact): Contact to check.
+    """
+    for name, value in (("country code", c.getNumericCountryCode()), ("area code", c.getAreaCode()),
+                        ("number", c.getContactNumber())):
+        if not isinstance(value, int) or not INT_MIN <= value <= INT_MAX:
+            raise ValueError("The {} of {} does not fit in a phonebook file.".format(name, c.getStudentNumber()))
+
+
+def writePhonebook(path: str, contacts) -> None:
+    """Writes contacts to a phonebook file, in the order given.
+    The file is written to a temporary name first and then renamed,
+    so a phonebook file is never left half written. Raises ValueError,
+    before writing anything, if a contact fails checkContact.
+
+    Args:
+        path (str): Path of the phonebook file.
+        contacts (iterable): Contacts in phonebook order, e.g. a ContactList.
+    """
+    records = bytearray()
+    heap = bytearray()
+    stdns = []
+
+    for i, c in enumerate(contacts):
+        checkContact(c)
+        refs = []
+        for value in (c.getStudentNumber(), c.getFName(), c.getLName(), c.getOccupation(), c.getGender()):
+            data = value.encode("utf-8")
+            refs += [len(heap), len(data)]
+            heap += data
+        records += RECORD.pack(c.getContactNumber(), c.getAreaCode(), c.getNumericCountryCode(), *refs)
+        stdns.append((c.getStudentNumber(), i))
+    stdns.sort()
+
+    count = len(stdns)
+    records_offset = HEADER.size
+    stdns_offset = records_offset + len(records)
+    heap_offset = stdns_offset + count * STDN.size
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as out:
+        out.write(HEADER.pack(MAGIC, VERSION, count, records_offset, stdns_offset, heap_offset))
+        out.write(records)
+        out.write(b"".join(STDN.pack(i) for _, i in stdns))
+        out.write(heap)
+    os.replace(tmp_path, path)
+
+
+class MappedContactList(ContactListing):
+    """Read-only contact list over a phonebook file opened with mmap.
+    Opening only reads the header. Contacts are created from their
+    records the first time getContactAtIndex, iteration or a lookup
+    reaches them, and the last LOADED_CACHE_SIZE of them are kept, so a
+    full iteration does not hold every contact. A record read again after
+    its contact was dropped gives an equal, new Contact.
+
+    The records of a file written from a contact list are in last name
+    order, and the student number table is sorted, so those two of
+    ContactList.ORDERS can be paged without an index.
+    """
+
+    # Orders the file is sorted in, see iterOrder
+    ORDERS = ("lname", "stdn")
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Path of a file written by writePhonebook.
+        """
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.size, self.records, self.stdns, self.heap = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.map.close()
+            raise ValueError("{} is not a phonebook file.".format(path))
+        self.loaded = {}
+
+    def close(self) -> None:
+        """Closes the phonebook file."""
+        self.map.close()
+
+    def __enter__(self) -> 'MappedContactList':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def getSize(self) -> int:
+        """
+            Get the size of this contact list.
+        """
+        return self.size
+
+    def __len__(self) -> int:
+        """Gets the size of this contact list."""
+        return self.size
+
+    def isEmpty(self) -> bool:
+        """
+            Checks if contact list has no contacts.
+        """
+        return self.size == 0
+
+    def first(self) -> Contact:
+        """
+            Get the first contact in this contact list.
+            Returns none if list is empty.
+        """
+        return self.getContactAtIndex(0)
+
+    def getLast(self) -> Contact:
+        """
+            Get the last contact in this contact list.
+            Returns none if list is empty.
+        """
+        return self.getContactAtIndex(self.size - 1)
+
+    def getContactAtIndex(self, index: int) -> Contact:
+        """Gets the contact at given index. Returns None if index is not found.
+
+        Args:
+            index (int): Index to get in the contact list.
+
+        Returns:
+            Contact: Contact at index.
+        """
+        if index < 0 or index >= self.size:
+            return None
+
+        c = self.loaded.get(index)
+        if c is None:
+            number, area, cc, *refs = RECORD.unpack_from(self.map, self.records + index * RECORD.size)
+            stdn, fname, lname, occupation, gender = (self.__string(refs[i], refs[i + 1])
+                                                      for i in range(0, 10, 2))
+            c = Contact(stdn, fname, lname, occupation, gender, cc, area, number)
+            if len(self.loaded) >= LOADED_CACHE_SIZE:
+                # Drop the contact created longest ago
+                del self.loaded[next(iter(self.loaded))]
+            self.loaded[index] = c
+        return c
+
+    def getContact(self, identifier: str) -> Contact:
+        """Gets the contact based on given student number, by binary search
+        over the student number table. Will return None if contact is not found.
+
+        Args:
+            identifier (str): Student number to base search from.
+
+        Returns:
+            Contact: Contact information.
+        """
+        i = bisect.bisect_left(_Keys(self.size, self.studentNumberAt), identifier)
+        if i < self.size:
+            index = self.__recordAt(i)
+            c = self.getContactAtIndex(index)
+            if c.getStudentNumber() == identifier:
+                return c
+        return None
+
+    def getContacts(self, stdns) -> list:
+        """Gets the contacts with the given student numbers in one pass
+        over the student number table, visiting them in sorted order.
+
+        Args:
+            stdns (iterable): Student numbers to look up.
+
+        Returns:
+            list: Contact for each student number, in input order, or
+                None where it is not in this file.
+        """
+        stdns = list(stdns)
+        table = _Keys(self.size, self.studentNumberAt)
+        found = {}
+        i = 0
+        for stdn in sorted(set(stdns)):
+            i = bisect.bisect_left(table, stdn, i)
+            if i == self.size:
+                break
+            c = self.getContactAtIndex(self.__recordAt(i))
+            if c.getStudentNumber() == stdn:
+                found[stdn] = c
+        return [found.get(stdn) for stdn in stdns]
+
+    def __iter__(self):
+        """Iterates over the contacts of this contact list in order."""
+        for i in range(self.size):
+            yield self.getContactAtIndex(i)
+
+    def iterByCountry(self, f: list):
+        """Iterates, in order, over the contacts with any of the given
+        country codes. Country codes are read from the records, so only
+        matching contacts are created.
+
+        Args:
+            f (list): Country codes to list.
+
+        Yields:
+            Contact: Next contact with one of the country codes.
+        """
+        codes = set(f)
+        for i in range(self.size):
+            if self.countryCodeAt(i) in codes:
+                yield self.getContactAtIndex(i)
+
+    def iterOrder(self, order: str = "lname", f: list = None, after_key = None):
+        """Iterates over the contacts in one of ORDERS, read in file order
+        or through the student number table. Raises ValueError if the
+        order is not one of ORDERS.
+
+        Args:
+            order (str, optional): "lname" for last name or "stdn" for
+                student number. Defaults to "lname".
+            f (list, optional): Country codes to keep. Defaults to None,
+                which keeps every country.
+            after_key (optional): Key, as given by ContactList.orderKey, to
+                start after. Defaults to None, which starts from the first contact.
+
+        Yields:
+            Contact: Next contact in the order.
+        """
+        if order not in MappedContactList.ORDERS:
+            raise ValueError("Unknown order {!r}, expected one of {}.".format(
+                order, ", ".join(MappedContactList.ORDERS)))
+
+        if order == "lname":
+            keys, recordAt = _Keys(self.size, self.sortKeyAt), lambda i: i
+        else:
+            keys, recordAt = _Keys(self.size, self.studentNumberAt), self.__recordAt
+        start = 0 if after_key is None else bisect.bisect_right(keys, after_key)
+        codes = None if f is None else set(f)
+        for i in range(start, self.size):
+            index = recordAt(i)
+            if codes is None or self.countryCodeAt(index) in codes:
+                yield self.getContactAtIndex(index)
+
+    def iterSurname(self, pattern: str, after_key = None):
+        """Iterates over the contacts whose surname matches, ignoring case,
+        as in ContactList.searchSurname, found by bisect over the records.
+        Only matching contacts are created.
+
+        Args:
+            pattern (str): Surname or surname prefix followed by "*".
+            after_key (tuple, optional): Sort key to start after, see
+                Contact.getSortKey. Defaults to None.
+
+        Yields:
+            Contact: Next matching contact.
+        """
+        prefix = pattern.endswith("*")
+        folded = (pattern[:-1] if prefix else pattern).casefold()
+        keys = _Keys(self.size, self.sortKeyAt)
+        i = bisect.bisect_left(keys, (folded,)) if after_key is None else bisect.bisect_right(keys, after_key)
+        while i < self.size:
+            lname = self.sortKeyAt(i)[0]
+            if not (lname.startswith(folded) if prefix else lname == folded):
+                return
+            yield self.getContactAtIndex(i)
+            i += 1
+
+    def searchSurname(self, pattern: str) -> list:
+        """Searches contacts by surname, ignoring case, as in
+        ContactList.searchSurname.
+
+        Args:
+            pattern (str): Surname or surname prefix followed by "*".
+
+        Returns:
+            list: Matching contacts, ordered by surname and then list order.
+        """
+        return list(self.iterSurname(pattern))
+
+    def getContactsByPhone(self, cc: int, area: int, number: int) -> list:
+        """Gets every contact with the given full phone number. The file has
+        no phone index, so every record is read, but only matching
+        contacts are created.
+
+        Args:
+            cc (int): Numeric country code.
+            area (int): Area code.
+            number (int): Contact number.
+
+        Returns:
+            list: Contacts with that phone number, in list order.
+        """
+        phone = (cc, area, number)
+        return [self.getContactAtIndex(i) for i in range(self.size) if self.phoneAt(i) == phone]
+
+    def searchPhone(self, cc: int, area: int = None) -> list:
+        """Gets every contact in a country, or in an area of a country,
+        ordered by phone number, reading every record as getContactsByPhone does.
+
+        Args:
+            cc (int): Numeric country code.
+            area (int, optional): Area code. Defaults to None, for every area.
+
+        Returns:
+            list: Matching contacts, ordered by area code, number and then list order.
+        """
+        prefix = (cc,) if area is None else (cc, area)
+        found = []
+        for i in range(self.size):
+            phone = self.phoneAt(i)
+            if phone[:len(prefix)] == prefix:
+                found.append((phone, i))
+        found.sort()
+        return [self.getContactAtIndex(i) for _, i in found]
+
+    def phoneAt(self, index: int) -> tuple:
+        """Gets the phone number of the contact at index without creating it.
+
+        Args:
+            index (int): Index in the contact list.
+
+        Returns:
+            tuple: (country code, area code, number), see ContactList.phoneKey.
+        """
+        number, area, cc = RECORD.unpack_from(self.map, self.records + index * RECORD.size)[:3]
+        return (cc, area, number)
+
+    def countryCodeAt(self, index: int) -> int:
+        """Gets the country code of the contact at index without creating it.
+
+        Args:
+            index (int): Index in the contact list.
+
+        Returns:
+            int: Numeric country code.
+        """
+        return CC.unpack_from(self.map, self.records + index * RECORD.size + CC_OFFSET)[0]
+
+    def studentNumberAt(self, i: int) -> str:
+        """Gets the i-th smallest student number without creating its contact.
+
+        Args:
+            i (int): Position in the student number table.
+
+        Returns:
+            str: Student number.
+        """
+        refs = RECORD.unpack_from(self.map, self.records + self.__recordAt(i) * RECORD.size)[3:]
+        return self.__string(refs[0], refs[1])
+
+    def sortKeyAt(self, index: int) -> tuple:
+        """Gets the sort key of the contact at index without creating it,
+        see Contact.getSortKey.
+
+        Args:
+            index (int): Index in the contact list.
+
+        Returns:
+            tuple: (last name, first name, student number), names case-folded.
+        """
+        refs = RECORD.unpack_from(self.map, self.records + index * RECORD.size)[3:]
+        stdn, fname, lname = (self.__string(refs[i], refs[i + 1]) for i in range(0, 6, 2))
+        return (lname.casefold(), fname.casefold(), stdn)
+
+    def __recordAt(self, i: int) -> int:
+        """Gets the record number at position i of the student number table."""
+        return STDN.unpack_from(self.map, self.stdns + i * STDN.size)[0]
+
+    def __string(self, offset: int, length: int) -> str:
+        """Reads a string from the heap."""
+        start = self.heap + offset
+        return self.map[start:start + length].decode("utf-8")
+
+
+class _Keys:
+    """Sequence view of keys read from the file one at a time, for bisect."""
+
+    def __init__(self, size: int, keyAt):
+        self.size = size
+        self.keyAt = keyAt
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, i: int):
+        return self.keyAt(i)
@@ -0,0 +1,355 @@
+# Local asyncio lookup service over a contact list
+#
+# Run from this folder, e.g.
+#   python PhonebookServer.py serve --synthetic 100000
+#   python PhonebookServer.py load --connections 50 --requests 20000
+#
+# The protocol is one JSON object per line. Every request has an "op" and
+# an "id", and every response line carries the id of its request, so a
+# client may pipeline requests and match the responses as they arrive:
+#   {"id": 1, "op": "get", "stdn": "2018-1799"}
+#   {"id": 2, "op": "surname", "surname": "Riz*"}
+#   {"id": 3, "op": "list", "cc": [63, 84], "order": "fname"}
+#                                      (cc and order, one of ContactList.ORDERS, are optional)
+#   {"id": 4, "op": "insert", "contact": {...}}  (keyed by ContactIO.FIELDS)
+#   {"id": 5, "op": "delete", "stdn": "2018-1799"}
+#   {"id": 6, "op": "getMany", "stdns": ["2018-1799", ...]}
+#   {"id": 7, "op": "deleteMany", "stdns": ["2018-1799", ...]}
+#   {"id": 8, "op": "stats"}
+# A list response is streamed as one {"id", "contact"} line per contact,
+# followed by {"id", "ok": true, "count": n}.
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from Benchmark import percentile, syntheticContacts
+from ContactIO import parseRow, toRow
+from PhonebookFile import MappedContactList, writePhonebook
+from SkipContactList import SkipContactList
+
+
+class LookupBatcher:
+    """Coalesces the student number lookups made during one pass of the
+    event loop, and answers them together in one pass over the index.
+    """
+
+    def __init__(self, pb, delay: float = 0.0):
+        """
+        Args:
+            pb (ContactList): Contact list to look up.
+            delay (float, optional): Seconds to wait for more lookups
+                before answering a batch. Defaults to 0, for the next
+                pass of the event loop.
+        """
+        self.pb = pb
+        self.delay = delay
+        self.pending = {}
+        self.scheduled = False
+        self.batches = 0
+        self.lookups = 0
+
+    def lookup(self, stdn: str) -> asyncio.Future:
+        """Queues a lookup for the next batch.
+
+        Args:
+            stdn (str): Student number to look up.
+
+        Returns:
+            asyncio.Future: Resolves to the contact, or None if not found.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.setdefault(stdn, []).append(future)
+        if not self.scheduled:
+            self.scheduled = True
+            if self.delay > 0:
+                loop.call_later(self.delay, self.flush)
+            else:
+                loop.call_soon(self.flush)
+        return future
+
+    def flush(self) -> None:
+        """Answers every queued lookup."""
+        pending, self.pending = self.pending, {}
+        self.scheduled = False
+        self.batches += 1
+        for futures, c in zip(pending.values(), self.pb.getContacts(pending)):
+            for future in futures:
+                self.lookups += 1
+                if not future.cancelled():
+                    future.set_result(c)
+
+
+class PhonebookServer:
+    """Serves lookups, listings, inserts and deletes on a contact list
+    over TCP. Requests are handled on one event loop, so the contact
+    list needs no locking.
+    """
+
+    # Lines written to a stream between waits for the socket to drain
+    STREAM_CHUNK = 256
+
+    def __init__(self, pb = None, batch_delay: float = 0.0):
+        """
+        Args:
+            pb (ContactList, optional): Contact list to serve. Defaults
+                to a new SkipContactList.
+            batch_delay (float, optional): Seconds to wait for more
+                lookups before answering a batch. Defaults to 0.
+        """
+        self.pb = SkipContactList() if pb is None else pb
+        self.batcher = LookupBatcher(self.pb, batch_delay)
+        self.requests = 0
+        self.handlers = {"get": self.handleGet, "surname": self.handleSurname, "insert": self.handleInsert,
+                         "delete": self.handleDelete, "getMany": self.handleGetMany,
+                         "deleteMany": self.handleDeleteMany, "stats": self.handleStats}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        """Starts listening.
+
+        Args:
+            host (str, optional): Address to bind. Defaults to localhost.
+            port (int, optional): Port to bind, or 0 for any free port. Defaults to 8765.
+
+        Returns:
+            asyncio.AbstractServer: Running server.
+        """
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serves one connection until the client closes it. Each request
+        runs as its own task, so pipelined lookups join the same batch.
+        """
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.ensure_future(self.respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def respond(self, line: bytes, writer: asyncio.StreamWriter) -> None:
+        """Handles one request line and writes its response."""
+        self.requests += 1
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            op = request.get("op")
+            if op == "list":
+                await self.stream(request_id, request.get("cc"), writer, request.get("order"))
+                return
+            handler = self.handlers.get(op)
+            if handler is None:
+                raise ValueError("Unknown op {}".format(op))
+            response = await handler(request)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            response = {"ok": False, "error": str(e)}
+        response["id"] = request_id
+        writer.write((json.dumps(response) + "\n").encode())
+        await writer.drain()
+
+    async def handleGet(self, request: dict) -> dict:
+        """Looks up a contact by student number, in the next batch."""
+        c = await self.batcher.lookup(str(request["stdn"]))
+        return {"ok": True, "contact": None if c is None else toRow(c)}
+
+    async def handleSurname(self, request: dict) -> dict:
+        """Searches contacts by surname or surname prefix, as in searchSurname."""
+        return {"ok": True, "contacts": [toRow(c) for c in self.pb.searchSurname(str(request["surname"]))]}
+
+    async def handleInsert(self, request: dict) -> dict:
+        """Inserts a contact given as a row."""
+        self.pb.insert(parseRow(request["contact"]))
+        return {"ok": True}
+
+    async def handleDelete(self, request: dict) -> dict:
+        """Deletes a contact by student number, returning it if found."""
+        c = self.pb.deleteContact(str(request["stdn"]))
+        return {"ok": True, "contact": None if c == -1 else toRow(c)}
+
+    async def handleGetMany(self, request: dict) -> dict:
+        """Looks up many student numbers at once, with null for misses."""
+        contacts = self.pb.getContacts(str(stdn) for stdn in request["stdns"])
+        return {"ok": True, "contacts": [None if c is None else toRow(c) for c in contacts]}
+
+    async def handleDeleteMany(self, request: dict) -> dict:
+        """Deletes many student numbers at once, with null for misses."""
+        contacts = self.pb.deleteContacts(str(stdn) for stdn in request["stdns"])
+        return {"ok": True, "contacts": [None if c is None else toRow(c) for c in contacts]}
+
+    async def handleStats(self, request: dict) -> dict:
+        """Gets the list size and the request and batch counters."""
+        return {"ok": True, "size": self.pb.getSize(), "requests": self.requests,
+                "batches": self.batcher.batches, "lookups": self.batcher.lookups}
+
+    async def stream(self, request_id, f, writer: asyncio.StreamWriter, order: str = None) -> None:
+        """Streams the contacts of the list, or of some country codes,
+        one line each, a page at a time, waiting for the socket to drain
+        between pages. Contacts are in list order, or in the given one of
+        ContactList.ORDERS.
+        """
+        # Each page resumes after the cursor of the last one, so requests
+        # handled between pages are not blocked behind the whole listing,
+        # and inserts and deletes they make do not shift the pages
+        order = "lname" if order is None else order
+        after_key = None
+        count = 0
+        while True:
+            contacts, after_key = self.pb.page(after_key, PhonebookServer.STREAM_CHUNK, f, order)
+            writer.write("".join(json.dumps({"id": request_id, "contact": toRow(c)}) + "\n"
+                                 for c in contacts).encode())
+            count += len(contacts)
+            if after_key is None:
+                break
+            await writer.drain()
+            # drain returns at once while the buffer is small, so yield explicitly
+            await asyncio.sleep(0)
+        writer.write((json.dumps({"id": request_id, "ok": True, "count": count}) + "\n").encode())
+        await writer.drain()
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, message: dict) -> list:
+    """Sends one request and reads its response, for clients that do not
+    pipeline. A list response is returned as all of its lines.
+
+    Args:
+        reader (asyncio.StreamReader): Connection to the server.
+        writer (asyncio.StreamWriter): Connection to the server.
+        message (dict): Request, without an id.
+
+    Returns:
+        list: Response lines, decoded. The last one holds "ok".
+    """
+    writer.write((json.dumps(dict(message, id=0)) + "\n").encode())
+    await writer.drain()
+    lines = []
+    while True:
+        lines.append(json.loads(await reader.readline()))
+        if "ok" in lines[-1]:
+            return lines
+
+
+async def runLoad(host: str, port: int, connections: int = 50, requests: int = 20000,
+                  window: int = 16, miss_rate: float = 0.1, seed: int = 0) -> dict:
+    """Sends student number lookups from many connections at once, each
+    keeping up to window requests in flight, and measures the latency
+    of every request.
+
+    Args:
+        host (str): Server address.
+        port (int): Server port.
+        connections (int, optional): Concurrent connections. Defaults to 50.
+        requests (int, optional): Lookups sent in total. Defaults to 20000.
+        window (int, optional): Requests in flight per connection. Defaults to 16.
+        miss_rate (float, optional): Fraction of lookups for unknown
+            student numbers. Defaults to 0.1.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        dict: Requests, seconds, requests_per_sec, p50_ms, p99_ms and
+            max_ms of the run, and the server's mean lookups per batch.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    listing = await request(reader, writer, {"op": "list"})
+    stdns = [line["contact"]["student_num"] for line in listing[:-1]]
+    before = (await request(reader, writer, {"op": "stats"}))[0]
+    rng = random.Random(seed)
+    latencies = []
+
+    async def client(count: int) -> None:
+        conn_reader, conn_writer = await asyncio.open_connection(host, port)
+        sent = {}
+        slots = asyncio.Semaphore(window)
+
+        async def receive():
+            for _ in range(count):
+                response = json.loads(await conn_reader.readline())
+                latencies.append(time.perf_counter_ns() - sent.pop(response["id"]))
+                slots.release()
+
+        receiving = asyncio.ensure_future(receive())
+        for request_id in range(count):
+            await slots.acquire()
+            stdn = rng.choice(stdns) if stdns and rng.random() >= miss_rate else "0000-{:07d}".format(request_id)
+            sent[request_id] = time.perf_counter_ns()
+            conn_writer.write((json.dumps({"id": request_id, "op": "get", "stdn": stdn}) + "\n").encode())
+            await conn_writer.drain()
+        await receiving
+        conn_writer.close()
+        await conn_writer.wait_closed()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(requests // connections + (i < requests % connections))
+                           for i in range(connections)))
+    seconds = time.perf_counter() - start
+
+    after = (await request(reader, writer, {"op": "stats"}))[0]
+    writer.close()
+    await writer.wait_closed()
+    latencies.sort()
+    batches = after["batches"] - before["batches"]
+    return {
+        "requests": len(latencies),
+        "seconds": seconds,
+        "requests_per_sec": len(latencies) / seconds if seconds else 0.0,
+        "p50_ms": percentile(latencies, 50) / 1e6,
+        "p99_ms": percentile(latencies, 99) / 1e6,
+        "max_ms": latencies[-1] / 1e6 if latencies else 0.0,
+        "lookups_per_batch": (after["lookups"] - before["lookups"]) / batches if batches else 0.0,
+    }
+
+
+async def serve(pb, host: str, port: int, batch_delay: float) -> None:
+    """Serves a contact list until cancelled."""
+    server = await PhonebookServer(pb, batch_delay).start(host, port)
+    print("Serving {} contacts on {}:{}".format(pb.getSize(), host, server.sockets[0].getsockname()[1]))
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the ASEAN Phonebook on localhost, or load test it.")
+    parser.add_argument("action", choices=["serve", "load"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--phonebook", default="phonebook.pbk", help="Phonebook file to serve and update")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="Serve this many generated contacts instead of the phonebook file")
+    parser.add_argument("--batch-delay", type=float, default=0.0, help="Seconds to wait to fill a lookup batch")
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--window", type=int, default=16, help="Requests in flight per connection")
+    args = parser.parse_args()
+
+    if args.action == "load":
+        report = asyncio.run(runLoad(args.host, args.port, args.connections, args.requests, args.window))
+        print("{requests} requests in {seconds:.2f}s: {requests_per_sec:.0f} req/s, "
+              "p50 {p50_ms:.2f} ms, p99 {p99_ms:.2f} ms, max {max_ms:.2f} ms, "
+              "{lookups_per_batch:.1f} lookups per batch".format(**report))
+    else:
+        pb = SkipContactList()
+        if args.synthetic:
+            pb.insertMany(syntheticContacts(args.synthetic))
+        elif os.path.exists(args.phonebook):
+            with MappedContactList(args.phonebook) as saved:
+                pb.insertMany(saved)
+        try:
+            asyncio.run(serve(pb, args.host, args.port, args.batch_delay))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if not args.synthetic:
+                writePhonebook(args.phonebook, pb)
@@ -0,0 +1,520 @@
+# SQLite implementation of contacts
+import contextlib
+import sqlite3
+import weakref
+from Contact import Contact
+from ContactList import ContactList
+from ContactListing import ContactListing
+
+# Every query reads the row id first, see __contact
+COLUMNS = "id, student_num, fname, lname, occupation, gender, cc, area, number"
+# Columns written when a Contact setter changes a field
+FIELD_COLUMNS = {
+    "student_num": ("student_num",),
+    "fname": ("fname", "fname_folded"),
+    "lname": ("lname", "lname_folded"),
+    "occupation": ("occupation",),
+    "gender": ("gender",),
+    "cc": ("cc",),
+    "area": ("area",),
+    "number": ("number",),
+}
+# Same order as ContactList: by casefolded name, then student number
+ORDER = "ORDER BY lname_folded, fname_folded, student_num"
+# Sort columns of each of ContactList.ORDERS, matching the keys of ContactList.orderKey
+ORDER_COLUMNS = {
+    "lname": "lname_folded, fname_folded, student_num",
+    "fname": "fname_folded, lname_folded, student_num",
+    "stdn": "student_num",
+    "phone": "cc, area, number, lname_folded, fname_folded, student_num",
+}
+ORDER_BY = {order: "ORDER BY " + columns for order, columns in ORDER_COLUMNS.items()}
+# Student numbers per query of a batch lookup, below SQLite's parameter limit
+BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    id INTEGER PRIMARY KEY,
+    student_num TEXT NOT NULL UNIQUE,
+    fname TEXT NOT NULL,
+    lname TEXT NOT NULL,
+    lname_folded TEXT NOT NULL,
+    fname_folded TEXT NOT NULL,
+    occupation TEXT NOT NULL,
+    gender TEXT NOT NULL,
+    cc INTEGER NOT NULL,
+    area INTEGER NOT NULL,
+    number INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS contacts_name ON contacts (lname_folded, fname_folded, student_num);
+CREATE INDEX IF NOT EXISTS contacts_cc ON contacts (cc, lname_folded, fname_folded, student_num);
+CREATE INDEX IF NOT EXISTS contacts_fname ON contacts (fname_folded, lname_folded, student_num);
+CREATE INDEX IF NOT EXISTS contacts_phone ON contacts (cc, area, number, lname_folded, fname_folded, student_num);
+"""
+
+
+class SQLiteContactList(ContactListing):
+    """Contact List class that keeps the phonebook in a SQLite database,
+    with the same API as ContactList. Lookups by student number, name
+    order and country code are answered from indexes.
+
+    Contacts returned by this list are created from database rows, one
+    Contact per row for as long as it is referenced, so two lookups of
+    the same row give the same object. Editing one through its setters
+    writes the changed column back to its row.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Args:
+            path (str, optional): Database file. Defaults to ":memory:".
+        """
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        self.size = self.conn.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+        self.in_transaction = False
+        # Row id to its live Contact, and back
+        self.contacts = weakref.WeakValueDictionary()
+        self.row_ids = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def fromContacts(cls, contacts, *args, **kwargs) -> 'SQLiteContactList':
+        """Creates a contact list holding the given contacts, inserted in
+        one transaction.
+
+        Args:
+            contacts (iterable): Contacts to be stored.
+            *args, **kwargs: Passed to the contact list constructor.
+
+        Returns:
+            SQLiteContactList: New contact list.
+        """
+        pb = cls(*args, **kwargs)
+        pb.insertMany(contacts)
+        return pb
+
+    def close(self) -> None:
+        """Closes the database."""
+        self.conn.close()
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Groups every write made inside the with block into one
+        transaction, which is rolled back if the block raises.
+        """
+        if self.in_transaction:
+            yield
+            return
+
+        self.in_transaction = True
+        try:
+            yield
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            self.size = self.conn.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+            raise
+        finally:
+            self.in_transaction = False
+
+    def getSize(self) -> int:
+        """
+            Get the size of this contact list.
+        """
+        return self.size
+
+    def __len__(self) -> int:
+        """Gets the size of this contact list."""
+        return self.size
+
+    def isEmpty(self) -> bool:
+        """
+            Checks if contact list has no contacts.
+        """
+        return self.size == 0
+
+    def first(self) -> Contact:
+        """
+            Get the first contact in this contact list.
+            Returns none if list is empty.
+        """
+        return self.__one("SELECT {} FROM contacts {} LIMIT 1".format(COLUMNS, ORDER))
+
+    def getLast(self) -> Contact:
+        """
+            Get the last contact in this contact list.
+            Returns none if list is empty.
+        """
+        return self.__one("SELECT {} FROM contacts ORDER BY lname_folded DESC, fname_folded DESC, student_num DESC LIMIT 1".format(COLUMNS))
+
+    def getContactAtIndex(self, index: int) -> Contact:
+        """Gets the contact at given index in the contact list.
+        Returns None if index is not found in the list.
+
+        Args:
+            index (int): Index to get in the contact list.
+
+        Returns:
+            Contact: Contact at index.
+        """
+        if index < 0 or index >= self.size:
+            return None
+        return self.__one("SELECT {} FROM contacts {} LIMIT 1 OFFSET ?".format(COLUMNS, ORDER), (index,))
+
+    def getContact(self, identifier: str) -> Contact:
+        """Gets the contact based on given student number. Will return None
+        if contact is not found.
+
+        Args:
+            identifier (str): Student number to base search from.
+
+        Returns:
+            Contact: Contact information.
+        """
+        c = self.__one("SELECT {} FROM contacts WHERE student_num = ?".format(COLUMNS), (identifier,))
+        if c is not None or not str(identifier).isdigit():
+            return c
+        return self.__one("SELECT {} FROM contacts WHERE cc = ? {} LIMIT 1".format(COLUMNS, ORDER),
+                          (int(identifier),))
+
+    def getContacts(self, stdns) -> list:
+        """Gets the contacts with the given student numbers, with one
+        query per BATCH_SIZE student numbers. Identifiers are only
+        matched as student numbers, never as country codes.
+
+        Args:
+            stdns (iterable): Student numbers to look up.
+
+        Returns:
+            list: Contact for each student number, in input order, or
+                None where it is not in this list.
+        """
+        stdns = list(stdns)
+        found = {}
+        unique = list(dict.fromkeys(stdns))
+        for start in range(0, len(unique), BATCH_SIZE):
+            chunk = unique[start:start + BATCH_SIZE]
+            for c in self.__many("SELECT {} FROM contacts WHERE student_num IN ({})".format(
+                    COLUMNS, ", ".join("?" * len(chunk))), chunk):
+                found[c.getStudentNumber()] = c
+        return [found.get(stdn) for stdn in stdns]
+
+    def hasStudentNumber(self, stdn: str) -> bool:
+        """Checks if a contact with the given student number is in this list.
+
+        Args:
+            stdn (str): Student number to look for.
+
+        Returns:
+            bool: True if the student number is in this list.
+        """
+        return self.conn.execute("SELECT 1 FROM contacts WHERE student_num = ?", (stdn,)).fetchone() is not None
+
+    def getContactBySurname(self, surname: str) -> Contact:
+        """Gets the contact based on surname. Will return None if contact is not found.
+        """
+        # The folded surname narrows the search through contacts_name
+        return self.__one("SELECT {} FROM contacts WHERE lname_folded = ? AND lname = ? {} LIMIT 1".format(
+            COLUMNS, ORDER), (surname.casefold(), surname))
+
+    def getContactsBySurname(self, surname: str) -> list:
+        """Gets every contact with the given surname, ignoring case,
+        in list order.
+
+        Args:
+            surname (str): Surname to search for.
+
+        Returns:
+            list: Contacts with that surname. Empty if none are found.
+        """
+        return list(self.__many("SELECT {} FROM contacts WHERE lname_folded = ? {}".format(COLUMNS, ORDER),
+                                (surname.casefold(),)))
+
+    def searchSurname(self, pattern: str) -> list:
+        """Searches contacts by surname, ignoring case. A pattern ending
+        in "*" matches every surname starting with the rest of the
+        pattern, e.g. "Riz*". Otherwise the surname must match exactly.
+
+        Args:
+            pattern (str): Surname or surname prefix followed by "*".
+
+        Returns:
+            list: Matching contacts, ordered by surname and then list order.
+        """
+        if not pattern.endswith("*"):
+            return self.getContactsBySurname(pattern)
+
+        return list(self.iterSurname(pattern))
+
+    def iterSurname(self, pattern: str, after_key = None):
+        """Iterates over the contacts found by searchSurname, read from the
+        name index, starting after a sort key.
+
+        Args:
+            pattern (str): Surname or surname prefix followed by "*".
+            after_key (tuple, optional): Sort key to start after, see
+                Contact.getSortKey. Defaults to None.
+
+        Yields:
+            Contact: Next matching contact.
+        """
+        if pattern.endswith("*"):
+            prefix = pattern[:-1].casefold()
+            conditions = ["lname_folded >= ? AND lname_folded < ?"]
+            params = [prefix, prefix + chr(0x10FFFF)]
+        else:
+            conditions = ["lname_folded = ?"]
+            params = [pattern.casefold()]
+        if after_key is not None:
+            conditions.append("({}) > (?, ?, ?)".format(ORDER_COLUMNS["lname"]))
+            params += after_key
+        return self.__many("SELECT {} FROM contacts WHERE {} {}".format(COLUMNS, " AND ".join(conditions), ORDER),
+                           params)
+
+    def getContactsByPhone(self, cc: int, area: int, number: int) -> list:
+        """Gets every contact with the given full phone number.
+
+        Args:
+            cc (int): Numeric country code.
+            area (int): Area code.
+            number (int): Contact number.
+
+        Returns:
+            list: Contacts with that phone number, in list order.
+        """
+        return list(self.__many("SELECT {} FROM contacts WHERE cc = ? AND area = ? AND number = ? {}".format(
+            COLUMNS, ORDER), (cc, area, number)))
+
+    def searchPhone(self, cc: int, area: int = None) -> list:
+        """Gets every contact in a country, or in an area of a country,
+        ordered by phone number.
+
+        Args:
+            cc (int): Numeric country code.
+            area (int, optional): Area code. Defaults to None, for every area.
+
+        Returns:
+            list: Matching contacts, ordered by area code, number and then list order.
+        """
+        if area is None:
+            return list(self.iterPhoneRange((cc,), (cc + 1,)))
+        return list(self.iterPhoneRange((cc, area), (cc, area + 1)))
+
+    def iterPhoneRange(self, low: tuple, high: tuple):
+        """Iterates, ordered by phone number, over the contacts whose
+        (cc, area, number) is at least low and below high. Either bound
+        may be shortened to a prefix, e.g. (63,) or (63, 2).
+
+        Args:
+            low (tuple): Smallest phone key to include.
+            high (tuple): Phone key to stop at.
+
+        Yields:
+            Contact: Next contact in the range.
+        """
+        columns = ("cc", "area", "number")
+        return self.__many(
+            "SELECT {} FROM contacts WHERE ({}) >= ({}) AND ({}) < ({}) {}".format(
+                COLUMNS, ", ".join(columns[:len(low)]), ", ".join("?" * len(low)),
+                ", ".join(columns[:len(high)]), ", ".join("?" * len(high)), ORDER_BY["phone"]),
+            tuple(low) + tuple(high))
+
+    def __iter__(self):
+        """Iterates over the contacts of this contact list in order."""
+        return self.__many("SELECT {} FROM contacts {}".format(COLUMNS, ORDER))
+
+    def iterByCountry(self, f: list):
+        """Iterates, in name order, over the contacts with any of the given
+        country codes, using the country code index.
+
+        Args:
+            f (list): Country codes to list.
+
+        Yields:
+            Contact: Next contact with one of the country codes.
+        """
+        codes = list(dict.fromkeys(f))
+        if not codes:
+            return iter(())
+        return self.__many("SELECT {} FROM contacts WHERE cc IN ({}) {}".format(
+            COLUMNS, ", ".join("?" * len(codes)), ORDER), codes)
+
+    def iterOrder(self, order: str = "lname", f: list = None, after_key = None):
+        """Iterates over the contacts in one of ContactList.ORDERS, each
+        read in order from an index. Raises ValueError if the order is unknown.
+
+        Args:
+            order (str, optional): "lname", "fname", "stdn" or "phone".
+                Defaults to "lname".
+            f (list, optional): Country codes to keep. Defaults to None,
+                which keeps every country.
+            after_key (optional): Key, as given by ContactList.orderKey, to
+                start after. Defaults to None, which starts from the first contact.
+
+        Yields:
+            Contact: Next contact in the order.
+        """
+        if order not in ORDER_BY:
+            raise ValueError("Unknown order {!r}, expected one of {}.".format(order, ", ".join(ContactList.ORDERS)))
+        conditions = []
+        params = []
+        if f is not None:
+            codes = list(dict.fromkeys(f))
+            conditions.append("cc IN ({})".format(", ".join("?" * len(codes))))
+            params += codes
+        if after_key is not None:
+            # Resume from the index right after the key, instead of skipping rows with OFFSET
+            key = SQLiteContactList.__keyColumns(order, after_key)
+            conditions.append("({}) > ({})".format(ORDER_COLUMNS[order], ", ".join("?" * len(key))))
+            params += key
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+        return self.__many("SELECT {} FROM contacts {} {}".format(COLUMNS, where, ORDER_BY[order]), params)
+
+    @staticmethod
+    def __keyColumns(order: str, key) -> tuple:
+        """Flattens a key of ContactList.orderKey into the values of ORDER_COLUMNS[order]."""
+        if order == "lname":
+            return tuple(key)
+        elif order == "fname":
+            return (key[0], key[1][0], key[1][2])
+        elif order == "stdn":
+            return (key,)
+        return tuple(key[:3]) + tuple(key[3])
+
+    def insert(self, c: Contact):
+        """Inserts new contact to the phonebook.
+        Raises ValueError if the student number is already in the phonebook.
+
+        Args:
+            c (Contact): Contact to be inserted.
+        """
+        self.insertMany([c])
+
+    def insertMany(self, contacts) -> None:
+        """Inserts a batch of contacts to the phonebook in one transaction.
+        Raises ValueError, and inserts nothing, if a student number is
+        repeated or is already in the phonebook.
+
+        Args:
+            contacts (iterable): Contacts to be inserted.
+        """
+        contacts = list(contacts)
+        try:
+            with self.transaction():
+                # Ids are given here, so each contact is mapped to its row
+                first_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM contacts").fetchone()[0]
+                rows = [(first_id + i, c.getStudentNumber(), c.getFName(), c.getLName(), c.getLName().casefold(),
+                         c.getFName().casefold(), c.getOccupation(), c.getGender(), c.getNumericCountryCode(),
+                         c.getAreaCode(), c.getContactNumber()) for i, c in enumerate(contacts)]
+                self.conn.executemany(
+                    "INSERT INTO contacts (id, student_num, fname, lname, lname_folded, fname_folded, "
+                    "occupation, gender, cc, area, number) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                self.size += len(rows)
+        except sqlite3.IntegrityError:
+            raise ValueError("A student number is already in the phonebook.")
+        for i, c in enumerate(contacts):
+            self.__watch(first_id + i, c)
+
+    def deleteContact(self, stdn: str) -> Contact:
+        """Finds a contact based on their student number.
+        Returns the deleted contact. Otherwise, returns -1 if not found.
+
+        Args:
+            stdn (str): Student number of contact to be deleted.
+
+        Returns:
+            Contact: Deleted contact, if found.
+        """
+        c = self.getContact(stdn) if self.hasStudentNumber(stdn) else None
+        if c is None:
+            return -1
+
+        with self.transaction():
+            self.conn.execute("DELETE FROM contacts WHERE id = ?", (self.row_ids[c],))
+            self.size -= 1
+        self.__unwatch(c)
+        return c
+
+    def deleteContacts(self, stdns) -> list:
+        """Deletes the contacts with the given student numbers in one transaction.
+
+        Args:
+            stdns (iterable): Student numbers of contacts to be deleted.
+
+        Returns:
+            list: Deleted contact for each student number, in input order,
+                or None where it was not found. A student number repeated
+                in the batch is only found the first time.
+        """
+        stdns = list(stdns)
+        found = self.getContacts(stdns)
+        deleted = []
+        seen = set()
+        for stdn, c in zip(stdns, found):
+            deleted.append(c if c is not None and stdn not in seen else None)
+            seen.add(stdn)
+
+        gone = [c for c in deleted if c is not None]
+        with self.transaction():
+            self.conn.executemany("DELETE FROM contacts WHERE id = ?", [(self.row_ids[c],) for c in gone])
+            self.size -= len(gone)
+        for c in gone:
+            self.__unwatch(c)
+        return deleted
+
+    def onContactChanged(self, c: Contact, field: str, old_value) -> None:
+        """Writes an edit made through a contact's setters to the columns
+        of that field in the contact's row, leaving the other columns as
+        they are. Raises ValueError if a new student number is already taken.
+
+        Args:
+            c (Contact): Contact that was edited.
+            field (str): Name of the changed attribute.
+            old_value: Value of the attribute before the change.
+        """
+        row_id = self.row_ids.get(c)
+        if row_id is None:
+            return
+        columns = FIELD_COLUMNS[field]
+        value = getattr(c, field)
+        values = (value, value.casefold()) if len(columns) == 2 else (value,)
+        try:
+            with self.transaction():
+                self.conn.execute("UPDATE contacts SET {} WHERE id = ?".format(
+                    ", ".join(column + " = ?" for column in columns)), values + (row_id,))
+        except sqlite3.IntegrityError:
+            raise ValueError("Student number {} is already in the phonebook.".format(c.getStudentNumber()))
+
+    def __one(self, query: str, params: tuple = ()) -> Contact:
+        """Runs a query and creates a contact from its first row, or None."""
+        row = self.conn.execute(query, params).fetchone()
+        return None if row is None else self.__contact(row)
+
+    def __many(self, query: str, params = ()):
+        """Runs a query and yields a contact for each row, fetched in batches."""
+        cursor = self.conn.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                return
+            for row in rows:
+                yield self.__contact(row)
+
+    def __contact(self, row: tuple) -> Contact:
+        """Gets the live contact of a row, or creates one watched for edits."""
+        c = self.contacts.get(row[0])
+        if c is None:
+            c = Contact(*row[1:])
+            self.__watch(row[0], c)
+        return c
+
+    def __watch(self, row_id: int, c: Contact) -> None:
+        """Maps a contact to its row and writes its edits back to it."""
+        self.contacts[row_id] = c
+        self.row_ids[c] = row_id
+        c.addObserver(self)
+
+    def __unwatch(self, c: Contact) -> None:
+        """Unmaps a contact whose row was deleted, so its edits are no longer written."""
+        del self.contacts[self.row_ids.pop(c)]
+        c.removeObserver(self)
@@ -0,0 +1,471 @@
+# Contact list sharded by country code across worker processes
+import heapq
+import itertools
+import multiprocessing
+from Contact import Contact
+from ContactList import ContactList
+from ContactListing import ContactListing
+from SkipContactList import SkipContactList
+
+
+class _ShardList(SkipContactList):
+    """SkipContactList kept by a worker. Its node keys are the contacts'
+    sort keys, so keys from different shards merge into the order a
+    single ContactList would have.
+    """
+
+    def entries(self, contacts) -> list:
+        """Pairs contacts of this shard with their node keys."""
+        return [(self.index[c.getStudentNumber()].key, c) for c in contacts]
+
+    def surnameEntries(self, pattern: str, exact: bool = False, after_key = None) -> list:
+        """Runs searchSurname from after a sort key, or getContactsBySurname
+        if exact, pairing each contact with its surname index key.
+        """
+        found = self.getContactsBySurname(pattern) if exact else list(self.iterSurname(pattern, after_key))
+        return [((c.getLName().casefold(), key), c) for key, c in self.entries(found)]
+
+    def lastEntry(self) -> tuple:
+        """Gets the last contact of this shard with its node key, or None."""
+        c = self.getLast()
+        return None if c is None else self.entries([c])[0]
+
+
+def _serve(conn) -> None:
+    """Worker process loop. Answers (name, args) requests from the router
+    with ("ok", result) or ("error", exception) until sent None.
+
+    Besides the methods of _ShardList, a worker keeps open scans:
+    "openScan" starts one over the whole shard or some country codes in
+    one of ContactList.ORDERS, from after a key, "nextScan" returns its next chunk of
+    (order key, contact) entries and
+    "closeScan" drops it.
+    """
+    pb = _ShardList()
+    scans = {}
+    scan_ids = itertools.count()
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        name, args = message
+        try:
+            if name == "openScan":
+                f, order, after_key = args
+                scan_id = next(scan_ids)
+                scans[scan_id] = (order, pb.iterOrder(order, f, after_key))
+                result = scan_id
+            elif name == "nextScan":
+                scan_id, size = args
+                order, scan = scans[scan_id]
+                result = [(ContactList.orderKey(c, order), c) for c in itertools.islice(scan, size)]
+                if len(result) < size:
+                    del scans[scan_id]
+            elif name == "closeScan":
+                result = scans.pop(args[0], None) is not None
+            else:
+                result = getattr(pb, name)(*args)
+            conn.send(("ok", result))
+        except Exception as e:
+            conn.send(("error", e))
+    conn.close()
+
+
+class ShardedContactList(ContactListing):
+    """Contact list split into shards by country code, each kept by its
+    own worker process, so queries on different shards use different
+    cores. Every shard owns a group of country codes.
+
+    Country-filtered queries only go to the shards owning those codes.
+    Global queries are sent to every shard at once, and their sorted
+    results are merged, so listings come out in the same order as from
+    a single ContactList given the same inserts.
+
+    Contacts returned by this list are copies made in the workers.
+    Editing one through its setters does not change the shard; delete
+    and insert it again instead. A ShardedContactList is not
+    thread-safe, and must be closed to stop its workers.
+    """
+
+    # Entries fetched per round trip while streaming a shard
+    SCAN_CHUNK = 1000
+
+    def __init__(self, shards: int = 4, groups: list = None):
+        """
+        Args:
+            shards (int, optional): Number of worker processes, when groups
+                is not given. Defaults to 4.
+            groups (list, optional): Lists of country codes, one per shard.
+                Defaults to Contact.COUNTRY_CODES dealt round robin.
+        """
+        if groups is None:
+            codes = sorted(Contact.COUNTRY_CODES)
+            groups = [codes[i::shards] for i in range(min(shards, len(codes)))]
+        self.groups = [list(group) for group in groups]
+        self.owner = {cc: i for i, group in enumerate(self.groups) for cc in group}
+        self.size = 0
+        # Scans abandoned by their iterators, closed before the next request
+        self.stale_scans = []
+
+        self.conns = []
+        self.workers = []
+        for _ in self.groups:
+            conn, worker_conn = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=_serve, args=(worker_conn,), daemon=True)
+            worker.start()
+            worker_conn.close()
+            self.conns.append(conn)
+            self.workers.append(worker)
+
+    @classmethod
+    def fromContacts(cls, contacts, *args, **kwargs) -> 'ShardedContactList':
+        """Creates a contact list holding the given contacts.
+
+        Args:
+            contacts (iterable): Contacts to be stored.
+            *args, **kwargs: Passed to the contact list constructor.
+
+        Returns:
+            ShardedContactList: New contact list.
+        """
+        pb = cls(*args, **kwargs)
+        pb.insertMany(contacts)
+        return pb
+
+    def close(self) -> None:
+        """Stops the worker processes."""
+        for conn, worker in zip(self.conns, self.workers):
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+            worker.join()
+            conn.close()
+        self.conns = []
+        self.workers = []
+
+    def __enter__(self) -> 'ShardedContactList':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __call(self, shards, name: str, *args) -> list:
+        """Sends one request to each of the given shards, so they run it
+        in parallel, and gathers their results.
+
+        Args:
+            shards (iterable): Indices of the shards to ask.
+            name (str): Worker method to run.
+            *args: Arguments of the method.
+
+        Returns:
+            list: Result of each shard, in the order asked.
+        """
+        while self.stale_scans:
+            shard, scan_id = self.stale_scans.pop()
+            self.conns[shard].send(("closeScan", (scan_id,)))
+            self.conns[shard].recv()
+
+        shards = list(shards)
+        for shard in shards:
+            self.conns[shard].send((name, args))
+        results = [self.conns[shard].recv() for shard in shards]
+        for status, result in results:
+            if status == "error":
+                raise result
+        return [result for _, result in results]
+
+    def __shardsFor(self, f) -> list:
+        """Gets the shards owning any of the given country codes, or every shard if f is None."""
+        if f is None:
+            return list(range(len(self.conns)))
+        return sorted({self.owner[cc] for cc in f if cc in self.owner})
+
+    def __scan(self, shard: int, f, order: str = "lname", after_key = None):
+        """Streams the (order key, contact) entries of one shard in chunks."""
+        scan_id, = self.__call([shard], "openScan",
+                               None if f is None else [cc for cc in f if self.owner.get(cc) == shard],
+                               order, after_key)
+        try:
+            while True:
+                chunk, = self.__call([shard], "nextScan", scan_id, ShardedContactList.SCAN_CHUNK)
+                yield from chunk
+                if len(chunk) < ShardedContactList.SCAN_CHUNK:
+                    scan_id = None
+                    return
+        finally:
+            # This may run while another request waits on the shard, so
+            # the close is only queued here
+            if scan_id is not None and self.conns:
+                self.stale_scans.append((shard, scan_id))
+
+    def getSize(self) -> int:
+        """
+            Get the size of this contact list.
+        """
+        return self.size
+
+    def __len__(self) -> int:
+        """Gets the size of this contact list."""
+        return self.size
+
+    def isEmpty(self) -> bool:
+        """
+            Checks if contact list has no contacts.
+        """
+        return self.size == 0
+
+    def first(self) -> Contact:
+        """
+            Get the first contact in this contact list.
+            Returns none if list is empty.
+        """
+        return next(iter(self), None)
+
+    def getLast(self) -> Contact:
+        """
+            Get the last contact in this contact list.
+            Returns none if list is empty.
+        """
+        entries = [entry for entry in self.__call(range(len(self.conns)), "lastEntry") if entry is not None]
+        return max(entries, key=lambda entry: entry[0])[1] if entries else None
+
+    def getContact(self, identifier: str) -> Contact:
+        """Gets the contact based on given student number, asking every
+        shard at once. Will return None if contact is not found. As in
+        ContactList, an identifier of only digits that is not a student
+        number is tried as a country code.
+
+        Args:
+            identifier (str): Student number to base search from.
+
+        Returns:
+            Contact: Contact information.
+        """
+        c = self.getContacts([identifier])[0]
+        if c is None and str(identifier).isdigit():
+            c = next(self.iterByCountry([int(identifier)]), None)
+        return c
+
+    def getContacts(self, stdns) -> list:
+        """Gets the contacts with the given student numbers, asking every
+        shard for the whole batch at once.
+
+        Args:
+            stdns (iterable): Student numbers to look up.
+
+        Returns:
+            list: Contact for each student number, in input order, or
+                None where it is not in this list.
+        """
+        stdns = list(stdns)
+        found = [None] * len(stdns)
+        for result in self.__call(range(len(self.conns)), "getContacts", stdns):
+            for i, c in enumerate(result):
+                if c is not None:
+                    found[i] = c
+        return found
+
+    def hasStudentNumber(self, stdn: str) -> bool:
+        """Checks if a contact with the given student number is in this list.
+
+        Args:
+            stdn (str): Student number to look for.
+
+        Returns:
+            bool: True if the student number is in this list.
+        """
+        return any(self.__call(range(len(self.conns)), "hasStudentNumber", stdn))
+
+    def getContactsBySurname(self, surname: str) -> list:
+        """Gets every contact with the given surname, ignoring case,
+        in list order.
+
+        Args:
+            surname (str): Surname to search for.
+
+        Returns:
+            list: Contacts with that surname. Empty if none are found.
+        """
+        results = self.__call(range(len(self.conns)), "surnameEntries", surname, True)
+        return [c for _, c in heapq.merge(*results, key=lambda entry: entry[0])]
+
+    def getContactBySurname(self, surname: str) -> Contact:
+        """Gets the contact based on surname. Will return None if contact is not found.
+        """
+        return next((c for c in self.getContactsBySurname(surname) if c.getLName() == surname), None)
+
+    def searchSurname(self, pattern: str) -> list:
+        """Searches contacts by surname, ignoring case, as in
+        ContactList.searchSurname, merging the results of every shard.
+
+        Args:
+            pattern (str): Surname or surname prefix followed by "*".
+
+        Returns:
+            list: Matching contacts, ordered by surname and then list order.
+        """
+        return list(self.iterSurname(pattern))
+
+    def iterSurname(self, pattern: str, after_key = None):
+        """Iterates over the contacts found by searchSurname, starting
+        after a sort key. Each shard sends every match after the key at
+        once, so a page of a large result still costs the whole rest.
+
+        Args:
+            pattern (str): Surname or surname prefix followed by "*".
+            after_key (tuple, optional): Sort key to start after. Defaults to None.
+
+        Yields:
+            Contact: Next matching contact.
+        """
+        results = self.__call(range(len(self.conns)), "surnameEntries", pattern, False, after_key)
+        for _, c in heapq.merge(*results, key=lambda entry: entry[0]):
+            yield c
+
+    def getContactsByPhone(self, cc: int, area: int, number: int) -> list:
+        """Gets every contact with the given full phone number, from the
+        shard owning the country code.
+
+        Args:
+            cc (int): Numeric country code.
+            area (int): Area code.
+            number (int): Contact number.
+
+        Returns:
+            list: Contacts with that phone number, in list order.
+        """
+        if cc not in self.owner:
+            return []
+        return self.__call([self.owner[cc]], "getContactsByPhone", cc, area, number)[0]
+
+    def searchPhone(self, cc: int, area: int = None) -> list:
+        """Gets every contact in a country, or in an area of a country,
+        ordered by phone number, from the shard owning the country code.
+
+        Args:
+            cc (int): Numeric country code.
+            area (int, optional): Area code. Defaults to None, for every area.
+
+        Returns:
+            list: Matching contacts, ordered by area code, number and then list order.
+        """
+        if cc not in self.owner:
+            return []
+        return self.__call([self.owner[cc]], "searchPhone", cc, area)[0]
+
+    def __iter__(self):
+        """Iterates over the contacts of this contact list in order,
+        merging the streams of every shard.
+        """
+        return self.iterByCountry(None)
+
+    def iterByCountry(self, f: list):
+        """Iterates, in name order, over the contacts with any of the given
+        country codes, streaming only from the shards that own them.
+
+        Args:
+            f (list): Country codes to list, or None for every contact.
+
+        Yields:
+            Contact: Next contact with one of the country codes.
+        """
+        return self.iterOrder("lname", f)
+
+    def iterOrder(self, order: str = "lname", f: list = None, after_key = None):
+        """Iterates over the contacts in one of ContactList.ORDERS, merging
+        the streams of the shards owning the given country codes. Raises
+        ValueError if the order is unknown.
+
+        Args:
+            order (str, optional): "lname", "fname", "stdn" or "phone".
+                Defaults to "lname".
+            f (list, optional): Country codes to keep. Defaults to None,
+                which keeps every country.
+            after_key (optional): Key, as given by ContactList.orderKey, to
+                start after. Defaults to None, which starts from the first contact.
+
+        Yields:
+            Contact: Next contact in the order.
+        """
+        if order not in ContactList.ORDERS:
+            raise ValueError("Unknown order {!r}, expected one of {}.".format(order, ", ".join(ContactList.ORDERS)))
+
+        scans = [self.__scan(shard, f, order, after_key) for shard in self.__shardsFor(f)]
+        for _, c in heapq.merge(*scans, key=lambda entry: entry[0]):
+            yield c
+
+    def insert(self, c: Contact):
+        """Inserts new contact to the phonebook.
+        Raises ValueError if the student number is already in the phonebook.
+
+        Args:
+            c (Contact): Contact to be inserted.
+        """
+        self.insertMany([c])
+
+    def insertMany(self, contacts) -> None:
+        """Inserts a batch of contacts, sending each shard its part in one
+        request. Raises ValueError, and inserts nothing, if a student
+        number is repeated or is already in the phonebook, or if a country
+        code is owned by no shard.
+
+        Args:
+            contacts (iterable): Contacts to be inserted.
+        """
+        contacts = list(contacts)
+        stdns = [c.getStudentNumber() for c in contacts]
+        if len(set(stdns)) < len(stdns):
+            raise ValueError("A student number is repeated in the batch.")
+        for stdn, c in zip(stdns, self.getContacts(stdns)):
+            if c is not None:
+                raise ValueError("Student number {} is already in the phonebook.".format(stdn))
+        for c in contacts:
+            if c.getNumericCountryCode() not in self.owner:
+                raise ValueError("No shard owns country code {}.".format(c.getNumericCountryCode()))
+
+        parts = {}
+        for c in contacts:
+            parts.setdefault(self.owner[c.getNumericCountryCode()], []).append(c)
+
+        for shard, batch in parts.items():
+            self.conns[shard].send(("insertMany", (batch,)))
+        for shard in parts:
+            status, result = self.conns[shard].recv()
+            if status == "error":
+                raise result
+        self.size += len(contacts)
+
+    def deleteContact(self, stdn: str) -> Contact:
+        """Finds a contact based on their student number.
+        Returns the deleted contact. Otherwise, returns -1 if not found.
+
+        Args:
+            stdn (str): Student number of contact to be deleted.
+
+        Returns:
+            Contact: Deleted contact, if found.
+        """
+        c = self.deleteContacts([stdn])[0]
+        return -1 if c is None else c
+
+    def deleteContacts(self, stdns) -> list:
+        """Deletes the contacts with the given student numbers, sending
+        the whole batch to every shard at once.
+
+        Args:
+            stdns (iterable): Student numbers of contacts to be deleted.
+
+        Returns:
+            list: Deleted contact for each student number, in input order,
+                or None where it was not found.
+        """
+        stdns = list(stdns)
+        deleted = [None] * len(stdns)
+        for result in self.__call(range(len(self.conns)), "deleteContacts", stdns):
+            for i, c in enumerate(result):
+                if c is not None:
+                    deleted[i] = c
+                    self.size -= 1
+        return deleted
@@ -0,0 +1,296 @@
+# Skip list implementation of contacts
+import random
+from Contact import Contact
+from ContactList import ContactList
+
+
+class SkipContactList(ContactList):
+    """Contact List class that keeps a skip list over the contact nodes,
+    ordered by Contact.getSortKey. Inserts and deletes take O(log n)
+    expected time instead of walking the list from the head.
+
+    Every link also stores its span, the number of contacts it moves
+    forward, so getContactAtIndex and getIndex take O(log n) as well.
+
+    Level 0 of the skip list is the same doubly linked list that
+    ContactList uses, so ContactList remains the reference implementation
+    and every read-only method is shared between the two.
+    """
+
+    MAX_LEVEL = 32
+    P = 0.25
+    # getContactAtIndex walks from the last index read when it is this close
+    CURSOR_WALK = 8
+
+    class SkipNode(ContactList.ContactNode):
+
+        __slots__ = ("links", "spans")
+
+        def __init__(self, item: Contact, ptr, height: int = 1, key: tuple = None, phone: tuple = None):
+            super().__init__(item, ptr, key=key, phone=phone)
+            # Most nodes have height 1 and share the empty tuple
+            self.links = () if height == 1 else [None] * (height - 1)
+            self.spans = () if height == 1 else [0] * (height - 1)
+
+        def getHeight(self) -> int:
+            """Gets the number of levels this node is linked in.
+
+            Returns:
+                int: Height of this node, at least 1.
+            """
+            return len(self.links) + 1
+
+        def nextAt(self, level: int) -> 'SkipContactList.SkipNode':
+            """Gets the next node at the given level.
+
+            Args:
+                level (int): Skip list level. Level 0 is the linked list.
+
+            Returns:
+                SkipContactList.SkipNode: Next node at that level.
+            """
+            return self.ptr if level == 0 else self.links[level - 1]
+
+        def setNextAt(self, level: int, node: 'SkipContactList.SkipNode'):
+            """Sets the next node at the given level.
+
+            Args:
+                level (int): Skip list level. Level 0 is the linked list.
+                node (SkipContactList.SkipNode): New node pointer.
+            """
+            if level == 0:
+                self.ptr = node
+            else:
+                self.links[level - 1] = node
+
+        def spanAt(self, level: int) -> int:
+            """Gets how many positions the link at the given level moves
+            forward. Only meaningful while that link is not None.
+
+            Args:
+                level (int): Skip list level. Level 0 is the linked list.
+
+            Returns:
+                int: Span of the link.
+            """
+            return 1 if level == 0 else self.spans[level - 1]
+
+        def setSpanAt(self, level: int, span: int):
+            """Sets the span of the link at the given level, above level 0.
+
+            Args:
+                level (int): Skip list level, at least 1.
+                span (int): New span of the link.
+            """
+            self.spans[level - 1] = span
+
+    def __init__(self, seed: int = None, dump_cache_size: int = None):
+        """
+        Args:
+            seed (int, optional): Seed for the node height generator, for
+                reproducible layouts. Defaults to None.
+            dump_cache_size (int, optional): As in ContactList. Defaults
+                to ContactList.DUMP_CACHE_SIZE.
+        """
+        super().__init__(dump_cache_size)
+        self.sentinel = SkipContactList.SkipNode(None, None, SkipContactList.MAX_LEVEL)
+        self.level = 1
+        self.rng = random.Random(seed)
+
+    def getLast(self) -> Contact:
+        """
+            Get the last contact in this contact list.
+            Returns none if list is empty.
+        """
+        if self.isEmpty():
+            return None
+
+        node = self.sentinel
+        for level in range(self.level - 1, -1, -1):
+            while node.nextAt(level) is not None:
+                node = node.nextAt(level)
+        return node.getVal()
+
+    def getIndex(self, stdn: str) -> int:
+        """Gets the index of the contact with the given student number,
+        by summing link spans down the skip list. Returns -1 if not found.
+
+        Args:
+            stdn (str): Student number of the contact.
+
+        Returns:
+            int: Index of the contact in this list.
+        """
+        node = self.index.get(stdn)
+        if node is None:
+            return -1
+        # The predecessor of the node sits at position index, counting the sentinel as 0
+        return self.__findPredecessors(node.key)[1][0]
+
+    def _nodeAtIndex(self, index: int) -> 'SkipContactList.SkipNode':
+        """Finds the node at a valid index by following link spans down
+        the skip list, or by walking from the node of the last
+        getContactAtIndex when it is a few positions away.
+
+        Args:
+            index (int): Index of the node.
+
+        Returns:
+            SkipContactList.SkipNode: Node at index.
+        """
+        if self.cursor is not None and abs(index - self.cursor[0]) <= SkipContactList.CURSOR_WALK:
+            return super()._nodeAtIndex(index)
+
+        # Positions count from 1, with the sentinel at 0
+        target = index + 1
+        node = self.sentinel
+        position = 0
+        for level in range(self.level - 1, -1, -1):
+            while node.nextAt(level) is not None and position + node.spanAt(level) <= target:
+                position += node.spanAt(level)
+                node = node.nextAt(level)
+        return node
+
+    def _newNode(self, c: Contact) -> 'SkipContactList.SkipNode':
+        """Creates a skip node of random height for a new contact.
+
+        Args:
+            c (Contact): Contact to be held by the node.
+
+        Returns:
+            SkipContactList.SkipNode: New unlinked node.
+        """
+        height = 1
+        while height < SkipContactList.MAX_LEVEL and self.rng.random() < SkipContactList.P:
+            height += 1
+        return SkipContactList.SkipNode(c, None, height, c.getSortKey(), ContactList.phoneKey(c))
+
+    def _linkNode(self, node: 'SkipContactList.SkipNode') -> None:
+        """Links a new node at its sorted position on every level of its
+        height, and updates the spans of the links passing over it.
+
+        Args:
+            node (SkipContactList.SkipNode): Node to be linked.
+        """
+        update, rank = self.__findPredecessors(node.key)
+        while self.level < node.getHeight():
+            update.append(self.sentinel)
+            rank.append(0)
+            self.level += 1
+
+        self._linkAfter(update[0], node)
+        position = rank[0] + 1
+        for level in range(1, node.getHeight()):
+            prev = update[level]
+            node.setNextAt(level, prev.nextAt(level))
+            node.setSpanAt(level, prev.spanAt(level) - (position - rank[level]) + 1)
+            prev.setNextAt(level, node)
+            prev.setSpanAt(level, position - rank[level])
+        for level in range(node.getHeight(), self.level):
+            update[level].setSpanAt(level, update[level].spanAt(level) + 1)
+
+    def _unlinkNode(self, node: 'SkipContactList.SkipNode') -> None:
+        """Unlinks a node from every level it is linked in, and updates
+        the spans of the links that passed over it.
+
+        Args:
+            node (SkipContactList.SkipNode): Node to be unlinked.
+        """
+        update = self.__findPredecessors(node.key)[0]
+        for level in range(1, self.level):
+            prev = update[level]
+            if level < node.getHeight():
+                prev.setSpanAt(level, prev.spanAt(level) + node.spanAt(level) - 1)
+                prev.setNextAt(level, node.nextAt(level))
+                node.setNextAt(level, None)
+            else:
+                prev.setSpanAt(level, prev.spanAt(level) - 1)
+        self._unlink(node)
+
+        while self.level > 1 and self.sentinel.nextAt(self.level - 1) is None:
+            self.level -= 1
+
+    def _linkBatch(self, nodes: list) -> None:
+        """Links a batch of new nodes. A batch that is small next to the
+        list is linked one node at a time in O(m log n). Otherwise it is
+        merged into level 0 and the upper levels are rebuilt in one pass,
+        in O(m log m + n).
+
+        Args:
+            nodes (list): New nodes, in the order they were given.
+        """
+        if len(nodes) * self.size.bit_length() < self.size:
+            for node in nodes:
+                self._linkNode(node)
+        else:
+            super()._linkBatch(nodes)
+            self.__rebuildLevels()
+
+    def _unlinkBatch(self, nodes: list) -> None:
+        """Unlinks a batch of nodes. A batch that is small next to the
+        list is unlinked one node at a time in O(m log n). Otherwise the
+        nodes are unlinked from level 0 and the upper levels are rebuilt
+        in one pass, in O(m + n).
+
+        Args:
+            nodes (list): Nodes to be unlinked.
+        """
+        if len(nodes) * self.size.bit_length() < self.size:
+            for node in nodes:
+                self._unlinkNode(node)
+        else:
+            for node in nodes:
+                self._unlink(node)
+            self.__rebuildLevels()
+            for node in nodes:
+                for level in range(1, node.getHeight()):
+                    node.setNextAt(level, None)
+
+    def __rebuildLevels(self) -> None:
+        """Rebuilds the skip list levels and their spans over the linked list in one pass."""
+        last = [self.sentinel] * SkipContactList.MAX_LEVEL
+        last_position = [0] * SkipContactList.MAX_LEVEL
+        self.level = 1
+        position = 0
+        node = self.sentinel.next()
+        while node is not None:
+            position += 1
+            # Most nodes have height 1, so skip the level loop for them
+            if node.links:
+                height = node.getHeight()
+                for level in range(1, height):
+                    last[level].setNextAt(level, node)
+                    last[level].setSpanAt(level, position - last_position[level])
+                    last[level] = node
+                    last_position[level] = position
+                if height > self.level:
+                    self.level = height
+            node = node.next()
+
+        for level in range(1, SkipContactList.MAX_LEVEL):
+            last[level].setNextAt(level, None)
+
+    def __findPredecessors(self, key: tuple) -> tuple:
+        """Finds, on every level, the last node whose key is smaller than
+        key, and its position in the list.
+
+        Args:
+            key (tuple): Key to search for.
+
+        Returns:
+            tuple: List of predecessor nodes and list of their positions,
+                one per level, lowest level first. The sentinel is at 0.
+        """
+        update = [self.sentinel] * self.level
+        rank = [0] * self.level
+        node = self.sentinel
+        position = 0
+        for level in range(self.level - 1, -1, -1):
+            nxt = node.nextAt(level)
+            while nxt is not None and nxt.key < key:
+                position += node.spanAt(level)
+                node = nxt
+                nxt = node.nextAt(level)
+            update[level] = node
+            rank[level] = position
+        return update, rank
@@ -0,0 +1,137 @@
+# Sorted array index used for the secondary indexes of ContactList
+import bisect
+
+
+class SortedIndex:
+    """A sorted array of (key, value) entries, searched with bisect.
+    Entries with equal keys are kept newest first.
+
+    Added entries are held back until the index is next read, and are
+    then merged in together, so adding m entries to an index of n costs
+    O(m log m + n) instead of m list inserts.
+    """
+
+    # Fewer pending entries than this are inserted one at a time
+    MERGE_THRESHOLD = 16
+
+    def __init__(self):
+        self.keys = []
+        self.values = []
+        self.pending = []
+
+    def __len__(self) -> int:
+        """Gets the number of entries in this index."""
+        return len(self.keys) + len(self.pending)
+
+    def __iter__(self):
+        """Iterates over the values of this index in key order."""
+        self.flush()
+        return iter(self.values)
+
+    def items(self):
+        """Iterates over the (key, value) entries of this index in key order."""
+        self.flush()
+        return zip(self.keys, self.values)
+
+    def first(self):
+        """Gets the value with the smallest key. Returns None if empty."""
+        self.flush()
+        return self.values[0] if self.values else None
+
+    def iterFrom(self, key):
+        """Iterates over the (key, value) entries in key order, starting
+        from the first entry whose key is not smaller than key.
+
+        Args:
+            key: Key to start from.
+        """
+        self.flush()
+        for i in range(bisect.bisect_left(self.keys, key), len(self.keys)):
+            yield self.keys[i], self.values[i]
+
+    def iterAfter(self, key):
+        """Iterates over the (key, value) entries in key order, starting
+        from the first entry whose key is greater than key.
+
+        Args:
+            key: Key to start after, or None to start from the first entry.
+        """
+        self.flush()
+        start = 0 if key is None else bisect.bisect_right(self.keys, key)
+        for i in range(start, len(self.keys)):
+            yield self.keys[i], self.values[i]
+
+    def add(self, key, value) -> None:
+        """Adds an entry before any entries with an equal key.
+
+        Args:
+            key: Key to order the entry by.
+            value: Value of the entry.
+        """
+        self.pending.append((key, value))
+
+    def remove(self, key, value) -> bool:
+        """Removes the entry holding this exact value under key.
+
+        Args:
+            key: Key the entry was added with.
+            value: Value of the entry.
+
+        Returns:
+            bool: True if the entry was found and removed.
+        """
+        self.flush()
+        i = bisect.bisect_left(self.keys, key)
+        while i < len(self.keys) and self.keys[i] == key:
+            if self.values[i] is value:
+                del self.keys[i]
+                del self.values[i]
+                return True
+            i += 1
+        return False
+
+    def removeMany(self, removed: set) -> None:
+        """Removes every entry whose value is in a set of ids, in one
+        pass over the index.
+
+        Args:
+            removed (set): id() of each value to be removed.
+        """
+        self.flush()
+        kept = [i for i, value in enumerate(self.values) if id(value) not in removed]
+        if len(kept) < len(self.values):
+            self.keys = [self.keys[i] for i in kept]
+            self.values = [self.values[i] for i in kept]
+
+    def flush(self) -> None:
+        """Merges the pending entries into the sorted arrays. Reads do
+        this on their own; call it to do it up front, so that later reads
+        do not modify the index.
+        """
+        if not self.pending:
+            return
+
+        if len(self.pending) < SortedIndex.MERGE_THRESHOLD:
+            for key, value in self.pending:
+                i = bisect.bisect_left(self.keys, key)
+                self.keys.insert(i, key)
+                self.values.insert(i, value)
+        else:
+            # Newest first among equal keys, as if added one at a time
+            batch = self.pending[::-1]
+            batch.sort(key=lambda entry: entry[0])
+            keys = []
+            values = []
+            i = 0
+            for key, value in batch:
+                j = bisect.bisect_left(self.keys, key, i)
+                keys += self.keys[i:j]
+                values += self.values[i:j]
+                keys.append(key)
+                values.append(value)
+                i = j
+            keys += self.keys[i:]
+            values += self.values[i:]
+            self.keys = keys
+            self.values = values
+        self.pending = []
@@ -0,0 +1,66 @@
+from Contact import Contact
+from ContactList import ContactList
+from SkipContactList import SkipContactList
+from SQLiteContactList import SQLiteContactList
+from PhonebookFile import MappedContactList, writePhonebook
+from Fixtures import contactFields, lists
+import os
+import random
+import tempfile
+import unittest
+
+class TestBatch(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(TestBatch, self).__init__(*args, **kwargs)
+        self.fields = contactFields("2006-{:04d}", 300, seed=9, names=40, gender="F", codes=[63, 65, 84])
+
+    def lists(self):
+        return lists(self.fields, (ContactList, SkipContactList, SQLiteContactList))
+
+    def test_1(self):
+        """Batch lookups keep input order, give None for misses, and never
+        match country codes.
+        """
+        stdns = ["2006-0299", "2018-1799", "63", "2006-0000", "2006-0299"]
+        for pb in self.lists():
+            found = pb.getContacts(stdns)
+            self.assertEqual(["2006-0299", None, None, "2006-0000", "2006-0299"],
+                             [None if c is None else c.getStudentNumber() for c in found])
+            self.assertEqual(None, pb.getContact("2018-1799"))
+            self.assertEqual(63, pb.getContact("63").getNumericCountryCode())
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "batch.pbk")
+            writePhonebook(path, self.lists()[1])
+            with MappedContactList(path) as mapped:
+                found = mapped.getContacts(stdns)
+                self.assertEqual(["2006-0299", None, None, "2006-0000", "2006-0299"],
+                                 [None if c is None else c.getStudentNumber() for c in found])
+
+    def test_2(self):
+        """Small and large batch deletes leave the same list as deleting
+        one contact at a time.
+        """
+        for count in (5, 200):
+            stdns = ["2006-{:04d}".format(i) for i in random.Random(count).sample(range(300), count)]
+            reference = ContactList.fromContacts(Contact(*fields) for fields in self.fields)
+            for stdn in stdns:
+                reference.deleteContact(stdn)
+            for pb in self.lists():
+                deleted = pb.deleteContacts(stdns + ["2006-9999", stdns[0]])
+                self.assertEqual(stdns + [None, None],
+                                 [None if c is None else c.getStudentNumber() for c in deleted])
+                self.assertEqual(300 - count, pb.getSize())
+                self.assertEqual(str(reference), str(pb))
+                self.assertEqual(reference.__str__([65, 84]), pb.__str__([65, 84]))
+                self.assertEqual([c.getFullName() for c in reference.searchSurname("Ri*")],
+                                 [c.getFullName() for c in pb.searchSurname("Ri*")])
+                if isinstance(pb, SkipContactList):
+                    pb.insert(Contact("2007-0001", "New", "Rizal", "Student", "M", 63, 2, 1))
+                    for i, c in enumerate(pb):
+                        self.assertEqual(i, pb.getIndex(c.getStudentNumber()))
+                    self.assertEqual(pb.getLast(), pb.getContactAtIndex(pb.getSize() - 1))
+
+if __name__ == "__main__":
+    unittest.main()
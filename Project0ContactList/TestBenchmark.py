@@ -0,0 +1,34 @@
+from SkipContactList import SkipContactList
+import Benchmark
+import unittest    
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_1(self):
+        """A small run reports every operation.
+        """
+        results = Benchmark.benchmarkSize(SkipContactList, 200, 50, 3)
+        self.assertEqual({"insert", "insertMany", "getContact", "getContactAtIndex",
+                          "__str__", "__str__(f)", "__str__(f) unchanged", "deleteContact"}, set(results["operations"]))
+        for stats in results["operations"].values():
+            self.assertGreater(stats["ops_per_sec"], 0)
+            self.assertLessEqual(stats["p50_us"], stats["p99_us"])
+            self.assertAlmostEqual(stats["median_ops_per_sec"] / results["reference_ops_per_sec"], stats["relative"])
+        self.assertGreater(results["peak_memory_bytes"], 0)
+
+    def test_2(self):
+        """Regressions beyond the tolerance are reported, relative to the
+        reference speed, whatever the machine's absolute speed.
+        """
+        def run(ops, reference=1000):
+            stats = {"ops_per_sec": ops, "relative": ops / reference}
+            return {"1000": {"operations": {"insert": stats}, "peak_memory_bytes": 1,
+                             "reference_ops_per_sec": reference}}
+        self.assertEqual([], Benchmark.compare(run(70), run(100), 0.4))
+        self.assertEqual(1, len(Benchmark.compare(run(50), run(100), 0.4)))
+        self.assertEqual([], Benchmark.compare(run(50), {}, 0.4))
+        # Half the ops/sec on a machine half as fast is no regression
+        self.assertEqual([], Benchmark.compare(run(50, reference=500), run(100), 0.4))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+from Contact import Contact
+from ContactList import ContactList
+from SkipContactList import SkipContactList
+from Fixtures import contactFields
+import unittest    
+
+class TestPhonebookBulkLoad(unittest.TestCase):
+    
+    def __init__(self, *args, **kwargs):
+        super(TestPhonebookBulkLoad, self).__init__(*args, **kwargs)
+        self.fields = contactFields("2000-{:04d}", 200, seed=3, names=1000, codes=[84], area=45)
+
+    def test_1(self):
+        """Bulk loading gives the same list as one insert per contact.
+        """
+        for cls in (ContactList, SkipContactList):
+            reference = ContactList()
+            for fields in self.fields:
+                reference.insert(Contact(*fields))
+            pb = cls.fromContacts(Contact(*fields) for fields in self.fields)
+            self.assertEqual(200, pb.getSize())
+            self.assertEqual(str(reference), str(pb))
+            self.assertEqual(reference.getLast().getFullName(), pb.getLast().getFullName())
+
+    def test_2(self):
+        """Merging a batch into a list that already has contacts.
+        """
+        for cls in (ContactList, SkipContactList):
+            reference = ContactList()
+            pb = cls()
+            for fields in self.fields:
+                reference.insert(Contact(*fields))
+            for fields in self.fields[:50]:
+                pb.insert(Contact(*fields))
+            pb.insertMany(Contact(*fields) for fields in self.fields[50:])
+            self.assertEqual(str(reference), str(pb))
+            pb.deleteContact("2000-0120")
+            reference.deleteContact("2000-0120")
+            self.assertEqual(str(reference), str(pb))
+
+    def test_3(self):
+        """Duplicate student numbers reject the whole batch.
+        """
+        pb = SkipContactList()
+        pb.insert(Contact(*self.fields[0]))
+        self.assertRaises(ValueError, pb.insertMany, [Contact(*self.fields[1]), Contact(*self.fields[0])])
+        self.assertEqual(1, pb.getSize())
+
+    def test_4(self):
+        """A small batch merged into a large list.
+        """
+        reference = ContactList()
+        pb = SkipContactList()
+        for fields in self.fields:
+            reference.insert(Contact(*fields))
+        for fields in self.fields[3:]:
+            pb.insert(Contact(*fields))
+        pb.insertMany(Contact(*fields) for fields in self.fields[:3])
+        self.assertEqual(str(reference), str(pb))
+        self.assertEqual(reference.getLast().getFullName(), pb.getLast().getFullName())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+from Contact import Contact
+from ConcurrentContactList import ConcurrentContactList, ReadWriteLock
+from Fixtures import contactFields
+import random
+import sys
+import threading
+import unittest
+
+class TestConcurrent(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(TestConcurrent, self).__init__(*args, **kwargs)
+        self.pb = ConcurrentContactList.fromContacts(self.contacts(0, 500))
+
+    @staticmethod
+    def contacts(start: int, stop: int) -> list:
+        return [Contact(*fields) for fields in contactFields("2004-{:05d}", stop, seed=start, names=100,
+                                                             start=start, codes=[63, 65, 84])]
+
+    def run_threads(self, targets: list):
+        errors = []
+
+        def run(target):
+            try:
+                target()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run, args=(target,)) for target in targets]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], errors)
+
+    def test_1(self):
+        """Readers always see a sorted, fully indexed list while writers
+        insert, delete and rename contacts.
+        """
+        stop = threading.Event()
+
+        def writer(start):
+            for i in range(start, start + 300, 10):
+                self.pb.insertMany(self.contacts(i, i + 10))
+                for j in range(i, i + 10, 2):
+                    self.assertNotEqual(-1, self.pb.deleteContact("2004-{:05d}".format(j)))
+
+        def editor():
+            rng = random.Random(1)
+            for _ in range(300):
+                c = self.pb.getContact("2004-{:05d}".format(rng.randrange(500)))
+                c.setLName(rng.choice(["Aquino", "Bonifacio", "Luna"]))
+
+        def reader():
+            rng = random.Random(2)
+            while not stop.is_set():
+                # Names may change under a reader, so only the student numbers are checked
+                stdns = [c.getStudentNumber() for c in self.pb]
+                self.assertEqual(len(stdns), len(set(stdns)))
+                codes = [c.getNumericCountryCode() for c in self.pb.iterByCountry([65])]
+                self.assertEqual([65] * len(codes), codes)
+                stdn = "2004-{:05d}".format(rng.randrange(500))
+                self.assertEqual(stdn, self.pb.getContact(stdn).getStudentNumber())
+                self.pb.searchSurname("Ri*")
+
+        writers = [lambda start=start: writer(start) for start in range(1000, 2500, 300)]
+
+        def stopping(target):
+            def run():
+                try:
+                    target()
+                finally:
+                    stop.set()
+            return run
+
+        readers = [reader for _ in range(8)]
+        self.run_threads(readers + [stopping(lambda: self.run_threads(writers + [editor]))])
+
+        self.assertEqual(500 + 5 * 150, self.pb.getSize())
+        keys = [c.getSortKey() for c in self.pb]
+        self.assertEqual(sorted(keys), keys)
+        self.assertEqual(self.pb.getSize(), sum(len(list(self.pb.iterByCountry([cc]))) for cc in (63, 65, 84)))
+
+    def test_3(self):
+        """Edits and deletes of the same contacts leave every index in step,
+        whichever takes the write lock first.
+        """
+        stdns = ["2004-{:05d}".format(i) for i in range(0, 500, 5)]
+
+        def editor(seed):
+            rng = random.Random(seed)
+            for _ in range(2000):
+                c = self.pb.getContact(rng.choice(stdns))
+                if c is None:
+                    continue
+                c.setAreaCode(rng.randrange(10))
+                c.setLName(rng.choice(["Aquino", "Bonifacio", "Luna"]))
+                c.setCountryCode(rng.choice([63, 65, 84]))
+
+        def deleter(seed):
+            rng = random.Random(seed)
+            for _ in range(1000):
+                stdn = rng.choice(stdns)
+                if self.pb.deleteContact(stdn) != -1:
+                    self.pb.insert(Contact(stdn, "New", "Rizal", "Student", "F", 63, 1, 1))
+
+        # Switch threads often, so setters are often cut off before taking the lock
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            self.run_threads([lambda: editor(3), lambda: editor(4), lambda: deleter(5)])
+        finally:
+            sys.setswitchinterval(interval)
+
+        contacts = list(self.pb)
+        self.assertEqual(500, self.pb.getSize())
+        self.assertEqual(500, len(contacts))
+        for c in contacts:
+            self.assertIs(c, self.pb.getContact(c.getStudentNumber()))
+        members = set(map(id, contacts))
+        by_phone = [c for cc in (63, 65, 84) for c in self.pb.searchPhone(cc)]
+        self.assertEqual(members, set(map(id, by_phone)))
+        self.assertEqual(500, len(by_phone))
+        by_country = [c for cc in (63, 65, 84) for c in self.pb.iterByCountry([cc])]
+        self.assertEqual(members, set(map(id, by_country)))
+        by_surname = [c for name in ("Aquino", "Bonifacio", "Luna", "Rizal", "Clara", "Xie", "Jacinto",
+                                     "Dela Cruz", "Joestar") for c in self.pb.searchSurname(name)]
+        self.assertEqual(members, set(map(id, by_surname)))
+        self.assertEqual(500, len(by_surname))
+
+    def test_2(self):
+        """A writer waits for readers, and readers wait for a writer.
+        """
+        lock = ReadWriteLock()
+        log = []
+        release = threading.Event()
+
+        def write():
+            with lock.writing():
+                log.append("write")
+                release.wait()
+
+        def read():
+            with lock.reading():
+                log.append("read")
+
+        with lock.reading():
+            writer = threading.Thread(target=write)
+            writer.start()
+            writer.join(0.05)
+            self.assertEqual([], log)
+        while not log:
+            writer.join(0.01)
+        reader = threading.Thread(target=read)
+        reader.start()
+        reader.join(0.05)
+        self.assertEqual(["write"], log)
+        release.set()
+        reader.join()
+        writer.join()
+        self.assertEqual(["write", "read"], log)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+from Contact import Contact
+from SkipContactList import SkipContactList
+import ContactIO
+import os
+import tempfile
+import unittest    
+
+class TestContactIO(unittest.TestCase):
+    
+    def __init__(self, *args, **kwargs):
+        super(TestContactIO, self).__init__(*args, **kwargs)
+        self.pb = SkipContactList()
+        for i in range(25):
+            self.pb.insert(Contact("2000-{:04d}".format(i), "Name{}".format(i), "Surname{}".format(i % 4),
+                                   "Student", "F", 63 if i % 2 else 84, 2, 100 + i))
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_1(self):
+        """CSV and JSONL round trips, in small chunks.
+        """
+        for name, export, load in (("c.csv", ContactIO.exportCsv, ContactIO.importCsv),
+                                   ("c.jsonl", ContactIO.exportJsonl, ContactIO.importJsonl)):
+            path = os.path.join(self.dir.name, name)
+            self.assertEqual(25, export(self.pb, path))
+            pb = SkipContactList()
+            report = load(pb, path, chunk_size=4)
+            self.assertEqual((25, 25, 0), (report.rows, report.inserted, report.rejected))
+            self.assertEqual(str(self.pb), str(pb))
+
+    def test_2(self):
+        """Invalid and duplicate rows are rejected.
+        """
+        path = os.path.join(self.dir.name, "c.jsonl")
+        with open(path, "w") as out:
+            out.write('{"student_num": "1", "fname": "A", "lname": "B", "occupation": "C", '
+                      '"gender": "M", "cc": 63, "area": 1, "number": 2}\n')
+            out.write('{"student_num": "2", "fname": "A", "lname": "B", "occupation": "C", '
+                      '"gender": "M", "cc": 1, "area": 1, "number": 2}\n')
+            out.write('{"student_num": "1", "fname": "D", "lname": "E", "occupation": "C", '
+                      '"gender": "M", "cc": 63, "area": 1, "number": 2}\n')
+            out.write('{"student_num": "3"}\n')
+            out.write('not json\n')
+        pb = SkipContactList()
+        report = ContactIO.importJsonl(pb, path)
+        self.assertEqual((5, 1, 4), (report.rows, report.inserted, report.rejected))
+        self.assertEqual("A B", pb.getContact("1").getFullName())
+
+    def test_3(self):
+        """Short CSV rows, nulls and blank fields are rejected, not read as text.
+        """
+        path = os.path.join(self.dir.name, "c.csv")
+        with open(path, "w") as out:
+            out.write(",".join(ContactIO.FIELDS) + "\n")
+            out.write("1,A,B,C,M,63,1,2\n")
+            out.write("2,A,B\n")
+            out.write("3,A, ,C,M,63,1,2\n")
+        pb = SkipContactList()
+        report = ContactIO.importCsv(pb, path)
+        self.assertEqual((3, 1, 2), (report.rows, report.inserted, report.rejected))
+        row = dict(zip(ContactIO.FIELDS, ("4", "A", "B", None, "M", 63, 1, 2)))
+        self.assertRaises(ValueError, ContactIO.parseRow, row)
+
+if __name__ == "__main__":
+    unittest.main()
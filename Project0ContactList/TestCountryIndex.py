@@ -0,0 +1,44 @@
+from Contact import Contact
+from SkipContactList import SkipContactList
+import random
+import unittest    
+
+class TestPhonebookCountryIndex(unittest.TestCase):
+    
+    def __init__(self, *args, **kwargs):
+        super(TestPhonebookCountryIndex, self).__init__(*args, **kwargs)
+        rng = random.Random(5)
+        self.pb = SkipContactList(seed=5)
+        codes = list(Contact.COUNTRY_CODES)
+        for i in range(300):
+            self.pb.insert(Contact("2000-{:04d}".format(i), "Name{:04d}".format(rng.randrange(10000)),
+                                   "Surname{:02d}".format(rng.randrange(50)), "Student", "F",
+                                   rng.choice(codes), 2, i))
+
+    def scan(self, f):
+        return [c for c in self.pb if c.getNumericCountryCode() in f]
+
+    def test_1(self):
+        """Country buckets give the same contacts and order as a full scan.
+        """
+        for f in ([63], [63, 84], [670, 95, 60], list(Contact.COUNTRY_CODES)):
+            self.assertEqual(self.scan(f), list(self.pb.iterByCountry(f)))
+        self.assertEqual([], list(self.pb.iterByCountry([1])))
+        self.assertEqual(list(self.pb), list(self.pb.iterByCountry(list(Contact.COUNTRY_CODES))))
+
+    def test_2(self):
+        """Buckets follow setCountryCode and deleteContact.
+        """
+        c = self.pb.getContact("2000-0042")
+        old_cc = c.getNumericCountryCode()
+        new_cc = 673 if old_cc != 673 else 855
+        c.setCountryCode(new_cc)
+        self.assertIn(c, list(self.pb.iterByCountry([new_cc])))
+        self.assertNotIn(c, list(self.pb.iterByCountry([old_cc])))
+        self.assertEqual(self.scan([new_cc, old_cc]), list(self.pb.iterByCountry([new_cc, old_cc])))
+        self.pb.deleteContact("2000-0042")
+        self.assertNotIn(c, list(self.pb.iterByCountry([new_cc])))
+        self.assertEqual(299, sum(len(bucket) for bucket in self.pb.buckets.values()))
+
+if __name__ == "__main__":
+    unittest.main()
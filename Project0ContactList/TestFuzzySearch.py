@@ -0,0 +1,68 @@
+from Contact import Contact
+from SkipContactList import SkipContactList
+from TrigramIndex import TrigramIndex
+import unittest
+
+class TestFuzzySearch(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(TestFuzzySearch, self).__init__(*args, **kwargs)
+        self.pb = SkipContactList()
+        c1 = Contact("2018-1799","Jose","Rizal","Hero","M",63,
+                     63,22922)
+        c2 = Contact("1999-6742","Joaquin","Jacinto","Person","M",60,
+                     98,67251)
+        c3 = Contact("1950-6525","Yin","Xie","Gamer","M",84,
+                     45,66771)
+        c4 = Contact("1950-1900","Maria","Clara","Binibini","F", 84,
+                     63,12991)
+        c5 = Contact("1770-6259","Ahmed","Rizal","Poser","M",63,
+                     67,17651)
+        c6 = Contact("1861-0619","Paciano","Rizalino","Farmer","M",63,
+                     12,34567)
+        self.pb.insertMany([c1, c2, c3, c4, c5, c6])
+
+    def test_1(self):
+        """Misspelled surnames and first names find the closest names first.
+        """
+        self.assertEqual(["Ahmed Rizal", "Jose Rizal", "Paciano Rizalino"],
+                         [c.getFullName() for c in self.pb.searchFuzzy("Rizall")])
+        self.assertEqual(["Joaquin Jacinto"], [c.getFullName() for c in self.pb.searchFuzzy("jacinot", 1)])
+        self.assertEqual("Maria Clara", self.pb.searchFuzzy("MARIE")[0].getFullName())
+        self.assertEqual([], self.pb.searchFuzzy("Bonifacio"))
+
+    def test_2(self):
+        """The index follows deletes and renames.
+        """
+        self.pb.deleteContact("1770-6259")
+        self.pb.getContact("2018-1799").setLName("Aquino")
+        self.pb.getContact("1950-6525").setFName("Rizalito")
+        self.assertEqual(["Paciano Rizalino", "Rizalito Xie"],
+                         [c.getFullName() for c in self.pb.searchFuzzy("Rizall")])
+        self.assertEqual(["Jose Aquino"], [c.getFullName() for c in self.pb.searchFuzzy("Aquinno")])
+        self.pb.deleteContacts(["2018-1799", "1861-0619", "1950-6525", "1999-6742", "1950-1900"])
+        self.assertEqual(0, len(self.pb.names))
+        self.assertEqual({}, self.pb.names.grams)
+
+    def test_3(self):
+        """A value is filed once per term, and the index is only built and
+        maintained once searched.
+        """
+        index = TrigramIndex()
+        index.add("lee", 1)
+        index.add("lee", 1)
+        self.assertEqual([1], list(index.get("lee")))
+        self.assertTrue(index.remove("lee", 1))
+        self.assertFalse(index.remove("lee", 1))
+        self.assertEqual([], index.search("lee"))
+
+        self.pb.getContact("2018-1799").setLName("Lee")
+        self.pb.deleteContact("1770-6259")
+        self.assertIsNone(self.pb.names)
+        self.assertEqual(["Jose Lee"], [c.getFullName() for c in self.pb.searchFuzzy("Lea")])
+        self.pb.getContact("1950-6525").setFName("Xie")
+        self.assertEqual([], list(self.pb.names.get("yin")))
+        self.assertEqual(["Xie Xie"], [node.getVal().getFullName() for node in self.pb.names.get("xie")])
+
+if __name__ == "__main__":
+    unittest.main()
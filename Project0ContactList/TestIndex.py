@@ -0,0 +1,67 @@
+from Contact import Contact
+from ContactList import ContactList
+from SkipContactList import SkipContactList
+from SQLiteContactList import SQLiteContactList
+import unittest    
+
+class TestPhonebookIndex(unittest.TestCase):
+    
+    def __init__(self, *args, **kwargs):
+        super(TestPhonebookIndex, self).__init__(*args, **kwargs)
+        self.pb = ContactList()
+        c1 = Contact("2018-1799","Jose","Rizal","Hero","M",63,
+                     63,22922)
+        c2 = Contact("1999-6742","Joaquin","Jacinto","Person","M",60,
+                     98,67251)
+        c3 = Contact("1950-6525","Yin","Xie","Gamer","M",84,
+                     45,66771)
+        self.pb.insert(c1)
+        self.pb.insert(c2)
+        self.pb.insert(c3)
+
+    def test_1(self):
+        """Lookup by student number anywhere in the list.
+        """
+        self.assertEqual("Yin Xie", self.pb.getContact("1950-6525").getFullName())
+        self.assertEqual("Jose Rizal", self.pb.getContact("2018-1799").getFullName())
+
+    def test_2(self):
+        """Edited student numbers are reindexed.
+        """
+        self.pb.getContact("1950-6525").setStudentNumber("2000-0001")
+        self.assertEqual("Yin Xie", self.pb.getContact("2000-0001").getFullName())
+        self.assertEqual(-1, self.pb.deleteContact("1950-6525"))
+        self.assertEqual("Yin Xie", self.pb.deleteContact("2000-0001").getFullName())
+        self.assertEqual(2, self.pb.getSize())
+        self.assertEqual("Jose Rizal", self.pb.getLast().getFullName())
+
+    def test_3(self):
+        """Duplicate student numbers are rejected.
+        """
+        c = Contact("2018-1799","Maria","Clara","Binibini","F",84,
+                    63,12991)
+        self.assertRaises(ValueError, self.pb.insert, c)
+        self.assertRaises(ValueError, self.pb.getContact("1950-6525").setStudentNumber, "2018-1799")
+        self.assertEqual("1950-6525", self.pb.getContact("1950-6525").getStudentNumber())
+        self.assertEqual(3, self.pb.getSize())
+
+    def test_4(self):
+        """A student number refused by one list is undone in the lists
+        that had already taken it.
+        """
+        c = Contact("9", "Jose", "Rizal", "Hero", "M", 63, 63, 22922)
+        a = ContactList.fromContacts([c])
+        b = SkipContactList.fromContacts([Contact("8", "Maria", "Clara", "Binibini", "F", 84, 63, 12991), c])
+        d = SQLiteContactList()
+        d.insert(c)
+        self.assertRaises(ValueError, c.setStudentNumber, "8")
+        self.assertEqual("9", c.getStudentNumber())
+        for pb in (a, b):
+            self.assertIs(c, pb.getContact("9"))
+        self.assertIsNone(a.getContact("8"))
+        self.assertEqual("Maria", b.getContact("8").getFName())
+        self.assertEqual("Jose", d.getContact("9").getFName())
+        self.assertIsNone(d.getContact("8"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+from Contact import Contact
+from ContactList import ContactList
+from SkipContactList import SkipContactList
+import Instrumentation
+import threading
+import unittest    
+
+class TestInstrumentation(unittest.TestCase):
+    
+    def __init__(self, *args, **kwargs):
+        super(TestInstrumentation, self).__init__(*args, **kwargs)
+        self.contacts = [Contact("2000-{:04d}".format(i), "Name{}".format(i), "Surname{:03d}".format(i),
+                                 "Student", "F", 63, 2, i) for i in range(100)]
+
+    def setUp(self):
+        Instrumentation.reset()
+        Instrumentation.enable()
+
+    def tearDown(self):
+        Instrumentation.disable()
+        Instrumentation.reset()
+
+    def test_1(self):
+        """Hops and sort keys of the linked list reference.
+        """
+        pb = ContactList()
+        for c in self.contacts:
+            pb.insert(c)
+        pb.getContactAtIndex(99)
+        stats = Instrumentation.snapshot()
+        self.assertEqual(100, stats["insert"]["calls"])
+        self.assertEqual(100, stats["insert"]["sort_keys"])
+        self.assertEqual(100, stats["getContactAtIndex"]["hops"])
+        self.assertEqual(1, sum(stats["getContactAtIndex"]["latency_us"].values()))
+
+    def test_2(self):
+        """Disabling restores the original methods.
+        """
+        pb = SkipContactList()
+        pb.insertMany(self.contacts)
+        pb.getLast()
+        self.assertEqual(1, Instrumentation.snapshot()["insertMany"]["calls"])
+        self.assertGreater(Instrumentation.snapshot()["getLast"]["hops"], 0)
+        Instrumentation.disable()
+        self.assertFalse(Instrumentation.enabled)
+        pb.getLast()
+        self.assertEqual(1, Instrumentation.snapshot()["getLast"]["calls"])
+        self.assertIs(ContactList.__dict__["insert"].__code__, ContactList.insert.__code__)
+        self.assertNotIn("wrapper", ContactList.ContactNode.next.__qualname__)
+
+    def test_3(self):
+        """Every public method is timed, and each thread keeps its own counters.
+        """
+        pb = ContactList.fromContacts(self.contacts)
+        pb.getContacts(["2000-0001", "2000-0002"])
+        pb.page(limit=5)
+        pb.searchFuzzy("Name1")
+        pb.deleteContacts(["2000-0003"])
+        stats = Instrumentation.snapshot()
+        for name in ("getContacts", "page", "searchFuzzy", "deleteContacts"):
+            self.assertEqual(1, stats[name]["calls"])
+
+        ContactList.fromContacts(self.contacts).getContactAtIndex(50)
+        hops = Instrumentation.snapshot()["getContactAtIndex"]["hops"]
+        Instrumentation.reset()
+        lists = [ContactList.fromContacts(self.contacts) for _ in range(4)]
+        threads = [threading.Thread(target=pb.getContactAtIndex, args=(50,)) for pb in lists]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(4, Instrumentation.snapshot()["getContactAtIndex"]["calls"])
+        self.assertEqual(4 * hops, Instrumentation.snapshot()["getContactAtIndex"]["hops"])
+        self.assertEqual(0, Instrumentation.current.depth)
+
+if __name__ == "__main__":
+    unittest.main()
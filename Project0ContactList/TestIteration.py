@@ -0,0 +1,39 @@
+from Contact import Contact
+from SkipContactList import SkipContactList
+import unittest    
+
+class TestPhonebookIteration(unittest.TestCase):
+    
+    def __init__(self, *args, **kwargs):
+        super(TestPhonebookIteration, self).__init__(*args, **kwargs)
+        self.pb = SkipContactList()
+        c1 = Contact("2018-1799","Jose","Rizal","Hero","M",63,
+                     63,22922)
+        c2 = Contact("1999-6742","Joaquin","Jacinto","Person","M",60,
+                     98,67251)
+        c3 = Contact("1950-6525","Yin","Xie","Gamer","M",84,
+                     45,66771)
+        c4 = Contact("1950-1900","Maria","Clara","Binibini","F", 84,
+                     63,12991)
+        c5 = Contact("1770-6259","Ahmed","Rizal","Poser","M",63,
+                     67,17651)
+        self.pb.insertMany([c1, c2, c3, c4, c5])
+
+    def test_1(self):
+        """Iteration follows the list order.
+        """
+        self.assertEqual(5, len(self.pb))
+        self.assertEqual([self.pb.getContactAtIndex(i) for i in range(5)], list(self.pb))
+
+    def test_2(self):
+        """Filtered iteration by country and by predicate.
+        """
+        self.assertEqual(["Ahmed Rizal", "Jose Rizal"],
+                         [c.getFullName() for c in self.pb.filterContacts(f=[63])])
+        self.assertEqual(["Maria Clara", "Yin Xie"],
+                         [c.getFullName() for c in self.pb.filterContacts(
+                             f=[63, 84], predicate=lambda c: c.getGender() == "F" or c.getFName() == "Yin")])
+        self.assertEqual([], list(self.pb.filterContacts(f=[65])))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+from Contact import Contact
+from ContactList import ContactList
+from SkipContactList import SkipContactList
+from SQLiteContactList import SQLiteContactList
+from ConcurrentContactList import ConcurrentContactList
+from Fixtures import lists
+import random
+import unittest
+
+class TestOrders(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(TestOrders, self).__init__(*args, **kwargs)
+        rng = random.Random(11)
+        surnames = ["Rizal", "clara", "Xie", "Jacinto", "Dela Cruz", "joestar"]
+        self.fields = [("2010-{:04d}".format(rng.randrange(10000)), "Name{}".format(rng.randrange(30)),
+                        rng.choice(surnames), "Student", "M", rng.choice([63, 65, 84]),
+                        rng.randrange(1, 4), rng.randrange(100)) for i in range(400)]
+        self.fields = list({fields[0]: fields for fields in self.fields}.values())
+
+    def lists(self):
+        return lists(self.fields, (ContactList, SkipContactList, SQLiteContactList, ConcurrentContactList))
+
+    def assertOrders(self, pb):
+        for order in ContactList.ORDERS:
+            contacts = list(pb.iterOrder(order))
+            self.assertEqual(pb.getSize(), len(contacts))
+            keys = [ContactList.orderKey(c, order) for c in contacts]
+            self.assertEqual(sorted(keys), keys)
+            filtered = [c.getStudentNumber() for c in pb.iterOrder(order, [84, 63])]
+            self.assertEqual([c.getStudentNumber() for c in contacts if c.getNumericCountryCode() in (63, 84)],
+                             filtered)
+
+    def test_1(self):
+        """Every order is kept sorted through inserts, deletes and edits.
+        """
+        rng = random.Random(12)
+        for pb in self.lists():
+            self.assertOrders(pb)
+            stdns = [fields[0] for fields in self.fields]
+            pb.deleteContact(stdns[0])
+            pb.deleteContacts(stdns[1:40])
+            pb.insert(Contact("2011-0001", "Zed", "Abad", "Student", "F", 65, 9, 1))
+            for stdn in rng.sample(stdns[40:], 30):
+                c = pb.getContact(stdn)
+                c.setFName(c.getFName() + "x")
+                c.setContactNumber(rng.randrange(100))
+                c.setCountryCode(rng.choice([63, 65, 84]))
+            c = pb.getContact(stdns[50])
+            c.setStudentNumber("0000-0000")
+            c.setLName("Aaron")
+            self.assertOrders(pb)
+            self.assertEqual("0000-0000", next(pb.iterOrder("stdn")).getStudentNumber())
+            self.assertEqual("Aaron", next(pb.iterOrder("lname")).getLName())
+
+    def test_2(self):
+        """Unknown orders are rejected.
+        """
+        for pb in self.lists():
+            with self.assertRaises(ValueError):
+                list(pb.iterOrder("gender"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+from Contact import Contact
+from ContactList import ContactList
+from SkipContactList import SkipContactList
+from SQLiteContactList import SQLiteContactList
+from ConcurrentContactList import ConcurrentContactList
+from Fixtures import contactFields, lists
+import unittest
+
+class TestPaging(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(TestPaging, self).__init__(*args, **kwargs)
+        self.fields = contactFields("2012-{:04d}", 250, seed=13, names=15, gender="F", codes=[63, 65, 84],
+                                    phones=True)
+
+    def lists(self):
+        return lists(self.fields, (ContactList, SkipContactList, SQLiteContactList, ConcurrentContactList))
+
+    def pages(self, pb, limit, f=None, order="lname"):
+        pages = []
+        after_key = None
+        while True:
+            contacts, after_key = pb.page(after_key, limit, f, order)
+            pages.append([c.getStudentNumber() for c in contacts])
+            if after_key is None:
+                return pages
+
+    def test_1(self):
+        """Pages put together give the whole order, in every order and filter.
+        """
+        for pb in self.lists():
+            for order in ContactList.ORDERS:
+                for f in (None, [84], [65, 63]):
+                    expected = [c.getStudentNumber() for c in pb.iterOrder(order, f)]
+                    pages = self.pages(pb, 17, f, order)
+                    self.assertEqual(expected, sum(pages, []))
+                    self.assertTrue(all(len(page) == 17 for page in pages[:-1]))
+                    self.assertLessEqual(len(pages[-1]), 17)
+            self.assertEqual(([], None), pb.page(limit=5, f=[856]))
+            first, after_key = pb.page(limit=250)
+            self.assertEqual((250, None), (len(first), after_key))
+
+    def test_2(self):
+        """A cursor stays in step while contacts are inserted and deleted.
+        """
+        for pb in self.lists():
+            first, after_key = pb.page(limit=10)
+            second = [c.getStudentNumber() for c in pb.page(after_key, 10)[0]]
+            pb.deleteContact(first[-1].getStudentNumber())
+            pb.insert(Contact("2013-0001", "A", "Aaa", "Student", "M", 63, 1, 1))
+            self.assertEqual(second, [c.getStudentNumber() for c in pb.page(after_key, 10)[0]])
+
+    def test_3(self):
+        """A page must hold at least one contact.
+        """
+        for pb in self.lists():
+            for limit in (0, -1):
+                self.assertRaises(ValueError, pb.page, None, limit)
+
+    def test_4(self):
+        """Surname pages put together give the whole search, in every backend.
+        """
+        for pb in self.lists():
+            for pattern in ("Rizal", "j*", "dela cruz", "Nobody", "*"):
+                pages = []
+                after_key = None
+                while True:
+                    contacts, after_key = pb.pageSurname(pattern, after_key, 7)
+                    pages.append([c.getStudentNumber() for c in contacts])
+                    if after_key is None:
+                        break
+                self.assertEqual([c.getStudentNumber() for c in pb.searchSurname(pattern)], sum(pages, []))
+                self.assertTrue(all(len(page) == 7 for page in pages[:-1]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+from ContactList import ContactList
+from SkipContactList import SkipContactList
+from SQLiteContactList import SQLiteContactList
+from Fixtures import contactFields, lists
+import unittest
+
+class TestPhoneIndex(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(TestPhoneIndex, self).__init__(*args, **kwargs)
+        self.fields = contactFields("2009-{:04d}", 400, seed=8, names=30, codes=[63, 65, 84], phones=True)
+
+    def lists(self):
+        return lists(self.fields, (ContactList, SkipContactList, SQLiteContactList))
+
+    def expected(self, pb, keep) -> list:
+        contacts = [c for c in pb if keep(ContactList.phoneKey(c))]
+        return [c.getStudentNumber() for c in sorted(contacts, key=ContactList.phoneKey)]
+
+    def assertIndexed(self, pb):
+        for cc in (63, 65, 84):
+            self.assertEqual(self.expected(pb, lambda phone: phone[0] == cc),
+                             [c.getStudentNumber() for c in pb.searchPhone(cc)])
+            self.assertEqual(self.expected(pb, lambda phone: phone[:2] == (cc, 2)),
+                             [c.getStudentNumber() for c in pb.searchPhone(cc, 2)])
+        self.assertEqual(self.expected(pb, lambda phone: (63, 2, 10) <= phone < (65, 1)),
+                         [c.getStudentNumber() for c in pb.iterPhoneRange((63, 2, 10), (65, 1))])
+        for c in list(pb)[::37]:
+            phone = ContactList.phoneKey(c)
+            self.assertEqual([other.getStudentNumber() for other in pb if ContactList.phoneKey(other) == phone],
+                             [other.getStudentNumber() for other in pb.getContactsByPhone(*phone)])
+
+    def test_1(self):
+        """Exact, prefix and range lookups match a full scan.
+        """
+        for pb in self.lists():
+            self.assertIndexed(pb)
+            self.assertEqual([], pb.getContactsByPhone(63, 9, 9))
+            self.assertEqual([], pb.searchPhone(60))
+
+    def test_2(self):
+        """The index follows edits, renames and deletes.
+        """
+        for pb in self.lists():
+            c = pb.getContact("2009-0001")
+            c.setCountryCode(60)
+            c.setAreaCode(7)
+            c.setContactNumber(123456)
+            pb.getContact("2009-0002").setAreaCode(9)
+            pb.getContact("2009-0003").setLName("Aquino")
+            pb.deleteContact("2009-0004")
+            pb.deleteContacts(["2009-{:04d}".format(i) for i in range(100, 150)])
+            self.assertEqual(["2009-0001"], [c.getStudentNumber() for c in pb.getContactsByPhone(60, 7, 123456)])
+            self.assertEqual(["2009-0001"], [c.getStudentNumber() for c in pb.searchPhone(60)])
+            self.assertIndexed(pb)
+
+if __name__ == "__main__":
+    unittest.main()
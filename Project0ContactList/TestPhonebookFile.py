@@ -0,0 +1,132 @@
+from Contact import Contact
+from SkipContactList import SkipContactList
+from PhonebookFile import MappedContactList, writePhonebook
+from unittest import mock
+import PhonebookFile
+import os
+import tempfile
+import unittest    
+
+class TestPhonebookFile(unittest.TestCase):
+    
+    def __init__(self, *args, **kwargs):
+        super(TestPhonebookFile, self).__init__(*args, **kwargs)
+        self.pb = SkipContactList()
+        c1 = Contact("2018-1799","Jose","Rizal","Hero","M",63,
+                     63,22922)
+        c2 = Contact("1999-6742","Joaquin","Jacinto","Person","M",60,
+                     98,67251)
+        c3 = Contact("1950-6525","Yin","Xie","Gamer","M",84,
+                     45,66771)
+        c4 = Contact("1950-1900","Maria","Clara","Binibini","F", 84,
+                     63,12991)
+        c5 = Contact("1770-6259","Ahmed","Rizal","Poser","M",63,
+                     67,17651)
+        self.pb.insertMany([c1, c2, c3, c4, c5])
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".pbk")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_1(self):
+        """Round trip through the file, with lazy loading.
+        """
+        writePhonebook(self.path, self.pb)
+        with MappedContactList(self.path) as saved:
+            self.assertEqual(5, saved.getSize())
+            self.assertEqual({}, saved.loaded)
+            self.assertEqual("Maria Clara", saved.first().getFullName())
+            self.assertEqual(1, len(saved.loaded))
+            self.assertEqual(str(self.pb), str(saved))
+            self.assertEqual(self.pb.__str__(f=[63, 84]), saved.__str__(f=[63, 84]))
+            self.assertEqual(str(self.pb), str(SkipContactList.fromContacts(saved)))
+
+    def test_2(self):
+        """Lookup by student number.
+        """
+        writePhonebook(self.path, self.pb)
+        with MappedContactList(self.path) as saved:
+            self.assertEqual("Yin Xie", saved.getContact("1950-6525").getFullName())
+            self.assertEqual("Ahmed Rizal", saved.getContact("1770-6259").getFullName())
+            self.assertEqual(None, saved.getContact("1950-6524"))
+            self.assertEqual(None, saved.getContact("3000-0000"))
+
+    def test_3(self):
+        """Empty phonebook file.
+        """
+        writePhonebook(self.path, SkipContactList())
+        with MappedContactList(self.path) as saved:
+            self.assertTrue(saved.isEmpty())
+            self.assertEqual(None, saved.first())
+            self.assertEqual(None, saved.getContact("2018-1799"))
+            self.assertEqual(str(SkipContactList()), str(saved))
+
+    def test_4(self):
+        """Negative and wide numbers and any gender survive a round trip,
+        and numbers too wide for a record are refused before writing.
+        """
+        pb = SkipContactList.fromContacts([
+            Contact("2001-0001", "Ana", "Cruz", "Nurse", "Male", 70000, -3, 10 ** 15),
+            Contact("2001-0002", "Élise", "Diaz", "Chef", "É", 63, 2, 1)])
+        writePhonebook(self.path, pb)
+        with MappedContactList(self.path) as saved:
+            self.assertEqual(str(pb), str(saved))
+            self.assertEqual(["Male", "É"], [c.getGender() for c in saved])
+            self.assertEqual(70000, saved.getContact("2001-0001").getNumericCountryCode())
+            self.assertEqual(-3, saved.getContact("2001-0001").getAreaCode())
+            self.assertEqual([70000, 63], [saved.countryCodeAt(i) for i in range(2)])
+
+        pb.getContact("2001-0002").setContactNumber(1 << 64)
+        self.assertRaises(ValueError, writePhonebook, self.path, pb)
+        with MappedContactList(self.path) as saved:
+            self.assertEqual(2, saved.getSize())
+
+    def test_5(self):
+        """Only the most recently created contacts are kept.
+        """
+        writePhonebook(self.path, self.pb)
+        with mock.patch.object(PhonebookFile, "LOADED_CACHE_SIZE", 2):
+            with MappedContactList(self.path) as saved:
+                self.assertEqual(str(self.pb), str(saved))
+                self.assertEqual(2, len(saved.loaded))
+
+    def test_6(self):
+        """Pages in last name and student number order match the list's,
+        and read only the contacts they return.
+        """
+        writePhonebook(self.path, self.pb)
+        with MappedContactList(self.path) as saved:
+            for order in ("lname", "stdn"):
+                for f in (None, [63]):
+                    stdns = lambda contacts: [c.getStudentNumber() for c in contacts]
+                    contacts, after_key = saved.page(None, 2, f, order)
+                    self.assertEqual(stdns(self.pb.page(None, 2, f, order)[0]), stdns(contacts))
+                    self.assertEqual(stdns(self.pb.page(after_key, 5, f, order)[0]),
+                                     stdns(saved.page(after_key, 5, f, order)[0]))
+            self.assertRaises(ValueError, saved.page, None, 2, None, "fname")
+            for pattern in ("rizal", "J*", "Nobody"):
+                contacts, after_key = saved.pageSurname(pattern, None, 1)
+                rest = [] if after_key is None else saved.pageSurname(pattern, after_key, 5)[0]
+                self.assertEqual(stdns(self.pb.searchSurname(pattern)), stdns(contacts + rest))
+            saved.loaded.clear()
+            # One more contact than the limit is read, to tell if a next page follows
+            saved.page(after_key=("jacinto", "", ""), limit=1)
+            self.assertEqual(2, len(saved.loaded))
+
+    def test_7(self):
+        """Phone searches on the file match the list's."""
+        writePhonebook(self.path, self.pb)
+        with MappedContactList(self.path) as saved:
+            stdns = lambda contacts: [c.getStudentNumber() for c in contacts]
+            for c in self.pb:
+                phone = SkipContactList.phoneKey(c)
+                self.assertEqual(stdns(self.pb.getContactsByPhone(*phone)), stdns(saved.getContactsByPhone(*phone)))
+                self.assertEqual(stdns(self.pb.searchPhone(*phone[:2])), stdns(saved.searchPhone(*phone[:2])))
+                self.assertEqual(stdns(self.pb.searchPhone(phone[0])), stdns(saved.searchPhone(phone[0])))
+            self.assertEqual([], saved.getContactsByPhone(0, 0, 0))
+
+if __name__ == "__main__":
+    unittest.main()
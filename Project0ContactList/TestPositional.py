@@ -0,0 +1,60 @@
+from Contact import Contact
+from ContactList import ContactList
+from SkipContactList import SkipContactList
+from Fixtures import contactFields
+import random
+import unittest
+
+class TestPositional(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(TestPositional, self).__init__(*args, **kwargs)
+        self.reference = ContactList()
+        self.pb = SkipContactList(seed=11)
+        for fields in contactFields("2001-{:04d}", 400, seed=11, names=50):
+            self.reference.insert(Contact(*fields))
+            self.pb.insert(Contact(*fields))
+
+    def assertSamePositions(self):
+        expected = [c.getStudentNumber() for c in self.reference]
+        rng = random.Random(3)
+        for index in rng.sample(range(len(expected)), min(100, len(expected))):
+            self.assertEqual(expected[index], self.pb.getContactAtIndex(index).getStudentNumber())
+            self.assertEqual(index, self.pb.getIndex(expected[index]))
+            self.assertEqual(index, self.reference.getIndex(expected[index]))
+
+    def test_1(self):
+        """Random indices match the linked list reference, both ways.
+        """
+        self.assertSamePositions()
+        self.assertEqual(None, self.pb.getContactAtIndex(400))
+        self.assertEqual(None, self.pb.getContactAtIndex(-1))
+        self.assertEqual(-1, self.pb.getIndex("1999-0000"))
+
+    def test_2(self):
+        """Indices stay right after deletes and a bulk load.
+        """
+        for i in range(0, 400, 3):
+            stdn = "2001-{:04d}".format(i)
+            self.pb.deleteContact(stdn)
+            self.reference.deleteContact(stdn)
+        self.assertSamePositions()
+
+        batch = [("2002-{:04d}".format(i), "Name{}".format(i % 7), "Clara", "Student", "F", 65, 3, i)
+                 for i in range(300)]
+        self.pb.insertMany(Contact(*fields) for fields in batch)
+        self.reference.insertMany(Contact(*fields) for fields in batch)
+        self.assertSamePositions()
+
+    def test_3(self):
+        """Consecutive reads and iterFromIndex follow list order.
+        """
+        expected = [c.getStudentNumber() for c in self.reference]
+        self.assertEqual(expected, [self.pb.getContactAtIndex(i).getStudentNumber() for i in range(400)])
+        self.assertEqual(expected[::-1],
+                         [self.pb.getContactAtIndex(i).getStudentNumber() for i in range(399, -1, -1)])
+        self.assertEqual(expected[250:], [c.getStudentNumber() for c in self.pb.iterFromIndex(250)])
+        self.assertEqual([], list(self.pb.iterFromIndex(400)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+from Contact import Contact
+from ContactList import ContactList
+from SkipContactList import SkipContactList
+from Fixtures import contactFields
+import unittest
+
+class TestRelocation(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(TestRelocation, self).__init__(*args, **kwargs)
+        self.reference = ContactList()
+        self.pb = SkipContactList(seed=5)
+        for fields in contactFields("2003-{:04d}", 200, seed=5, names=20, gender="F", codes=[63, 65, 84]):
+            self.reference.insert(Contact(*fields))
+            self.pb.insert(Contact(*fields))
+
+    def edit(self, stdn: str, setter: str, value):
+        getattr(self.reference.getContact(stdn), setter)(value)
+        getattr(self.pb.getContact(stdn), setter)(value)
+
+    def assertConsistent(self, pb: ContactList):
+        keys = [c.getSortKey() for c in pb]
+        self.assertEqual(sorted(keys), keys)
+        for i, c in enumerate(pb):
+            self.assertEqual(i, pb.getIndex(c.getStudentNumber()))
+        for cc in (63, 65, 84):
+            contacts = list(pb.iterByCountry([cc]))
+            self.assertEqual([c for c in pb if c.getNumericCountryCode() == cc], contacts)
+
+    def test_1(self):
+        """Renamed contacts move to their new place in the list and indexes.
+        """
+        self.edit("2003-0010", "setLName", "Aquino")
+        self.edit("2003-0020", "setFName", "Zed")
+        self.edit("2003-0030", "setLName", "zamora")
+        for pb in (self.reference, self.pb):
+            self.assertConsistent(pb)
+            self.assertEqual("2003-0010", pb.first().getStudentNumber())
+            self.assertEqual(["2003-0030"], [c.getStudentNumber() for c in pb.searchSurname("ZAM*")])
+        self.assertEqual(str(self.reference), str(self.pb))
+
+    def test_2(self):
+        """Student number and country code edits keep every lookup right.
+        """
+        self.edit("2003-0040", "setStudentNumber", "2010-0001")
+        self.edit("2003-0050", "setCountryCode", 84)
+        self.edit("2003-0050", "setLName", "Bonifacio")
+        for pb in (self.reference, self.pb):
+            self.assertConsistent(pb)
+            self.assertFalse(pb.hasStudentNumber("2003-0040"))
+            self.assertEqual("2010-0001", pb.getContact("2010-0001").getStudentNumber())
+            self.assertEqual(84, pb.getContact("2003-0050").getNumericCountryCode())
+            self.assertEqual("Bonifacio", pb.getContactBySurname("Bonifacio").getLName())
+            self.assertEqual("2003-0050", pb.deleteContact("2003-0050").getStudentNumber())
+            self.assertConsistent(pb)
+        self.assertEqual(str(self.reference), str(self.pb))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+from Contact import Contact
+from ContactList import ContactList
+from SkipContactList import SkipContactList
+from SQLiteContactList import SQLiteContactList
+from Fixtures import contactFields
+import unittest
+
+class TestRender(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(TestRender, self).__init__(*args, **kwargs)
+        self.fields = contactFields("2015-{:04d}", 150, seed=17, names=20, codes=[63, 65, 84])
+
+    def test_1(self):
+        """A contact's rendering is kept until one of its setters is called.
+        """
+        c = Contact("2015-9999", "Jose", "Rizal", "Student", "M", 63, 2, 1)
+        text = str(c)
+        self.assertIs(text, str(c))
+        for setter, value in (("setStudentNumber", "2015-9998"), ("setFName", "Pepe"), ("setLName", "Mercado"),
+                              ("setOccupation", "Doctor"), ("setCountryCode", 65), ("setAreaCode", 7),
+                              ("setContactNumber", 42), ("setGender", "f")):
+            getattr(c, setter)(value)
+            self.assertNotEqual(text, str(c))
+            text = str(c)
+        self.assertEqual("Mercado, Pepe, with student number 2015-9998, is a/an Doctor. Her phone number is 65-7-42.",
+                         text)
+        self.assertEqual("F", c.getGender())
+        self.assertEqual(-1, c.setGender("X"))
+        self.assertIs(text, str(c))
+
+    def test_2(self):
+        """Kept outputs are reused until a contact of a country they cover changes.
+        """
+        for cls in (ContactList, SkipContactList):
+            pb = cls.fromContacts((Contact(*fields) for fields in self.fields), dump_cache_size=3)
+            everyone, vietnam, both = str(pb), pb.__str__([84]), pb.__str__([63, 84])
+            self.assertIs(everyone, str(pb))
+            self.assertIs(vietnam, pb.__str__([84]))
+            self.assertIs(both, pb.__str__([84, 63]))
+
+            stdn = next(pb.iterByCountry([63])).getStudentNumber()
+            pb.getContact(stdn).setOccupation("Teacher")
+            self.assertIs(vietnam, pb.__str__([84]))
+            self.assertNotEqual(both, pb.__str__([63, 84]))
+            self.assertNotEqual(everyone, str(pb))
+
+            pb.getContact(stdn).setCountryCode(84)
+            pb.deleteContacts([fields[0] for fields in self.fields[:20]])
+            pb.insert(Contact("2016-0001", "Andres", "Bonifacio", "Student", "M", 65, 2, 1))
+            for f in (None, [84], [63, 84], [65]):
+                self.assertEqual(pb.render(f), pb.__str__(f))
+
+    def test_3(self):
+        """Occupation edits reach the database.
+        """
+        pb = SQLiteContactList.fromContacts(Contact(*fields) for fields in self.fields)
+        pb.getContact("2015-0003").setOccupation("Teacher")
+        self.assertEqual("Teacher", pb.getContact("2015-0003").getOccupation())
+
+    def test_4(self):
+        """Only the outputs of the last filters are kept, and none with a size of 0.
+        """
+        pb = SkipContactList.fromContacts(Contact(*fields) for fields in self.fields)
+        everyone = str(pb)
+        pb.__str__([84])
+        pb.__str__([63])
+        self.assertEqual([frozenset([84]), frozenset([63])], list(pb.dumps))
+        self.assertIsNot(everyone, str(pb))
+
+        pb = ContactList.fromContacts((Contact(*fields) for fields in self.fields), dump_cache_size=0)
+        self.assertIsNot(str(pb), str(pb))
+        self.assertEqual({}, pb.dumps)
+
+if __name__ == "__main__":
+    unittest.main()
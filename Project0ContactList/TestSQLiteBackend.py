@@ -0,0 +1,80 @@
+from Contact import Contact
+from SQLiteContactList import SQLiteContactList
+from unittest import mock
+import TestInsert
+import TestDelete
+import TestPrint
+import TestCountryPrint
+import unittest    
+
+class TestSQLitePhonebook(unittest.TestCase):
+    
+    def __init__(self, *args, **kwargs):
+        super(TestSQLitePhonebook, self).__init__(*args, **kwargs)
+        self.pb = SQLiteContactList()
+        c1 = Contact("2018-1799","Jose","Rizal","Hero","M",63,
+                     63,22922)
+        c2 = Contact("1999-6742","Joaquin","Jacinto","Person","M",60,
+                     98,67251)
+        c3 = Contact("1950-6525","Yin","Xie","Gamer","M",84,
+                     45,66771)
+        self.pb.insertMany([c1, c2, c3])
+
+    def test_1(self):
+        """Lookups and edits written back to the database.
+        """
+        self.assertEqual("Yin Xie", self.pb.getContact("1950-6525").getFullName())
+        self.pb.getContact("1950-6525").setLName("Rizal")
+        self.assertEqual(["Jose Rizal", "Yin Rizal"],
+                         [c.getFullName() for c in self.pb.searchSurname("riz*")])
+        self.assertEqual("Yin Rizal", self.pb.getLast().getFullName())
+
+    def test_2(self):
+        """Duplicate student numbers roll back the whole batch.
+        """
+        c4 = Contact("1950-1900","Maria","Clara","Binibini","F", 84,
+                     63,12991)
+        c5 = Contact("2018-1799","Ahmed","Rizal","Poser","M",63,
+                     67,17651)
+        self.assertRaises(ValueError, self.pb.insertMany, [c4, c5])
+        self.assertEqual(3, self.pb.getSize())
+        self.assertEqual(None, self.pb.getContactBySurname("Clara"))
+        self.assertRaises(ValueError, self.pb.getContact("1950-6525").setStudentNumber, "2018-1799")
+
+    def test_3(self):
+        """Every lookup of a row gives one contact, and setters only write
+        their own column to it.
+        """
+        a = self.pb.getContact("2018-1799")
+        b = self.pb.getContact("2018-1799")
+        self.assertIs(a, b)
+        self.assertIs(a, next(iter(self.pb.searchSurname("Rizal"))))
+        a.setLName("Bonifacio")
+        b.setOccupation("Writer")
+        self.assertEqual(("Bonifacio", "Writer"),
+                         self.pb.conn.execute("SELECT lname, occupation FROM contacts "
+                                              "WHERE student_num = '2018-1799'").fetchone())
+
+    def test_4(self):
+        """A deleted contact no longer writes to the database.
+        """
+        old = self.pb.getContact("1999-6742")
+        self.pb.deleteContact("1999-6742")
+        self.pb.insert(Contact("1999-6742","Andres","Bonifacio","Hero","M",63,2,1))
+        old.setOccupation("Z")
+        gone = self.pb.deleteContacts(["1950-6525"])[0]
+        gone.setLName("Z")
+        self.assertEqual("Hero", self.pb.getContact("1999-6742").getOccupation())
+        self.assertEqual(2, self.pb.getSize())
+        self.assertEqual([], self.pb.getContactsBySurname("Z"))
+
+def load_tests(loader, tests, pattern):
+    """Runs the ContactList test suites unchanged against SQLiteContactList."""
+    suite = unittest.TestSuite(tests)
+    for module in (TestInsert, TestDelete, TestPrint, TestCountryPrint):
+        with mock.patch.object(module, "ContactList", SQLiteContactList):
+            suite.addTests(loader.loadTestsFromModule(module))
+    return suite
+
+if __name__ == "__main__":
+    unittest.main()
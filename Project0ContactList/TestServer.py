@@ -0,0 +1,111 @@
+from Contact import Contact
+from ContactIO import toRow
+from PhonebookServer import PhonebookServer, request, runLoad
+from SkipContactList import SkipContactList
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+class TestServer(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(TestServer, self).__init__(*args, **kwargs)
+        self.pb = SkipContactList()
+        for i in range(30):
+            self.pb.insert(Contact("2005-{:04d}".format(i), "Name{}".format(i), "Surname{}".format(i % 3),
+                                   "Student", "M", 63 if i % 2 else 84, 2, 100 + i))
+
+    def serve(self, client):
+        async def run():
+            server = await PhonebookServer(self.pb).start("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                return await client(port)
+            finally:
+                server.close()
+                await server.wait_closed()
+        return asyncio.run(run())
+
+    def test_1(self):
+        """Lookups, searches, listings, inserts and deletes.
+        """
+        async def client(port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            got = (await request(reader, writer, {"op": "get", "stdn": "2005-0007"}))[0]
+            self.assertEqual("Name7", got["contact"]["fname"])
+            self.assertEqual(None, (await request(reader, writer, {"op": "get", "stdn": "63"}))[0]["contact"])
+
+            found = (await request(reader, writer, {"op": "surname", "surname": "surname1"}))[0]["contacts"]
+            self.assertEqual([toRow(c) for c in self.pb.getContactsBySurname("Surname1")], found)
+
+            listing = await request(reader, writer, {"op": "list", "cc": [63]})
+            self.assertEqual(15, listing[-1]["count"])
+            self.assertEqual([toRow(c) for c in self.pb.iterByCountry([63])], [line["contact"] for line in listing[:-1]])
+
+            row = toRow(Contact("2005-0100", "New", "Contact", "Student", "F", 65, 3, 1))
+            self.assertTrue((await request(reader, writer, {"op": "insert", "contact": row}))[0]["ok"])
+            self.assertFalse((await request(reader, writer, {"op": "insert", "contact": row}))[0]["ok"])
+            deleted = (await request(reader, writer, {"op": "delete", "stdn": "2005-0000"}))[0]
+            self.assertEqual("2005-0000", deleted["contact"]["student_num"])
+            self.assertFalse((await request(reader, writer, {"op": "nothing"}))[0]["ok"])
+            writer.close()
+            await writer.wait_closed()
+
+        self.serve(client)
+        self.assertEqual(30, self.pb.getSize())
+        self.assertTrue(self.pb.hasStudentNumber("2005-0100"))
+
+    def test_2(self):
+        """Pipelined lookups are answered together, matched by id.
+        """
+        async def client(port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write("".join(json.dumps({"id": i, "op": "get", "stdn": "2005-{:04d}".format(i)}) + "\n"
+                                 for i in range(30)).encode())
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in range(30)]
+            stats = (await request(reader, writer, {"op": "stats"}))[0]
+            writer.close()
+            await writer.wait_closed()
+            return responses, stats
+
+        responses, stats = self.serve(client)
+        for response in responses:
+            self.assertEqual("2005-{:04d}".format(response["id"]), response["contact"]["student_num"])
+        self.assertEqual(30, stats["lookups"])
+        self.assertLess(stats["batches"], 30)
+
+    def test_3(self):
+        """The load generator reports throughput and latency.
+        """
+        report = self.serve(lambda port: runLoad("127.0.0.1", port, connections=4, requests=400, window=8))
+        self.assertEqual(400, report["requests"])
+        self.assertGreater(report["requests_per_sec"], 0)
+        self.assertLessEqual(report["p50_ms"], report["p99_ms"])
+        self.assertGreater(report["lookups_per_batch"], 1)
+
+    def test_4(self):
+        """A listing is streamed a page at a time, so other requests are
+        answered before it ends.
+        """
+        async def client(port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write((json.dumps({"id": 1, "op": "list", "order": "stdn"}) + "\n" +
+                          json.dumps({"id": 2, "op": "get", "stdn": "2005-0003"}) + "\n").encode())
+            await writer.drain()
+            lines = [json.loads(await reader.readline()) for _ in range(32)]
+            writer.close()
+            await writer.wait_closed()
+            return lines
+
+        with mock.patch.object(PhonebookServer, "STREAM_CHUNK", 4):
+            lines = self.serve(client)
+        listing = [line for line in lines if line["id"] == 1]
+        self.assertEqual(["2005-{:04d}".format(i) for i in range(30)],
+                         [line["contact"]["student_num"] for line in listing[:-1]])
+        self.assertEqual(30, listing[-1]["count"])
+        self.assertLess(lines.index(next(line for line in lines if line["id"] == 2)), 31)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+from Contact import Contact
+from ContactList import ContactList
+from ShardedContactList import ShardedContactList
+from Fixtures import contactFields
+import unittest
+
+class TestShards(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.fields = contactFields("2008-{:04d}", 2500, seed=4, names=10, codes=sorted(Contact.COUNTRY_CODES))
+        cls.pb = ShardedContactList(shards=3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pb.close()
+
+    def setUp(self):
+        self.pb.deleteContacts([fields[0] for fields in self.fields])
+        self.reference = ContactList.fromContacts(Contact(*fields) for fields in self.fields[:2000])
+        self.pb.insertMany(Contact(*fields) for fields in self.fields[:1000])
+        for fields in self.fields[1000:2000]:
+            self.pb.insert(Contact(*fields))
+
+    def test_1(self):
+        """Global and country-filtered listings match the single list.
+        """
+        self.assertEqual(2000, self.pb.getSize())
+        self.assertEqual(str(self.reference), str(self.pb))
+        self.assertEqual(self.reference.__str__([63, 84, 673]), self.pb.__str__([63, 84, 673]))
+        self.assertEqual(self.reference.__str__([65]), self.pb.__str__([65]))
+        self.assertEqual(str(self.reference.getLast()), str(self.pb.getLast()))
+        self.assertEqual([str(c) for c in self.reference.searchSurname("j*")],
+                         [str(c) for c in self.pb.searchSurname("j*")])
+        self.assertEqual([str(c) for c in self.reference.getContactsBySurname("rizal")],
+                         [str(c) for c in self.pb.getContactsBySurname("rizal")])
+
+    def test_2(self):
+        """Lookups and deletes are routed to the right shard.
+        """
+        stdns = ["2008-0005", "2008-1999", "2008-2400", "63"]
+        self.assertEqual([str(c) for c in self.reference.getContacts(stdns)],
+                         [str(c) for c in self.pb.getContacts(stdns)])
+        self.assertEqual(str(self.reference.getContact("63")), str(self.pb.getContact("63")))
+        self.assertEqual(None, self.pb.getContact("2008-2400"))
+
+        self.assertRaises(ValueError, self.pb.insert, Contact(*self.fields[5]))
+        self.assertEqual(2000, self.pb.getSize())
+        self.assertEqual("2008-0005", self.pb.deleteContact("2008-0005").getStudentNumber())
+        self.assertEqual(-1, self.pb.deleteContact("2008-0005"))
+        self.reference.deleteContact("2008-0005")
+        self.assertEqual(str(self.reference), str(self.pb))
+
+    def test_3(self):
+        """An abandoned listing does not disturb later requests.
+        """
+        listing = iter(self.pb)
+        self.assertEqual(str(self.reference.first()), str(next(listing)))
+        del listing
+        self.assertTrue(self.pb.hasStudentNumber("2008-1500"))
+        self.assertEqual(str(self.reference), str(self.pb))
+
+    def test_4(self):
+        """Every order merges across shards into the single list's order.
+        """
+        for order in ContactList.ORDERS:
+            self.assertEqual([str(c) for c in self.reference.iterOrder(order)],
+                             [str(c) for c in self.pb.iterOrder(order)])
+            self.assertEqual([str(c) for c in self.reference.iterOrder(order, [63, 65])],
+                             [str(c) for c in self.pb.iterOrder(order, [63, 65])])
+
+    def test_5(self):
+        """Pages merged across shards match the single list's pages.
+        """
+        for order, f in (("lname", None), ("phone", [63, 84])):
+            after_key = None
+            while True:
+                expected, expected_key = self.reference.page(after_key, 300, f, order)
+                contacts, after_key = self.pb.page(after_key, 300, f, order)
+                self.assertEqual([str(c) for c in expected], [str(c) for c in contacts])
+                self.assertEqual(expected_key, after_key)
+                if after_key is None:
+                    break
+
+if __name__ == "__main__":
+    unittest.main()
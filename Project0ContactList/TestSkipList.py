@@ -0,0 +1,46 @@
+from Contact import Contact
+from ContactList import ContactList
+from SkipContactList import SkipContactList
+from Fixtures import contactFields
+import unittest    
+
+class TestSkipListBackend(unittest.TestCase):
+    
+    def __init__(self, *args, **kwargs):
+        super(TestSkipListBackend, self).__init__(*args, **kwargs)
+        self.reference = ContactList()
+        self.pb = SkipContactList(seed=7)
+        for fields in contactFields("2000-{:04d}", 300, seed=7, names=1000, gender="F"):
+            self.reference.insert(Contact(*fields))
+            self.pb.insert(Contact(*fields))
+
+    def test_1(self):
+        """Same order as the linked list reference.
+        """
+        self.assertEqual(self.reference.getSize(), self.pb.getSize())
+        self.assertEqual(str(self.reference), str(self.pb))
+        self.assertEqual(self.reference.getLast().getFullName(), self.pb.getLast().getFullName())
+
+    def test_2(self):
+        """Same order after deleting half of the contacts.
+        """
+        for i in range(0, 300, 2):
+            stdn = "2000-{:04d}".format(i)
+            self.assertEqual(stdn, self.pb.deleteContact(stdn).getStudentNumber())
+            self.reference.deleteContact(stdn)
+        self.assertEqual(150, self.pb.getSize())
+        self.assertEqual(str(self.reference), str(self.pb))
+        self.assertEqual(self.reference.first().getFullName(), self.pb.first().getFullName())
+        self.assertEqual(self.reference.getLast().getFullName(), self.pb.getLast().getFullName())
+
+    def test_3(self):
+        """Deleting every contact empties every level.
+        """
+        for i in range(300):
+            self.pb.deleteContact("2000-{:04d}".format(i))
+        self.assertTrue(self.pb.isEmpty())
+        self.assertEqual(None, self.pb.getLast())
+        self.assertEqual(1, self.pb.level)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+from Contact import Contact
+from ContactList import ContactList
+from SkipContactList import SkipContactList
+from SQLiteContactList import SQLiteContactList
+import unittest
+
+class TestSortKey(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super(TestSortKey, self).__init__(*args, **kwargs)
+        self.fields = [("2009-0003", "jose", "rizal", "Student", "M", 63, 2, 1),
+                       ("2009-0001", "Jose", "Rizal", "Student", "M", 63, 2, 2),
+                       ("2009-0002", "Andres", "RIZAL", "Student", "M", 65, 2, 3),
+                       ("2009-0004", "Maria", "clara", "Student", "F", 84, 2, 4),
+                       ("2009-0005", "Jose", "Rizal", "Student", "M", 84, 2, 5)]
+
+    def test_1(self):
+        """The key is cached and invalidated by the name and student number setters.
+        """
+        c = Contact("2009-0001", "Jose", "Rizal", "Student", "M", 63, 2, 1)
+        key = c.getSortKey()
+        self.assertEqual(("rizal", "jose", "2009-0001"), key)
+        self.assertIs(key, c.getSortKey())
+        c.setOccupation("Teacher")
+        self.assertIs(key, c.getSortKey())
+        c.setLName("Clara")
+        c.setFName("Maria")
+        c.setStudentNumber("2009-0009")
+        self.assertEqual(("clara", "maria", "2009-0009"), c.getSortKey())
+
+    def test_2(self):
+        """Every backend orders names case-insensitively, breaking ties by
+        student number whatever the insertion order.
+        """
+        expected = ["2009-0004", "2009-0002", "2009-0001", "2009-0003", "2009-0005"]
+        for cls in (ContactList, SkipContactList, SQLiteContactList):
+            for fields in (self.fields, self.fields[::-1]):
+                pb = cls.fromContacts(Contact(*f) for f in fields)
+                self.assertEqual(expected, [c.getStudentNumber() for c in pb])
+                self.assertEqual("2009-0005", pb.getLast().getStudentNumber())
+
+    def test_3(self):
+        """Changing a student number moves the contact among equal names.
+        """
+        for cls in (ContactList, SkipContactList, SQLiteContactList):
+            pb = cls.fromContacts(Contact(*f) for f in self.fields)
+            pb.getContact("2009-0005").setStudentNumber("2009-0000")
+            self.assertEqual(["2009-0004", "2009-0002", "2009-0000", "2009-0001", "2009-0003"],
+                             [c.getStudentNumber() for c in pb])
+            self.assertEqual(["2009-0002", "2009-0000", "2009-0001", "2009-0003"],
+                             [c.getStudentNumber() for c in pb.searchSurname("riz*")])
+
+if __name__ == "__main__":
+    unittest.main()
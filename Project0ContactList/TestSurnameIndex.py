@@ -0,0 +1,51 @@
+from Contact import Contact
+from SkipContactList import SkipContactList
+import unittest    
+
+class TestPhonebookSurnameIndex(unittest.TestCase):
+    
+    def __init__(self, *args, **kwargs):
+        super(TestPhonebookSurnameIndex, self).__init__(*args, **kwargs)
+        self.pb = SkipContactList()
+        c1 = Contact("2018-1799","Jose","Rizal","Hero","M",63,
+                     63,22922)
+        c2 = Contact("1999-6742","Joaquin","Jacinto","Person","M",60,
+                     98,67251)
+        c3 = Contact("1950-6525","Yin","Xie","Gamer","M",84,
+                     45,66771)
+        c4 = Contact("1950-1900","Maria","Clara","Binibini","F", 84,
+                     63,12991)
+        c5 = Contact("1770-6259","Ahmed","Rizal","Poser","M",63,
+                     67,17651)
+        c6 = Contact("1861-0619","Paciano","Rizalino","Farmer","M",63,
+                     12,34567)
+        self.pb.insertMany([c1, c2, c3, c4, c5, c6])
+
+    def test_1(self):
+        """Every contact with a surname, ignoring case.
+        """
+        self.assertEqual(["Ahmed Rizal", "Jose Rizal"],
+                         [c.getFullName() for c in self.pb.getContactsBySurname("rIZAL")])
+        self.assertEqual("Ahmed Rizal", self.pb.getContactBySurname("Rizal").getFullName())
+        self.assertEqual(None, self.pb.getContactBySurname("rizal"))
+        self.assertEqual([], self.pb.searchSurname("Riz"))
+
+    def test_2(self):
+        """Prefix search.
+        """
+        self.assertEqual(["Ahmed Rizal", "Jose Rizal", "Paciano Rizalino"],
+                         [c.getFullName() for c in self.pb.searchSurname("riz*")])
+        self.assertEqual(6, len(self.pb.searchSurname("*")))
+        self.assertEqual([], self.pb.searchSurname("Z*"))
+
+    def test_3(self):
+        """The index follows setLName and deleteContact.
+        """
+        self.pb.getContact("1950-6525").setLName("Rizal")
+        self.pb.deleteContact("2018-1799")
+        self.assertEqual(["Ahmed Rizal", "Yin Rizal"],
+                         [c.getFullName() for c in self.pb.getContactsBySurname("Rizal")])
+        self.assertEqual([], self.pb.searchSurname("Xie"))
+
+if __name__ == "__main__":
+    unittest.main()
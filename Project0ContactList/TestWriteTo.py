@@ -0,0 +1,33 @@
+from Contact import Contact
+from SkipContactList import SkipContactList
+import io
+import unittest    
+
+class TestPhonebookWriteTo(unittest.TestCase):
+    
+    def __init__(self, *args, **kwargs):
+        super(TestPhonebookWriteTo, self).__init__(*args, **kwargs)
+        self.pb = SkipContactList()
+        for i in range(50):
+            self.pb.insert(Contact("2000-{:04d}".format(i), "Name{}".format(i), "Surname{}".format(i % 7),
+                                   "Student", "M" if i % 2 else "F", 63 if i % 3 else 84, 2, i))
+
+    def test_1(self):
+        """Streamed output matches __str__ for every buffer size.
+        """
+        for f in (None, [63], [84, 63], [65]):
+            for buffer_lines in (1, 7, 1024):
+                out = io.StringIO()
+                self.pb.writeTo(out, f, buffer_lines)
+                self.assertEqual(self.pb.__str__(f) + "\n", out.getvalue())
+
+    def test_2(self):
+        """Empty phonebook.
+        """
+        out = io.StringIO()
+        SkipContactList().writeTo(out)
+        self.assertEqual("<----Phonebook---->\nThis phonebook is currently empty...\n<----End---->\n",
+                         out.getvalue())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+# Trigram index used for the fuzzy name search of ContactList
+import math
+from collections import Counter
+
+
+class TrigramIndex:
+    """An inverted index from the trigrams of each term to the terms
+    containing them, and from each term to the values filed under it.
+
+    A search only scores the terms sharing a trigram with the query, by
+    their Dice coefficient, instead of comparing the query against every
+    term. Terms are indexed once however many values share them, so the
+    index grows with the number of distinct names, not of contacts.
+    """
+
+    def __init__(self):
+        self.grams = {}
+        self.values = {}
+
+    def __len__(self) -> int:
+        """Gets the number of distinct terms in this index."""
+        return len(self.values)
+
+    @staticmethod
+    def trigrams(term: str) -> set:
+        """Gets the trigrams of a term, padded so that its start and end
+        count as well, e.g. "  r", " ri", "riz", ..., "al ".
+
+        Args:
+            term (str): Term to split.
+
+        Returns:
+            set: Distinct trigrams of the term.
+        """
+        padded = "  " + term + " "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def get(self, term: str):
+        """Gets the values filed under a term.
+
+        Args:
+            term (str): Term to look up.
+
+        Returns:
+            Iterable over the values of the term. Empty if it is not indexed.
+        """
+        return self.values.get(term, ())
+
+    def add(self, term: str, value) -> None:
+        """Files a value under a term, indexing the term if it is new.
+        A value is filed at most once under each term.
+
+        Args:
+            term (str): Term to file the value under.
+            value: Value of the entry.
+        """
+        values = self.values.get(term)
+        if values is None:
+            values = self.values[term] = set()
+            for gram in TrigramIndex.trigrams(term):
+                self.grams.setdefault(gram, set()).add(term)
+        values.add(value)
+
+    def remove(self, term: str, value) -> bool:
+        """Removes a value from a term, dropping the term once it has no values.
+
+        Args:
+            term (str): Term the value was filed under.
+            value: Value of the entry.
+
+        Returns:
+            bool: True if the entry was found and removed.
+        """
+        values = self.values.get(term)
+        if values is None or value not in values:
+            return False
+
+        values.discard(value)
+        if not values:
+            del self.values[term]
+            for gram in TrigramIndex.trigrams(term):
+                terms = self.grams[gram]
+                terms.discard(term)
+                if not terms:
+                    del self.grams[gram]
+        return True
+
+    def search(self, query: str, limit: int = 10, threshold: float = 0.4) -> list:
+        """Finds the terms most similar to a query.
+
+        Args:
+            query (str): Term to search for.
+            limit (int, optional): Most terms returned. Defaults to 10.
+            threshold (float, optional): Least similarity, between 0 and 1,
+                of a returned term. Defaults to 0.4.
+
+        Returns:
+            list: (similarity, term) pairs, most similar first.
+        """
+        grams = TrigramIndex.trigrams(query)
+        # A term scoring at least threshold shares at least needed of the
+        # query's trigrams, so it is in one of the other rarest postings
+        needed = max(1, math.ceil(threshold * len(grams) / (2 - threshold)))
+        postings = sorted((self.grams.get(gram, ()) for gram in grams), key=len)
+        shared = Counter()
+        for terms in postings[:len(postings) - needed + 1]:
+            shared.update(terms)
+
+        scored = []
+        for term in shared:
+            term_grams = TrigramIndex.trigrams(term)
+            score = 2 * len(grams & term_grams) / (len(grams) + len(term_grams))
+            if score >= threshold:
+                scored.append((score, term))
+        scored.sort(key=lambda entry: (-entry[0], entry[1]))
+        return scored[:limit]